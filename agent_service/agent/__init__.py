@@ -21,8 +21,23 @@ This package follows Domain-Driven Design principles with a clean architecture:
 __version__ = "1.0.0"
 
 from .config import config
-from .manager import agent_manager
-from .api import router
-from .client import start_agent_client
 
-__all__ = ["config", "agent_manager", "router", "start_agent_client"] 
\ No newline at end of file
+__all__ = ["config", "agent_manager", "router", "start_agent_client"]
+
+
+def __getattr__(name):
+    """Import the API, client and agent manager only when first used.
+    
+    Importing a subpackage such as ``agent.domain`` should not build the
+    executors or the Socket.IO client.
+    """
+    if name == "agent_manager":
+        from .manager import get_agent_manager
+        return get_agent_manager()
+    if name == "router":
+        from .api import router
+        return router
+    if name == "start_agent_client":
+        from .client import start_agent_client
+        return start_agent_client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -1,5 +1,9 @@
 """API layer for the agent service."""
 
+from ._inspect_cache import install as _install_inspect_cache
+
+_install_inspect_cache()
+
 from .routes import router
 
 __all__ = ["router"] 
\ No newline at end of file
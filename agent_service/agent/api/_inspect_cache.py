@@ -0,0 +1,54 @@
+"""Per-callable cache for FastAPI's dependency introspection helpers.
+
+FastAPI re-inspects every dependency callable on each request to decide
+whether to await it, run it in a thread pool or enter it as a context
+manager. The answer never changes for a given callable, so it is memoized
+per callable object. Callables that cannot be weakly referenced fall back
+to the uncached check.
+"""
+
+import weakref
+from typing import Any, Callable
+
+from fastapi.dependencies import utils as dependency_utils
+
+_CACHED_CHECKS = ("is_coroutine_callable", "is_gen_callable", "is_async_gen_callable")
+
+
+def _memoize(check: Callable[[Callable[..., Any]], bool]) -> Callable[[Callable[..., Any]], bool]:
+    """Wrap an introspection check with a per-callable cache.
+
+    Args:
+        check: Introspection function taking a callable
+
+    Returns:
+        Callable[[Callable[..., Any]], bool]: Cached version of the check
+    """
+    cache: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+    def cached_check(call: Callable[..., Any]) -> bool:
+        try:
+            return cache[call]
+        except KeyError:
+            pass
+        except TypeError:
+            return check(call)
+        result = check(call)
+        cache[call] = result
+        return result
+
+    cached_check.__wrapped__ = check
+    return cached_check
+
+
+def install() -> None:
+    """Replace FastAPI's dependency introspection checks with cached versions.
+
+    Safe to call more than once; checks that are already cached or missing
+    from the installed FastAPI version are left untouched.
+    """
+    for name in _CACHED_CHECKS:
+        check = getattr(dependency_utils, name, None)
+        if check is None or hasattr(check, "__wrapped__"):
+            continue
+        setattr(dependency_utils, name, _memoize(check))
@@ -1,5 +1,6 @@
 """Authentication utilities for the agent API."""
 
+import hmac
 import logging
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -23,11 +24,16 @@ async def authenticate(token: str = Depends(oauth2_scheme)) -> bool:
     Raises:
         HTTPException: If authentication fails
     """
-    if token != config.api_token:
-        logger.warning(f"Authentication failed with token: {token}")
+    # Constant-time comparison so response timing does not leak the token
+    if not hmac.compare_digest(token.encode("utf-8"), config.api_token.encode("utf-8")):
+        logger.warning("Authentication failed with invalid token")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return True 
\ No newline at end of file
+    return True
+
+# Shared dependency so every route resolves the same callable and FastAPI's
+# per-request dependency cache can reuse the result
+AuthDep = Depends(authenticate, use_cache=True)
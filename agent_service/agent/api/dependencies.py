@@ -0,0 +1,58 @@
+"""Dependency providers for the agent API."""
+
+from fastapi import Depends, Request
+
+from ..application.agent_service import AgentService
+from ..application.command_service import CommandService
+from ..infrastructure.command_repository import command_repository
+from ..infrastructure.executor_factory import executor_factory
+from .auth import AuthDep
+
+
+def get_agent_service(request: Request, authenticated: bool = AuthDep) -> AgentService:
+    """Get the application-wide agent service for an authenticated request.
+
+    The service is created on first use and stored on ``app.state`` so
+    requests do not rebuild it. Depending on authentication here means an
+    invalid token fails before any other dependency is resolved.
+
+    Args:
+        request: Incoming request
+        authenticated: Result of the authentication dependency
+
+    Returns:
+        AgentService: Agent service instance
+    """
+    state = request.app.state
+    agent_service = getattr(state, "agent_service", None)
+    if agent_service is None:
+        agent_service = AgentService(executor_factory)
+        state.agent_service = agent_service
+    return agent_service
+
+
+def get_command_service(request: Request, authenticated: bool = AuthDep) -> CommandService:
+    """Get the application-wide command service for an authenticated request.
+
+    The service is created on first use and stored on ``app.state`` so
+    requests do not rebuild it. Depending on authentication here means an
+    invalid token fails before any other dependency is resolved.
+
+    Args:
+        request: Incoming request
+        authenticated: Result of the authentication dependency
+
+    Returns:
+        CommandService: Command service instance
+    """
+    state = request.app.state
+    command_service = getattr(state, "command_service", None)
+    if command_service is None:
+        command_service = CommandService(command_repository, executor_factory)
+        state.command_service = command_service
+    return command_service
+
+
+# Shared dependency objects so every route resolves the same callables
+AgentServiceDep = Depends(get_agent_service)
+CommandServiceDep = Depends(get_command_service)
@@ -0,0 +1,100 @@
+"""JSON response classes for the agent API."""
+
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Optional
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+# Serialize datetimes the same way Pydantic does ("Z" suffix) and treat
+# naive timestamps produced by the executors as UTC.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def orjson_default(obj: Any) -> Any:
+    """Serialize objects orjson does not support natively.
+
+    Domain models and DTOs are dataclasses, which orjson encodes from their
+    fields without building an intermediate dict (fields starting with an
+    underscore, such as cached values, are skipped). This fallback covers
+    read-only mappings such as executor targets and other objects that
+    provide ``to_dict``.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        Any: JSON-compatible representation of the object
+
+    Raises:
+        TypeError: If the object cannot be serialized
+    """
+    if type(obj) is MappingProxyType:
+        return dict(obj)
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class AgentJSONResponse(ORJSONResponse):
+    """ORJSON response that renders payloads without Pydantic validation.
+
+    Handlers return this directly so FastAPI skips ``jsonable_encoder`` and
+    ``response_model`` validation on the way out.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Render the content as JSON bytes.
+
+        Args:
+            content: Response payload
+
+        Returns:
+            bytes: Encoded JSON payload
+        """
+        return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+class JSONBodyCache:
+    """Time-bounded cache for an encoded JSON response body.
+
+    The body is rebuilt when the TTL expires or when it is requested for a
+    different source object (for example after the service is replaced).
+    Building happens without awaiting, so concurrent requests never build
+    the same body twice.
+    """
+
+    def __init__(self, ttl: float):
+        """Initialize the cache.
+
+        Args:
+            ttl: Time in seconds before the cached body is rebuilt
+        """
+        self.ttl = ttl
+        self._source: Any = None
+        self._body: Optional[bytes] = None
+        self._expires_at = 0.0
+
+    def get(self, source: Any, build: Callable[[], Any]) -> bytes:
+        """Get the cached body, rebuilding it if needed.
+
+        Args:
+            source: Object the payload is built from
+            build: Callable returning the payload to encode
+
+        Returns:
+            bytes: Encoded JSON body
+        """
+        now = time.monotonic()
+        if self._body is None or source is not self._source or now >= self._expires_at:
+            self._body = orjson.dumps(build(), default=orjson_default, option=ORJSON_OPTIONS)
+            self._source = source
+            self._expires_at = now + self.ttl
+        return self._body
+
+    def clear(self) -> None:
+        """Drop the cached body."""
+        self._source = None
+        self._body = None
+        self._expires_at = 0.0
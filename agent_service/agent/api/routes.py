@@ -2,12 +2,13 @@
 
 import logging
 from typing import Dict, Any, List
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Response, WebSocket, WebSocketDisconnect
 
 from ..domain.models import CommandRequest, CommandResponse, ExecutorInfo
 from ..application.command_service import CommandService
 from ..application.agent_service import AgentService
-from .auth import authenticate
+from .dependencies import AgentServiceDep, CommandServiceDep
+from .responses import AgentJSONResponse, JSONBodyCache
 from .websocket import ConnectionManager
 
 logger = logging.getLogger("agent.api")
@@ -18,70 +19,75 @@ router = APIRouter(prefix="/agent", tags=["agent"])
 # Create connection manager
 manager = ConnectionManager()
 
+# Agent and executor information only changes when executors connect or
+# disconnect, so the encoded responses are reused for a short time
+INFO_CACHE_TTL = 30.0
+info_cache = JSONBodyCache(INFO_CACHE_TTL)
+executors_cache = JSONBodyCache(INFO_CACHE_TTL)
+
 # Routes
-@router.get("/info", response_model=Dict[str, Any])
+@router.get("/info", responses={200: {"model": Dict[str, Any]}})
 async def get_info(
-    agent_service: AgentService = Depends(),
-    authenticated: bool = Depends(authenticate)
-) -> Dict[str, Any]:
+    agent_service: AgentService = AgentServiceDep
+) -> Response:
     """Get agent information.
     
     Returns:
-        Dict[str, Any]: Agent information
+        Response: Agent information
     """
     logger.info("Getting agent information")
-    return agent_service.get_agent_info()
+    body = info_cache.get(agent_service, agent_service.get_agent_info)
+    return Response(content=body, media_type="application/json")
 
-@router.get("/executors", response_model=Dict[str, ExecutorInfo])
+@router.get("/executors", responses={200: {"model": Dict[str, ExecutorInfo]}})
 async def get_executors(
-    agent_service: AgentService = Depends(),
-    authenticated: bool = Depends(authenticate)
-) -> Dict[str, ExecutorInfo]:
+    agent_service: AgentService = AgentServiceDep
+) -> Response:
     """Get available executors.
     
     Returns:
-        Dict[str, ExecutorInfo]: Available executors
+        Response: Available executors
     """
     logger.info("Getting available executors")
-    return agent_service.get_available_executors()
+    body = executors_cache.get(agent_service, agent_service.get_available_executors)
+    return Response(content=body, media_type="application/json")
 
-@router.get("/history", response_model=List[CommandResponse])
+@router.get("/history", responses={200: {"model": List[CommandResponse]}})
 async def get_history(
     limit: int = 10,
-    command_service: CommandService = Depends(),
-    authenticated: bool = Depends(authenticate)
-) -> List[CommandResponse]:
+    command_service: CommandService = CommandServiceDep
+) -> AgentJSONResponse:
     """Get command execution history.
     
     Args:
         limit: Maximum number of history items to return
         
     Returns:
-        List[CommandResponse]: Command execution history
+        AgentJSONResponse: Command execution history
     """
-    logger.info(f"Getting command history with limit: {limit}")
-    return command_service.get_command_history(limit)
+    logger.info("Getting command history with limit: %s", limit)
+    # Results are dicts or domain dataclasses, which orjson encodes directly
+    return AgentJSONResponse(list(command_service.get_command_history(limit)))
 
-@router.post("/execute", response_model=CommandResponse)
+@router.post("/execute", responses={200: {"model": CommandResponse}})
 async def execute_command(
     request: CommandRequest,
-    command_service: CommandService = Depends(),
-    authenticated: bool = Depends(authenticate)
-) -> CommandResponse:
+    command_service: CommandService = CommandServiceDep
+) -> AgentJSONResponse:
     """Execute a command.
     
     Args:
         request: Command execution request
         
     Returns:
-        CommandResponse: Command execution result
+        AgentJSONResponse: Command execution result
     """
-    logger.info(f"Executing command: {request.command} with executor: {request.executor_type}")
+    logger.info("Executing command: %s with executor: %s", request.command, request.executor_type)
     result = await command_service.execute_command(
         command=request.command,
         executor_type=request.executor_type
     )
-    return result
+    return AgentJSONResponse(result)
 
 @router.websocket("/ws/{command_id}")
 async def websocket_endpoint(websocket: WebSocket, command_id: str):
@@ -99,30 +105,28 @@ async def websocket_endpoint(websocket: WebSocket, command_id: str):
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
-@router.post("/execute_with_progress", response_model=CommandResponse)
+@router.post("/execute_with_progress", responses={200: {"model": CommandResponse}})
 async def execute_command_with_progress(
     request: CommandRequest,
-    command_service: CommandService = Depends(),
-    authenticated: bool = Depends(authenticate)
-) -> CommandResponse:
+    command_service: CommandService = CommandServiceDep
+) -> AgentJSONResponse:
     """Execute a command with progress updates via WebSocket.
     
     Args:
         request: Command execution request
         
     Returns:
-        CommandResponse: Command execution result
+        AgentJSONResponse: Command execution result
     """
-    logger.info(f"Executing command with progress: {request.command} with executor: {request.executor_type}")
+    logger.info("Executing command with progress: %s with executor: %s", request.command, request.executor_type)
     
     async def progress_callback(data: Dict[str, Any]):
-        """Send progress updates to all connected WebSocket clients.
+        """Queue progress updates for all connected WebSocket clients.
         
         Args:
             data: Progress data
         """
-        for connection in manager.active_connections:
-            await manager.send_progress(connection, data)
+        manager.queue_progress(data)
     
     result = await command_service.execute_command(
         command=request.command,
@@ -130,4 +134,4 @@ async def execute_command_with_progress(
         progress_callback=progress_callback
     )
     
-    return result 
\ No newline at end of file
+    return AgentJSONResponse(result) 
\ No newline at end of file
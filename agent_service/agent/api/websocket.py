@@ -1,11 +1,21 @@
 """WebSocket connection manager for the agent API."""
 
+import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import Set, Dict, Any
+
+import orjson
 from fastapi import WebSocket
 
 logger = logging.getLogger("agent.api.websocket")
 
+# Window in seconds used to coalesce queued progress updates into one frame
+FLUSH_INTERVAL = 0.02
+
+# Maximum number of pending progress updates per connection; the oldest
+# update is dropped when a slow client falls behind
+PROGRESS_QUEUE_SIZE = 64
+
 class ConnectionManager:
     """WebSocket connection manager.
     
@@ -19,14 +29,18 @@ class ConnectionManager:
         """Create a new instance if one doesn't exist."""
         if cls._instance is None:
             cls._instance = super(ConnectionManager, cls).__new__(cls)
-            cls._instance.active_connections = []
+            cls._instance.active_connections = set()
+            cls._instance.queues = {}
+            cls._instance.flush_tasks = {}
         return cls._instance
     
     def __init__(self):
         """Initialize the connection manager."""
         # Initialize active_connections only if it doesn't exist
         if not hasattr(self, "active_connections"):
-            self.active_connections: List[WebSocket] = []
+            self.active_connections: Set[WebSocket] = set()
+            self.queues: Dict[WebSocket, asyncio.Queue] = {}
+            self.flush_tasks: Dict[WebSocket, asyncio.Task] = {}
     
     async def connect(self, websocket: WebSocket):
         """Connect a WebSocket client.
@@ -35,8 +49,11 @@ class ConnectionManager:
             websocket: WebSocket connection
         """
         await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"WebSocket client connected. Total connections: {len(self.active_connections)}")
+        self.active_connections.add(websocket)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PROGRESS_QUEUE_SIZE)
+        self.queues[websocket] = queue
+        self.flush_tasks[websocket] = asyncio.create_task(self._flush_queue(websocket, queue))
+        logger.info("WebSocket client connected. Total connections: %s", len(self.active_connections))
     
     def disconnect(self, websocket: WebSocket):
         """Disconnect a WebSocket client.
@@ -44,8 +61,13 @@ class ConnectionManager:
         Args:
             websocket: WebSocket connection
         """
-        self.active_connections.remove(websocket)
-        logger.info(f"WebSocket client disconnected. Total connections: {len(self.active_connections)}")
+        self.active_connections.discard(websocket)
+        self.queues.pop(websocket, None)
+        task = self.flush_tasks.pop(websocket, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("WebSocket client disconnected. Total connections: %s", len(self.active_connections))
     
     async def send_progress(self, websocket: WebSocket, data: Dict[str, Any]):
         """Send progress update to a WebSocket client.
@@ -57,10 +79,9 @@ class ConnectionManager:
         try:
             await websocket.send_json(data)
         except Exception as e:
-            logger.error(f"Error sending progress update: {str(e)}")
+            logger.error("Error sending progress update: %s", e)
             # Remove the connection if it's closed
-            if websocket in self.active_connections:
-                self.disconnect(websocket)
+            self.disconnect(websocket)
     
     async def broadcast(self, data: Dict[str, Any]):
         """Broadcast a message to all connected clients.
@@ -69,14 +90,58 @@ class ConnectionManager:
             data: Message data
         """
         disconnected = []
-        for connection in self.active_connections:
+        for connection in tuple(self.active_connections):
             try:
                 await connection.send_json(data)
             except Exception as e:
-                logger.error(f"Error broadcasting message: {str(e)}")
+                logger.error("Error broadcasting message: %s", e)
                 disconnected.append(connection)
         
         # Remove disconnected clients
         for connection in disconnected:
-            if connection in self.active_connections:
-                self.disconnect(connection) 
\ No newline at end of file
+            self.disconnect(connection)
+    
+    def queue_progress(self, data: Dict[str, Any]):
+        """Queue a progress update for every connected client without blocking.
+        
+        Queued updates are coalesced and sent by each connection's flush task.
+        If a client's queue is full, its oldest pending update is dropped so a
+        slow client never stalls command execution or grows memory unbounded.
+        
+        Args:
+            data: Progress data
+        """
+        for queue in self.queues.values():
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(data)
+    
+    async def _flush_queue(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send queued messages to a client in batches.
+        
+        Waits for a message, collects whatever else arrives within
+        FLUSH_INTERVAL and sends the batch as a single binary JSON frame.
+        
+        Args:
+            websocket: WebSocket connection
+            queue: Queue of pending messages for the connection
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + FLUSH_INTERVAL
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await websocket.send_bytes(orjson.dumps(batch))
+            except Exception as e:
+                logger.error("Error sending progress update: %s", e)
+                self.disconnect(websocket)
+                return
@@ -6,7 +6,7 @@ from fastapi import Depends
 
 from ..domain.models import ExecutorInfo, AgentInfo
 from ..config import config
-from ..infrastructure.executor_factory import ExecutorFactory
+from ..infrastructure.executor_factory import ExecutorFactory, get_executor_factory
 
 logger = logging.getLogger("agent.application.agent_service")
 
@@ -19,7 +19,7 @@ class AgentService:
     
     def __init__(
         self,
-        executor_factory: ExecutorFactory = Depends()
+        executor_factory: ExecutorFactory = Depends(get_executor_factory)
     ):
         """Initialize the agent service.
         
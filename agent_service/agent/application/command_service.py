@@ -1,14 +1,14 @@
 """Command service for executing commands and managing command history."""
 
 import logging
-import uuid
+import secrets
 from typing import Dict, Any, List, Optional, Callable, Awaitable
 from datetime import datetime, timezone
 from fastapi import Depends
 
 from ..domain.models import CommandResponse
-from ..infrastructure.command_repository import CommandRepository
-from ..infrastructure.executor_factory import ExecutorFactory
+from ..infrastructure.command_repository import CommandRepository, get_command_repository
+from ..infrastructure.executor_factory import ExecutorFactory, get_executor_factory
 
 logger = logging.getLogger("agent.application.command_service")
 
@@ -21,8 +21,8 @@ class CommandService:
     
     def __init__(
         self,
-        command_repository: CommandRepository = Depends(),
-        executor_factory: ExecutorFactory = Depends()
+        command_repository: CommandRepository = Depends(get_command_repository),
+        executor_factory: ExecutorFactory = Depends(get_executor_factory)
     ):
         """Initialize the command service.
         
@@ -64,22 +64,23 @@ class CommandService:
         """
         # Generate command ID if not provided
         if not command_id:
-            command_id = str(uuid.uuid4())
+            command_id = secrets.token_hex(16)
         
         # Get appropriate executor
         executor = self.executor_factory.get_executor(executor_type)
         
         # Log command execution
-        logger.info(f"Executing command with {executor.get_type()} executor: {command}")
+        logger.info("Executing command with %s executor: %s", executor.get_type(), command)
         
         # Send initial progress update
         if progress_callback:
+            started_at = datetime.now(timezone.utc).isoformat()
             await progress_callback({
                 "command_id": command_id,
                 "status": "starting",
                 "progress": 0,
                 "message": f"Starting command execution with {executor.get_type()} executor",
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": started_at
             })
         
         # Execute command
@@ -1,7 +1,7 @@
 """Data transfer objects for the agent service."""
 
-from agent_service.agent.application.dtos.command_request_dto import CommandRequestDTO
-from agent_service.agent.application.dtos.command_response_dto import CommandResponseDTO
+from agent.application.dtos.command_request_dto import CommandRequestDTO
+from agent.application.dtos.command_response_dto import CommandResponseDTO
 
 __all__ = [
     'CommandRequestDTO',
@@ -3,8 +3,10 @@
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
 
+from agent.utils import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class CommandRequestDTO:
     """Command request data transfer object."""
     
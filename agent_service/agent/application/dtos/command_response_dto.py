@@ -1,11 +1,13 @@
 """Command response data transfer object for the agent service."""
 
-from dataclasses import dataclass
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
 from datetime import datetime
 
+from agent.utils import DATACLASS_SLOTS, parse_iso
 
-@dataclass
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class CommandResponseDTO:
     """Command response data transfer object."""
     
@@ -19,6 +21,12 @@ class CommandResponseDTO:
     execution_type: str
     target: str
     status: str
+    _timestamp_iso: Optional[str] = field(init=False, default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Format the timestamp once so repeated serialization reuses it."""
+        timestamp = self.timestamp.isoformat() if isinstance(self.timestamp, datetime) else self.timestamp
+        object.__setattr__(self, "_timestamp_iso", timestamp)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the command response to a dictionary.
@@ -33,7 +41,7 @@ class CommandResponseDTO:
             "exit_code": self.exit_code,
             "stdout": self.stdout,
             "stderr": self.stderr,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self._timestamp_iso,
             "execution_type": self.execution_type,
             "target": self.target,
             "status": self.status
@@ -51,8 +59,8 @@ class CommandResponseDTO:
         """
         # Convert ISO format timestamp to datetime if it's a string
         timestamp = data.get("timestamp")
-        if isinstance(timestamp, str):
-            timestamp = datetime.fromisoformat(timestamp)
+        if type(timestamp) is str:
+            timestamp = parse_iso(timestamp)
         elif timestamp is None:
             timestamp = datetime.now()
             
@@ -3,21 +3,47 @@
 import logging
 import uuid
 import asyncio
-from typing import Dict, Any, Optional, Callable, Awaitable, List
+import time
+from collections import deque
+from itertools import islice
+from typing import Dict, Any, Optional, Callable, Awaitable, List, Deque, Mapping, Tuple
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 
 from agent.domain.interfaces.command_executor import CommandExecutorInterface
 from agent.domain.models.command import Command
 from agent.domain.models.executor import Executor
 from agent.application.dtos import CommandRequestDTO, CommandResponseDTO
-from agent.utils import UTC
+from agent.utils import HOST_INFO, UTC
 
 logger = logging.getLogger("agent.manager")
 
+# Seconds an "auto" executor resolution is reused before it is checked again
+AUTO_EXECUTOR_TTL = 5.0
+
+# Fields shared by every error result
+_ERROR_RESULT_TEMPLATE = MappingProxyType({
+    "exit_code": 1,
+    "stdout": "",
+    "execution_type": "error",
+    "target": "agent",
+    "status": "error"
+})
+
 
 class AgentManager:
     """Manager for handling command execution and managing executors."""
     
+    __slots__ = (
+        "executors",
+        "_executor_info_cache",
+        "command_history",
+        "_auto_cache",
+        "_auto_ttl",
+        "agent_info_payload"
+    )
+    
     def __init__(self, executors: Dict[str, CommandExecutorInterface] = None):
         """Initialize the agent manager.
         
@@ -26,22 +52,82 @@ class AgentManager:
         """
         self.executors: Dict[str, CommandExecutorInterface] = executors or {}
         
+        # Executor information, rebuilt only when the executors change
+        self._executor_info_cache: Dict[str, Dict[str, Any]] = {
+            name: executor.get_info() for name, executor in self.executors.items()
+        }
+        
         # Command history
-        self.command_history: List[Dict[str, Any]] = []
-        self.max_history_size = 100
+        self.command_history: Deque[Dict[str, Any]] = deque(maxlen=100)
+        
+        # Cached "auto" executor resolution and the time it was made
+        self._auto_cache: Tuple[Optional[CommandExecutorInterface], float] = (None, 0.0)
+        self._auto_ttl = AUTO_EXECUTOR_TTL
+        
+        # Agent information sent to the Controller Service; it does not change
+        # for the lifetime of the process, so it is built once
+        self.agent_info_payload: Dict[str, Any] = self._build_agent_info()
     
-    def get_available_executors(self) -> Dict[str, Dict[str, Any]]:
-        """Get available executors.
+    def _build_agent_info(self) -> Dict[str, Any]:
+        """Build the agent information from the registered executors.
         
         Returns:
-            Dict[str, Dict[str, Any]]: Dictionary of available executors
+            Dict[str, Any]: Agent information
+        """
+        local_executor = self.executors.get("local")
+        local_info = getattr(local_executor, "target_info", {}) if local_executor else {}
+        ssh_executor = self.executors.get("ssh")
+        ssh_info = getattr(ssh_executor, "target_info", {}) if ssh_executor else {}
+        return {
+            "hostname": local_info.get("hostname", HOST_INFO["hostname"]),
+            "platform": local_info.get("platform", HOST_INFO["platform"]),
+            "version": local_info.get("version", HOST_INFO["version"]),
+            "python_version": HOST_INFO["python_version"],
+            "ssh_enabled": getattr(ssh_executor, "enabled", False),
+            "ssh_target": f"{ssh_info.get('username', '')}@{ssh_info.get('host', '')}" if ssh_executor else None
+        }
+    
+    @property
+    def max_history_size(self) -> int:
+        """Maximum number of results kept in the command history."""
+        return self.command_history.maxlen
+    
+    @max_history_size.setter
+    def max_history_size(self, size: int) -> None:
+        """Resize the command history, keeping the most recent results.
+        
+        Args:
+            size: New maximum number of history items
         """
-        available_executors = {}
-        for name, executor in self.executors.items():
-            executor_info = executor.get_info()
-            available_executors[name] = executor_info
+        self.command_history = deque(self.command_history, maxlen=size)
+    
+    def register_executor(self, name: str, executor: CommandExecutorInterface) -> None:
+        """Register an executor and cache its information.
         
-        return available_executors
+        Args:
+            name: Executor name
+            executor: Executor instance
+        """
+        self.executors[name] = executor
+        self._executor_info_cache[name] = executor.get_info()
+        self.invalidate_auto_cache()
+    
+    def refresh_executor_info(self) -> None:
+        """Rebuild the cached executor information from the executors."""
+        self._executor_info_cache = {
+            name: executor.get_info() for name, executor in self.executors.items()
+        }
+    
+    def get_available_executors(self) -> Mapping[str, Dict[str, Any]]:
+        """Get available executors.
+        
+        The information is collected when executors are registered; call
+        refresh_executor_info() to pick up changes in executor state.
+        
+        Returns:
+            Mapping[str, Dict[str, Any]]: Read-only mapping of available executors
+        """
+        return MappingProxyType(self._executor_info_cache)
     
     def get_command_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get command execution history.
@@ -53,7 +139,10 @@ class AgentManager:
             List[Dict[str, Any]]: List of command execution results
         """
         # Return the most recent history items
-        return self.command_history[-limit:] if limit > 0 else []
+        if limit <= 0:
+            return []
+        size = len(self.command_history)
+        return list(islice(self.command_history, max(0, size - limit), size))
     
     def _add_to_history(self, result: Dict[str, Any]) -> None:
         """Add a command execution result to the history.
@@ -61,12 +150,9 @@ class AgentManager:
         Args:
             result: Command execution result
         """
-        # Add the result to the history
+        # Add the result to the history; the deque drops the oldest entry
+        # once max_history_size is reached
         self.command_history.append(result)
-        
-        # Trim the history if it exceeds the maximum size
-        if len(self.command_history) > self.max_history_size:
-            self.command_history = self.command_history[-self.max_history_size:]
     
     async def execute_command(self, 
                              command: str, 
@@ -86,29 +172,21 @@ class AgentManager:
         """
         # Generate a command ID if not provided
         if command_id is None:
-            command_id = str(uuid.uuid4())
+            command_id = uuid.uuid4().hex
         
         # Determine the executor to use
         executor = self._get_executor(executor_type)
         if executor is None:
-            logger.error(f"No suitable executor found for type: {executor_type}")
-            result = {
-                "command": command,
-                "command_id": command_id,
-                "exit_code": 1,
-                "stdout": "",
-                "stderr": f"No suitable executor found for type: {executor_type}",
-                "timestamp": datetime.now(UTC).isoformat(),
-                "execution_type": "error",
-                "target": "agent",
-                "status": "error"
-            }
+            logger.error("No suitable executor found for type: %s", executor_type)
+            result = self._make_error_result(
+                command, command_id, f"No suitable executor found for type: {executor_type}"
+            )
             self._add_to_history(result)
             return result
         
         # Execute the command
         try:
-            logger.info(f"Executing command: {command} using executor: {executor_type}")
+            logger.info("Executing command: %s using executor: %s", command, executor_type)
             result = await executor.execute(command, command_id, progress_callback)
             
             # Add status to the result
@@ -120,21 +198,32 @@ class AgentManager:
             return result
             
         except Exception as e:
-            logger.error(f"Error executing command: {str(e)}")
-            result = {
-                "command": command,
-                "command_id": command_id,
-                "exit_code": 1,
-                "stdout": "",
-                "stderr": f"Error executing command: {str(e)}",
-                "timestamp": datetime.now(UTC).isoformat(),
-                "execution_type": "error",
-                "target": "agent",
-                "status": "error"
-            }
+            logger.error("Error executing command: %s", e)
+            self.invalidate_auto_cache()
+            self.refresh_executor_info()
+            result = self._make_error_result(command, command_id, f"Error executing command: {str(e)}")
             self._add_to_history(result)
             return result
     
+    def _make_error_result(self, command: str, command_id: str, stderr: str) -> Dict[str, Any]:
+        """Create the result for a command that could not be executed.
+        
+        Args:
+            command: The command that was requested
+            command_id: ID of the command
+            stderr: Error message
+            
+        Returns:
+            Dict[str, Any]: Command execution result
+        """
+        return {
+            **_ERROR_RESULT_TEMPLATE,
+            "command": command,
+            "command_id": command_id,
+            "stderr": stderr,
+            "timestamp": datetime.now(UTC).isoformat()
+        }
+    
     def _get_executor(self, executor_type: str) -> Optional[CommandExecutorInterface]:
         """Get an executor of the specified type.
         
@@ -146,15 +235,23 @@ class AgentManager:
         """
         # If auto, determine the best executor to use
         if executor_type == "auto":
+            executor, resolved_at = self._auto_cache
+            now = time.monotonic()
+            if executor is not None and now - resolved_at < self._auto_ttl:
+                return executor
+            
             # Try SSH first if available
             if "ssh" in self.executors and self.executors["ssh"].is_available():
-                return self.executors["ssh"]
+                executor = self.executors["ssh"]
             # Fall back to local
             elif "local" in self.executors:
-                return self.executors["local"]
+                executor = self.executors["local"]
             # No suitable executor found
             else:
-                return None
+                executor = None
+            
+            self._auto_cache = (executor, now)
+            return executor
         
         # Get the specified executor if available
         if executor_type in self.executors:
@@ -163,11 +260,27 @@ class AgentManager:
         # No suitable executor found
         return None
     
+    def invalidate_auto_cache(self) -> None:
+        """Forget the cached "auto" executor so the next command re-resolves it."""
+        self._auto_cache = (None, 0.0)
+    
     def cleanup(self) -> None:
         """Clean up resources used by the manager."""
+        self.invalidate_auto_cache()
         for executor in self.executors.values():
             executor.cleanup()
 
 
-# Create a singleton instance
-agent_manager = AgentManager() 
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_agent_manager() -> AgentManager:
+    """Get the shared agent manager, created on first use.
+    
+    The manager comes from the dependency injection container so it is
+    wired with the configured executors.
+    
+    Returns:
+        AgentManager: Agent manager instance
+    """
+    # Import here to avoid circular imports
+    from agent.infrastructure.container import container
+    return container.get_agent_manager() 
\ No newline at end of file
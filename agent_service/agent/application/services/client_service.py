@@ -3,22 +3,77 @@
 import os
 import asyncio
 import logging
-import json
-from typing import Dict, Any, Optional, Callable, Awaitable
-from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Any, Optional, Callable, Awaitable, List
 
+import aiohttp
+import orjson
 import socketio
 
 from agent.infrastructure.config.config import config
-from agent.application.services.agent_manager import AgentManager
-from agent.utils import UTC
+from agent.manager import AgentManager, get_agent_manager
+from agent.utils import now_iso
 
 logger = logging.getLogger("agent.client")
 
+# Redis channels the agent publishes to
+REDIS_CHANNELS = ("command_progress", "command_results")
+
+# Seconds between refreshes of the Redis subscriber counts
+SUBSCRIBER_REFRESH_INTERVAL = 5.0
+
+# Command output size in characters above which results are encoded in a
+# worker thread instead of on the event loop
+LARGE_PAYLOAD_THRESHOLD = 65536
+
+
+class OrjsonCodec:
+    """Drop-in for the json module that encodes Socket.IO packets with orjson."""
+    
+    @staticmethod
+    def dumps(obj: Any, **kwargs) -> str:
+        """Serialize an object to a JSON string.
+        
+        orjson always produces compact output, so formatting arguments such
+        as ``separators`` are accepted and ignored.
+        
+        Args:
+            obj: Object to serialize
+            
+        Returns:
+            str: JSON string
+        """
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    @staticmethod
+    def loads(data: Any, **kwargs) -> Any:
+        """Deserialize a JSON document.
+        
+        Args:
+            data: JSON string or bytes
+            
+        Returns:
+            Any: Deserialized object
+        """
+        return orjson.loads(data)
+
 
 class ClientService:
     """Client service for the agent service."""
     
+    __slots__ = (
+        "agent_manager",
+        "sio",
+        "agent_id",
+        "connected",
+        "reconnect_attempts",
+        "_http",
+        "_token",
+        "_close_task",
+        "_sub_counts",
+        "_sub_refresh_task"
+    )
+    
     def __init__(self, agent_manager: Optional[AgentManager] = None):
         """Initialize the client service.
         
@@ -28,13 +83,17 @@ class ClientService:
         # Store the agent manager
         self.agent_manager = agent_manager
         
-        # Create a Socket.IO client
+        # Create a Socket.IO client; it reconnects on its own with exponential
+        # backoff and jitter. Per-packet logging only in debug mode.
         self.sio = socketio.AsyncClient(
             reconnection=True, 
             reconnection_attempts=config.max_reconnect_attempts, 
             reconnection_delay=config.reconnect_delay, 
-            logger=True, 
-            engineio_logger=True
+            reconnection_delay_max=config.reconnect_delay_max,
+            randomization_factor=0.5,
+            logger=config.debug, 
+            engineio_logger=config.debug,
+            json=OrjsonCodec
         )
         
         # Generate a unique agent ID
@@ -45,38 +104,130 @@ class ClientService:
         self.connected = False
         self.reconnect_attempts = 0
         
+        # HTTP session for token requests, created on first use
+        self._http: Optional[aiohttp.ClientSession] = None
+        
+        # Token reused across reconnects until the controller rejects it
+        self._token: Optional[str] = None
+        
+        # Close task scheduled by cleanup(), kept so it is not garbage collected
+        self._close_task: Optional[asyncio.Task] = None
+        
+        # Last known Redis subscriber count per channel; publishing is skipped
+        # for channels nobody listens to. Assume listeners until checked.
+        self._sub_counts: Dict[str, int] = dict.fromkeys(REDIS_CHANNELS, 1)
+        self._sub_refresh_task: Optional[asyncio.Task] = None
+        
         # Register event handlers
         self.sio.on("connect", self.handle_connect)
+        self.sio.on("connect_error", self.handle_connect_error)
         self.sio.on("disconnect", self.handle_disconnect)
         self.sio.on("connection_response", self.handle_connection_response)
+        self.sio.on("registration_response", self.handle_registration_response)
         self.sio.on("command_response", self.handle_command_response)
         self.sio.on("execute_command", self.handle_execute_command)
+        self.sio.on("execute_command_event", self.handle_execute_command)
     
-    async def start(self):
-        """Start the client service."""
-        logger.info(f"Starting client service with agent ID: {self.agent_id}")
+    async def start(self) -> bool:
+        """Start the client service and run until it disconnects.
         
-        # Get authentication token
-        token = await self.get_auth_token()
+        Returns:
+            bool: False if the controller service could not be reached, True otherwise
+        """
+        logger.info("Starting client service with agent ID: %s", self.agent_id)
+        
+        # Track Redis subscribers so unobserved channels are not published to
+        if config.redis_client:
+            self._sub_refresh_task = asyncio.create_task(self._refresh_subscriber_counts())
         
         try:
-            # Connect to the controller service
+            # Connect to the controller service; the auth callable is invoked
+            # again on every automatic reconnection attempt
             await self.sio.connect(
                 config.controller_url,
-                auth={
-                    "agent_id": self.agent_id, 
-                    "token": token,
-                    "is_agent": True
-                },
+                auth=self._get_connect_auth,
                 wait_timeout=60
             )
             
             # Wait for disconnect
             await self.sio.wait()
+            return True
             
         except Exception as e:
-            logger.error(f"Error connecting to controller service: {str(e)}")
+            logger.error("Error connecting to controller service: %s", e)
             self.connected = False
+            return False
+        
+        finally:
+            await self.aclose()
+            self.get_agent_manager().cleanup()
+    
+    async def _get_connect_auth(self) -> Dict[str, Any]:
+        """Get the authentication data for a connection attempt.
+        
+        A token is only requested when there is no cached one, so reconnects
+        reuse the token until the controller rejects it.
+        
+        Returns:
+            Dict[str, Any]: Authentication data for the Controller Service
+        """
+        if self._token is None:
+            self._token = await self.get_auth_token()
+        return {
+            "agent_id": self.agent_id,
+            "token": self._token,
+            "is_agent": True,
+            "agent_info": self.get_agent_info()
+        }
+    
+    async def _refresh_subscriber_counts(self) -> None:
+        """Periodically update the Redis subscriber count of each channel."""
+        while True:
+            try:
+                counts = await config.redis_client.pubsub_numsub(*REDIS_CHANNELS)
+                for channel, count in counts:
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    self._sub_counts[channel] = count
+            except Exception as e:
+                logger.error("Error checking Redis subscribers: %s", e)
+                # Fall back to publishing until the counts can be read again
+                self._sub_counts = dict.fromkeys(REDIS_CHANNELS, 1)
+            await asyncio.sleep(SUBSCRIBER_REFRESH_INTERVAL)
+    
+    def get_agent_manager(self) -> AgentManager:
+        """Get the agent manager, falling back to the shared one if none was given.
+        
+        Returns:
+            AgentManager: Agent manager instance
+        """
+        if not self.agent_manager:
+            self.agent_manager = get_agent_manager()
+        return self.agent_manager
+    
+    def get_agent_info(self) -> Dict[str, Any]:
+        """Get the agent information sent to the Controller Service.
+        
+        Returns:
+            Dict[str, Any]: Agent information
+        """
+        return self.get_agent_manager().agent_info_payload
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session used for token requests.
+        
+        Returns:
+            aiohttp.ClientSession: Open HTTP session
+        """
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession()
+        return self._http
+    
+    async def close_http_session(self) -> None:
+        """Close the HTTP session used for token requests."""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
     
     async def get_auth_token(self) -> Optional[str]:
         """Get authentication token from the Controller Service.
@@ -85,23 +236,21 @@ class ClientService:
             Optional[str]: Authentication token, or None if authentication fails
         """
         try:
-            logger.info(f"Requesting authentication token from {config.controller_url}/token")
-            import requests  # Import here to avoid circular imports
+            logger.info("Requesting authentication token from %s/token", config.controller_url)
             
-            response = requests.post(
+            async with self._get_http_session().post(
                 f"{config.controller_url}/token",
                 data={"username": config.agent_username, "password": config.agent_password}
-            )
-            
-            if response.status_code == 200:
-                token = response.json()["access_token"]
-                logger.info("Authentication successful")
-                return token
-            else:
-                logger.error(f"Authentication failed: {response.status_code} - {response.text}")
-                return None
+            ) as response:
+                if response.status == 200:
+                    token = (await response.json())["access_token"]
+                    logger.info("Authentication successful")
+                    return token
+                else:
+                    logger.error("Authentication failed: %s - %s", response.status, await response.text())
+                    return None
         except Exception as e:
-            logger.error(f"Error during authentication: {str(e)}")
+            logger.error("Error during authentication: %s", e)
             return None
     
     async def handle_connect(self):
@@ -111,7 +260,19 @@ class ClientService:
         logger.info("Connected to Controller Service")
         
         # Register the agent with the Controller Service
-        await self.sio.emit("register", {"agent_id": self.agent_id})
+        await self.sio.emit("register_agent", {"agent_info": self.get_agent_info()})
+    
+    async def handle_connect_error(self, data=None):
+        """Handle a rejected or failed connection attempt.
+        
+        The cached token is dropped so the next reconnection attempt
+        requests a new one.
+        
+        Args:
+            data: Error information from the Controller Service
+        """
+        self._token = None
+        logger.error("Connection to Controller Service failed: %s", data)
     
     async def handle_disconnect(self):
         """Handle disconnection from the Controller Service."""
@@ -124,7 +285,22 @@ class ClientService:
         Args:
             data: Connection response data
         """
-        logger.info(f"Connection response: {data}")
+        logger.info("Connection response: %s", data)
+    
+    async def handle_registration_response(self, data):
+        """Handle registration response from the Controller Service.
+        
+        Args:
+            data: Registration response data
+        """
+        logger.info("Registration response: %s", data)
+        
+        if data.get('status') == 'success':
+            # Use the agent ID assigned by the Controller Service
+            self.agent_id = data.get('agent_id', self.agent_id)
+            logger.info("Agent registered successfully with ID: %s", self.agent_id)
+        else:
+            logger.error("Agent registration failed: %s", data.get('message', 'Unknown error'))
     
     async def handle_command_response(self, data):
         """Handle command response from the Controller Service.
@@ -132,7 +308,9 @@ class ClientService:
         Args:
             data: Command response data
         """
-        logger.info(f"Command response received: {data}")
+        # The payload can be large; only format it when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Command response received: %s", data)
     
     async def handle_execute_command(self, data):
         """Handle command execution request from the Controller Service.
@@ -140,7 +318,9 @@ class ClientService:
         Args:
             data: Command execution request data
         """
-        logger.info(f"Received command execution request: {data}")
+        # The payload can be large; only format it when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received command execution request: %s", data)
         
         # Validate the request
         if not isinstance(data, dict) or 'command' not in data:
@@ -148,7 +328,7 @@ class ClientService:
             await self.sio.emit('command_result', {
                 'status': 'error',
                 'message': 'Invalid command format',
-                'timestamp': datetime.now(UTC).isoformat()
+                'timestamp': now_iso()
             })
             return
         
@@ -161,82 +341,151 @@ class ClientService:
         # Get execution target if specified
         executor_type = data.get('execution_target', 'auto')
         
-        # Create a progress callback
-        async def progress_callback(progress_data):
-            await self.send_command_progress(command_id, requester_sid, progress_data)
-        
-        # Get the agent manager
-        if not self.agent_manager:
-            # Import here to avoid circular imports
-            from agent.infrastructure.container import container
-            self.agent_manager = container.get_agent_manager()
+        # Queue progress updates; a flush task sends them in batches
+        progress_callback = None
+        progress_queue: asyncio.Queue = asyncio.Queue()
+        flush_task = None
+        if command_id:
+            async def progress_callback(progress_data):
+                progress_queue.put_nowait(progress_data)
+            
+            flush_task = asyncio.create_task(
+                self._flush_progress(command_id, requester_sid, progress_queue)
+            )
         
         # Execute the command using the agent manager
-        result = await self.agent_manager.execute_command(
-            command=data['command'],
-            executor_type=executor_type,
-            command_id=command_id,
-            progress_callback=progress_callback
-        )
+        try:
+            result = await self.get_agent_manager().execute_command(
+                command=data['command'],
+                executor_type=executor_type,
+                command_id=command_id,
+                progress_callback=progress_callback
+            )
+        finally:
+            # Send any remaining progress before the result
+            if flush_task is not None:
+                progress_queue.put_nowait(None)
+                await flush_task
         
-        # Send the result back to the Controller Service
-        await self.sio.emit('command_result', {
+        # Build the result envelope once for Socket.IO and Redis
+        envelope = {
             'status': 'success' if result['exit_code'] == 0 else 'error',
             'command': data['command'],
             'command_id': command_id,
             'result': result,
             'requester_sid': requester_sid,
-            'timestamp': datetime.now(UTC).isoformat()
-        })
+            'timestamp': now_iso()
+        }
         
-        # Publish to Redis if available
-        if config.redis_client:
-            config.redis_client.publish('command_results', json.dumps({
-                'type': 'command_result',
-                'data': {
-                    'status': 'success' if result['exit_code'] == 0 else 'error',
-                    'command': data['command'],
-                    'command_id': command_id,
-                    'result': result,
-                    'requester_sid': requester_sid,
-                    'timestamp': datetime.now(UTC).isoformat()
-                }
-            }))
-    
-    async def send_command_progress(self, command_id, requester_sid, progress_data):
-        """Send command progress updates to the Controller Service.
+        # Send the result back to the Controller Service
+        await self.sio.emit('command_result', envelope)
+        
+        # Publish to Redis if available and someone is subscribed
+        if config.redis_client and self._sub_counts['command_results']:
+            payload = {'type': 'command_result', 'data': envelope}
+            output_size = len(result.get('stdout') or '') + len(result.get('stderr') or '')
+            if output_size > LARGE_PAYLOAD_THRESHOLD:
+                # Encode large outputs in a worker thread to keep the loop responsive
+                buffer = await asyncio.to_thread(orjson.dumps, payload)
+            else:
+                buffer = orjson.dumps(payload)
+            await config.redis_client.publish('command_results', buffer)
+    
+    async def _flush_progress(self, command_id, requester_sid, queue: asyncio.Queue):
+        """Send queued progress updates for a command in batches.
+        
+        Waits for an update, lets more accumulate for
+        config.progress_flush_interval seconds and sends up to
+        config.progress_max_batch of them as one frame. Stops after sending
+        the updates queued before a None sentinel.
+        
+        Args:
+            command_id: Command ID
+            requester_sid: Requester's Socket.IO session ID
+            queue: Queue of pending progress updates
+        """
+        done = False
+        while not done:
+            item = await queue.get()
+            if item is None:
+                return
+            batch = [item]
+            await asyncio.sleep(config.progress_flush_interval)
+            while len(batch) < config.progress_max_batch:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+            await self.send_command_progress(command_id, requester_sid, batch)
+    
+    async def send_command_progress(self, command_id, requester_sid, progress_chunks: List[Dict[str, Any]]):
+        """Send a batch of command progress updates to the Controller Service.
         
         Args:
             command_id: Command ID
             requester_sid: Requester's Socket.IO session ID
-            progress_data: Progress data
+            progress_chunks: Progress updates to send in one frame
         """
         if not command_id:
             return
         
         try:
-            # Add command ID and requester SID to progress data
-            progress_data['command_id'] = command_id
-            progress_data['requester_sid'] = requester_sid
+            progress_data = {
+                'command_id': command_id,
+                'requester_sid': requester_sid,
+                'chunks': progress_chunks
+            }
             
             # Send progress update via Socket.IO
             if self.connected:
                 await self.sio.emit('command_progress', progress_data)
             
-            # Publish to Redis if available
-            if config.redis_client:
-                config.redis_client.publish('command_progress', json.dumps({
+            # Publish to Redis if available and someone is subscribed
+            if config.redis_client and self._sub_counts['command_progress']:
+                await config.redis_client.publish('command_progress', orjson.dumps({
                     'type': 'command_progress',
                     'data': progress_data
                 }))
         except Exception as e:
-            logger.error(f"Error sending command progress: {str(e)}")
+            logger.error("Error sending command progress: %s", e)
     
-    def cleanup(self):
-        """Clean up resources used by the client service."""
+    async def aclose(self) -> None:
+        """Disconnect from the Controller Service and release network resources."""
+        if self._sub_refresh_task is not None:
+            self._sub_refresh_task.cancel()
+            self._sub_refresh_task = None
         if self.connected:
-            asyncio.create_task(self.sio.disconnect())
+            await self.sio.disconnect()
+        await self.close_http_session()
+    
+    def cleanup(self):
+        """Clean up resources used by the client service.
+        
+        Async callers should await aclose() instead. When called from inside
+        a running event loop, the close is scheduled on that loop and the task
+        is kept on the instance until it finishes.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.aclose())
+            return
+        self._close_task = loop.create_task(self.aclose())
 
 
-# Create a singleton instance
-client_service = ClientService() 
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_client_service() -> ClientService:
+    """Get the shared client service, created on first use.
+    
+    Commands run on the executors of the shared agent manager, which the
+    API's executor factory uses as well, so the process keeps one set of
+    executors and one SSH connection.
+    
+    Returns:
+        ClientService: Client service instance
+    """
+    return ClientService(agent_manager=get_agent_manager()) 
\ No newline at end of file
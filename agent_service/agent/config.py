@@ -2,9 +2,12 @@
 
 import os
 import logging
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 from dotenv import load_dotenv
 
+from .utils import HOST_INFO
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -24,6 +27,9 @@ class Config:
     
     def __init__(self):
         """Initialize the configuration."""
+        # Read-only SSH configuration, built on first use (see ssh_config)
+        self._ssh_config: Optional[Mapping[str, Any]] = None
+        
         # Controller settings
         self.controller_url = os.getenv("CONTROLLER_URL", "http://localhost:8000")
         self.agent_username = os.getenv("AGENT_USERNAME", "admin")
@@ -35,14 +41,16 @@ class Config:
         self.redis_url = os.getenv("REDIS_URL")
         self.redis_client = None
         
-        # Initialize Redis client if URL is provided
+        # Initialize Redis client if URL is provided. The asyncio client keeps
+        # a connection pool, so every publish reuses the same connections
+        # without blocking the event loop.
         if self.redis_url:
             try:
-                import redis
-                self.redis_client = redis.from_url(self.redis_url)
-                logger.info(f"Connected to Redis at {self.redis_url}")
+                from redis import asyncio as aioredis
+                self.redis_client = aioredis.from_url(self.redis_url)
+                logger.info("Connected to Redis at %s", self.redis_url)
             except Exception as e:
-                logger.error(f"Failed to connect to Redis: {str(e)}")
+                logger.error("Failed to connect to Redis: %s", e)
                 self.redis_client = None
         
         # API settings
@@ -61,30 +69,62 @@ class Config:
         self.ssh_password = os.getenv("SSH_PASSWORD", "")
         self.ssh_key_path = os.getenv("SSH_KEY_PATH", "~/.ssh/id_rsa")
         self.ssh_timeout = os.getenv("SSH_TIMEOUT", "10")
+        # Maximum number of commands sharing the SSH connection at once; keep
+        # it at or below the server's MaxSessions (10 by default)
+        self.ssh_pool_size = int(os.getenv("SSH_POOL_SIZE", "4"))
+        # Seconds between keepalive packets on an idle SSH connection, so
+        # NAT and firewall idle timeouts do not silently drop it (0 disables)
+        self.ssh_keepalive_interval = int(os.getenv("SSH_KEEPALIVE_INTERVAL", "30"))
+        # Most bytes of stdout (and of stderr) kept per SSH command; output
+        # beyond this is dropped so a runaway command cannot exhaust memory
+        self.ssh_max_output_bytes = int(os.getenv("SSH_MAX_OUTPUT_BYTES", str(8 * 1024 * 1024)))
+        # Longest wait (in seconds) between reconnect attempts after repeated
+        # SSH connection failures
+        self.ssh_reconnect_backoff_max = float(os.getenv("SSH_RECONNECT_BACKOFF_MAX", "60"))
         
         # System info
-        import platform
-        self.hostname = platform.node()
-        self.platform = platform.system()
-        self.version = platform.version()
-        self.python_version = platform.python_version()
+        self.hostname = HOST_INFO["hostname"]
+        self.platform = HOST_INFO["platform"]
+        self.version = HOST_INFO["version"]
+        self.python_version = HOST_INFO["python_version"]
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute, dropping the cached SSH configuration if it is an SSH setting.
+        
+        Args:
+            name: Attribute name
+            value: New value
+        """
+        object.__setattr__(self, name, value)
+        if name.startswith("ssh_"):
+            object.__setattr__(self, "_ssh_config", None)
     
     @property
-    def ssh_config(self) -> Dict[str, Any]:
+    def ssh_config(self) -> Mapping[str, Any]:
         """Get the SSH configuration.
         
+        The mapping is built once and shared by every caller; it is rebuilt
+        only after one of the SSH settings changes.
+        
         Returns:
-            Dict[str, Any]: SSH configuration dictionary
+            Mapping[str, Any]: Read-only SSH configuration
         """
-        return {
-            "enabled": self.ssh_enabled,
-            "host": self.ssh_host,
-            "port": self.ssh_port,
-            "username": self.ssh_username,
-            "password": self.ssh_password,
-            "key_path": self.ssh_key_path,
-            "timeout": self.ssh_timeout
-        }
+        ssh_config = self._ssh_config
+        if ssh_config is None:
+            ssh_config = self._ssh_config = MappingProxyType({
+                "enabled": self.ssh_enabled,
+                "host": self.ssh_host,
+                "port": self.ssh_port,
+                "username": self.ssh_username,
+                "password": self.ssh_password,
+                "key_path": self.ssh_key_path,
+                "timeout": self.ssh_timeout,
+                "pool_size": self.ssh_pool_size,
+                "keepalive_interval": self.ssh_keepalive_interval,
+                "max_output_bytes": self.ssh_max_output_bytes,
+                "reconnect_backoff_max": self.ssh_reconnect_backoff_max
+            })
+        return ssh_config
     
     def __str__(self) -> str:
         """String representation of the configuration.
@@ -94,6 +134,8 @@ class Config:
         """
         # Create a copy of the configuration without sensitive information
         config_dict = self.__dict__.copy()
+        # The cached SSH configuration repeats the settings, password included
+        config_dict.pop("_ssh_config", None)
         # Mask sensitive information
         if config_dict.get("agent_password"):
             config_dict["agent_password"] = "********"
@@ -109,11 +151,11 @@ class Config:
         
         return f"Config({config_dict})"
     
-    def cleanup(self):
+    async def cleanup(self):
         """Clean up resources."""
         if self.redis_client:
             logger.info("Closing Redis connection")
-            self.redis_client.close()
+            await self.redis_client.aclose()
             self.redis_client = None
 
 # Create a singleton instance
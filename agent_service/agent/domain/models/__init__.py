@@ -6,7 +6,10 @@ from .agent_info import AgentInfo
 from .command_progress import CommandProgress
 from .command_request import CommandRequest
 from .command_response import CommandResponse
-from .executor_info import ExecutorInfo
+
+# Executor information used to be a separate model with the same fields
+# minus the description; it is kept as an alias for existing callers
+ExecutorInfo = Executor
 
 __all__ = [
     'Command',
@@ -1,16 +1,18 @@
 """Agent information model for the agent service."""
 
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Mapping
 
+from agent.utils import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class AgentInfo:
     """Agent information model representing agent details."""
     
     version: str
     hostname: str
-    executors: Dict[str, Any]
+    executors: Mapping[str, Any]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the agent info to a dictionary.
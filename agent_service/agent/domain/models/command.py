@@ -4,9 +4,11 @@ from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+from agent.utils import DATACLASS_SLOTS, IsoTimestampMixin, parse_iso
 
-@dataclass
-class Command:
+
+@dataclass(**DATACLASS_SLOTS)
+class Command(IsoTimestampMixin):
     """Command model representing a command to be executed."""
     
     command: str
@@ -23,21 +25,30 @@ class Command:
     def to_dict(self) -> Dict[str, Any]:
         """Convert the command to a dictionary.
         
+        Optional fields that are still None (for example on a pending
+        command) are left out to keep the payload small; from_dict restores
+        them as None.
+        
         Returns:
             Dict[str, Any]: Dictionary representation of the command
         """
-        return {
+        data = {
             "command": self.command,
             "command_id": self.command_id,
             "executor_type": self.executor_type,
-            "timestamp": self.timestamp.isoformat(),
-            "exit_code": self.exit_code,
-            "stdout": self.stdout,
-            "stderr": self.stderr,
-            "execution_type": self.execution_type,
-            "target": self.target,
-            "status": self.status
+            "timestamp": self._timestamp_iso()
         }
+        for key, value in (
+            ("exit_code", self.exit_code),
+            ("stdout", self.stdout),
+            ("stderr", self.stderr),
+            ("execution_type", self.execution_type),
+            ("target", self.target),
+            ("status", self.status)
+        ):
+            if value is not None:
+                data[key] = value
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Command':
@@ -49,22 +60,27 @@ class Command:
         Returns:
             Command: Command instance
         """
+        _get = data.get
+        
         # Convert ISO format timestamp to datetime if it's a string
-        timestamp = data.get("timestamp")
-        if isinstance(timestamp, str):
-            timestamp = datetime.fromisoformat(timestamp)
+        timestamp = _get("timestamp")
+        if type(timestamp) is str:
+            timestamp = parse_iso(timestamp)
         elif timestamp is None:
             timestamp = datetime.now()
-            
-        return cls(
-            command=data.get("command", ""),
-            command_id=data.get("command_id", ""),
-            executor_type=data.get("executor_type", "local"),
-            timestamp=timestamp,
-            exit_code=data.get("exit_code"),
-            stdout=data.get("stdout"),
-            stderr=data.get("stderr"),
-            execution_type=data.get("execution_type"),
-            target=data.get("target"),
-            status=data.get("status")
-        ) 
\ No newline at end of file
+        
+        # Every field is assigned below with its default, so skip the
+        # keyword binding of the generated __init__
+        obj = object.__new__(cls)
+        obj._iso_ts = None
+        obj.command = _get("command", "")
+        obj.command_id = _get("command_id", "")
+        obj.executor_type = _get("executor_type", "local")
+        obj.timestamp = timestamp
+        obj.exit_code = _get("exit_code")
+        obj.stdout = _get("stdout")
+        obj.stderr = _get("stderr")
+        obj.execution_type = _get("execution_type")
+        obj.target = _get("target")
+        obj.status = _get("status")
+        return obj
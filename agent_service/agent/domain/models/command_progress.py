@@ -4,9 +4,11 @@ from dataclasses import dataclass
 from typing import Dict, Any
 from datetime import datetime
 
+from agent.utils import DATACLASS_SLOTS, IsoTimestampMixin, parse_iso
 
-@dataclass
-class CommandProgress:
+
+@dataclass(**DATACLASS_SLOTS)
+class CommandProgress(IsoTimestampMixin):
     """Command progress model representing the progress of a command execution."""
     
     command_id: str
@@ -26,7 +28,7 @@ class CommandProgress:
             "status": self.status,
             "progress": self.progress,
             "message": self.message,
-            "timestamp": self.timestamp.isoformat()
+            "timestamp": self._timestamp_iso()
         }
     
     @classmethod
@@ -39,17 +41,22 @@ class CommandProgress:
         Returns:
             CommandProgress: CommandProgress instance
         """
+        _get = data.get
+        
         # Convert ISO format timestamp to datetime if it's a string
-        timestamp = data.get("timestamp")
-        if isinstance(timestamp, str):
-            timestamp = datetime.fromisoformat(timestamp)
+        timestamp = _get("timestamp")
+        if type(timestamp) is str:
+            timestamp = parse_iso(timestamp)
         elif timestamp is None:
             timestamp = datetime.now()
-            
-        return cls(
-            command_id=data.get("command_id", ""),
-            status=data.get("status", ""),
-            progress=data.get("progress", 0),
-            message=data.get("message", ""),
-            timestamp=timestamp
-        ) 
\ No newline at end of file
+        
+        # Every field is assigned below with its default, so skip the
+        # keyword binding of the generated __init__
+        obj = object.__new__(cls)
+        obj._iso_ts = None
+        obj.command_id = _get("command_id", "")
+        obj.status = _get("status", "")
+        obj.progress = _get("progress", 0)
+        obj.message = _get("message", "")
+        obj.timestamp = timestamp
+        return obj
@@ -3,8 +3,10 @@
 from dataclasses import dataclass
 from typing import Dict, Any
 
+from agent.utils import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class CommandRequest:
     """Command request model representing a request to execute a command."""
     
@@ -32,7 +34,11 @@ class CommandRequest:
         Returns:
             CommandRequest: CommandRequest instance
         """
-        return cls(
-            command=data.get("command", ""),
-            executor_type=data.get("executor_type", "local")
-        ) 
\ No newline at end of file
+        _get = data.get
+        
+        # Every field is assigned below with its default, so skip the
+        # keyword binding of the generated __init__
+        obj = object.__new__(cls)
+        obj.command = _get("command", "")
+        obj.executor_type = _get("executor_type", "local")
+        return obj
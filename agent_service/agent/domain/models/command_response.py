@@ -4,9 +4,11 @@ from dataclasses import dataclass
 from typing import Dict, Any
 from datetime import datetime
 
+from agent.utils import DATACLASS_SLOTS, IsoTimestampMixin, parse_iso
 
-@dataclass
-class CommandResponse:
+
+@dataclass(**DATACLASS_SLOTS)
+class CommandResponse(IsoTimestampMixin):
     """Command response model representing the result of a command execution."""
     
     command: str
@@ -31,7 +33,7 @@ class CommandResponse:
             "exit_code": self.exit_code,
             "stdout": self.stdout,
             "stderr": self.stderr,
-            "timestamp": self.timestamp.isoformat() if isinstance(self.timestamp, datetime) else self.timestamp,
+            "timestamp": self._timestamp_iso() if isinstance(self.timestamp, datetime) else self.timestamp,
             "execution_type": self.execution_type,
             "target": self.target,
             "status": self.status
@@ -47,21 +49,26 @@ class CommandResponse:
         Returns:
             CommandResponse: CommandResponse instance
         """
+        _get = data.get
+        
         # Convert ISO format timestamp to datetime if it's a string
-        timestamp = data.get("timestamp")
-        if isinstance(timestamp, str):
-            timestamp = datetime.fromisoformat(timestamp)
+        timestamp = _get("timestamp")
+        if type(timestamp) is str:
+            timestamp = parse_iso(timestamp)
         elif timestamp is None:
             timestamp = datetime.now()
-            
-        return cls(
-            command=data.get("command", ""),
-            command_id=data.get("command_id", ""),
-            exit_code=data.get("exit_code", -1),
-            stdout=data.get("stdout", ""),
-            stderr=data.get("stderr", ""),
-            timestamp=timestamp,
-            execution_type=data.get("execution_type", ""),
-            target=data.get("target", ""),
-            status=data.get("status", "")
-        ) 
\ No newline at end of file
+        
+        # Every field is assigned below with its default, so skip the
+        # keyword binding of the generated __init__
+        obj = object.__new__(cls)
+        obj._iso_ts = None
+        obj.command = _get("command", "")
+        obj.command_id = _get("command_id", "")
+        obj.exit_code = _get("exit_code", -1)
+        obj.stdout = _get("stdout", "")
+        obj.stderr = _get("stderr", "")
+        obj.timestamp = timestamp
+        obj.execution_type = _get("execution_type", "")
+        obj.target = _get("target", "")
+        obj.status = _get("status", "")
+        return obj
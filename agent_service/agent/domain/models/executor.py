@@ -1,18 +1,52 @@
 """Executor model for the agent service."""
 
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 
+from agent.utils import DATACLASS_SLOTS
 
-@dataclass
+# Read-only target mappings shared between executors describing the same target
+_TARGET_CACHE: Dict[tuple, Mapping[str, Any]] = {}
+
+
+def freeze_target(target: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Get a shared read-only view of an executor target.
+    
+    Only a handful of distinct targets exist, so equal targets with hashable
+    values resolve to the same mapping; others get their own read-only copy.
+    
+    Args:
+        target: Target information
+        
+    Returns:
+        Mapping[str, Any]: Read-only target information
+    """
+    if type(target) is MappingProxyType:
+        return target
+    try:
+        key = tuple(sorted(target.items()))
+        frozen = _TARGET_CACHE.get(key)
+    except TypeError:
+        return MappingProxyType(dict(target))
+    if frozen is None:
+        frozen = _TARGET_CACHE[key] = MappingProxyType(dict(target))
+    return frozen
+
+
+@dataclass(**DATACLASS_SLOTS)
 class Executor:
     """Executor model representing a command executor."""
     
     type: str
     available: bool
-    target: Dict[str, Any]
+    target: Mapping[str, Any]
     description: Optional[str] = None
     
+    def __post_init__(self) -> None:
+        """Store the target as a shared read-only mapping."""
+        self.target = freeze_target(self.target)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert the executor to a dictionary.
         
@@ -22,7 +56,7 @@ class Executor:
         return {
             "type": self.type,
             "available": self.available,
-            "target": self.target,
+            "target": dict(self.target),
             "description": self.description
         }
     
@@ -36,9 +70,13 @@ class Executor:
         Returns:
             Executor: Executor instance
         """
-        return cls(
-            type=data.get("type", ""),
-            available=data.get("available", False),
-            target=data.get("target", {}),
-            description=data.get("description")
-        ) 
\ No newline at end of file
+        _get = data.get
+        
+        # Every field is assigned below with its default, so skip the
+        # keyword binding of the generated __init__
+        obj = object.__new__(cls)
+        obj.type = _get("type", "")
+        obj.available = _get("available", False)
+        obj.target = freeze_target(_get("target", {}))
+        obj.description = _get("description")
+        return obj
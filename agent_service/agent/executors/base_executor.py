@@ -1,19 +1,26 @@
 """Base executor for command execution."""
 
 import abc
+import asyncio
 import uuid
 from typing import Dict, Any, Optional, Callable, Awaitable
 from datetime import datetime
 import platform
 import logging
 
-from ..utils import UTC
+from ..utils import UTC, now_iso
 
 logger = logging.getLogger("agent.executor")
 
+# Progress updates sent in the background; the event loop only keeps weak
+# references to tasks, so they are held here until they finish
+_background_updates = set()
+
 class CommandExecutor(abc.ABC):
     """Base class for command executors."""
     
+    __slots__ = ("enabled",)
+    
     def __init__(self):
         """Initialize the command executor."""
         self.enabled = True
@@ -53,7 +60,8 @@ class CommandExecutor(abc.ABC):
         """
         pass
     
-    def _create_base_result(self, command: str, exit_code: int, stdout: str, stderr: str, execution_type: str, target: str) -> Dict[str, Any]:
+    def _create_base_result(self, command: str, exit_code: int, stdout: str, stderr: str, execution_type: str, target: str,
+                            command_id: Optional[str] = None) -> Dict[str, Any]:
         """Create a base result dictionary.
         
         Args:
@@ -63,13 +71,14 @@ class CommandExecutor(abc.ABC):
             stderr: The standard error of the command
             execution_type: The type of execution (local, ssh, etc.)
             target: The target of the execution
+            command_id: The ID of the command; a new one is generated if not provided
             
         Returns:
             Dict[str, Any]: Base result dictionary
         """
         return {
             "command": command,
-            "command_id": str(uuid.uuid4()),  # Generate a unique ID if not provided
+            "command_id": command_id or uuid.uuid4().hex,
             "exit_code": exit_code,
             "stdout": stdout,
             "stderr": stderr,
@@ -81,22 +90,84 @@ class CommandExecutor(abc.ABC):
     async def _send_progress_update(self, 
                                    command_id: Optional[str], 
                                    progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]], 
-                                   data: Dict[str, Any]) -> None:
+                                   status: str,
+                                   progress: int,
+                                   message: str,
+                                   *,
+                                   stdout: Optional[str] = None,
+                                   stderr: Optional[str] = None) -> None:
         """Send a progress update.
         
+        The payload is only built when there is a callback to receive it.
+        
         Args:
             command_id: The ID of the command
             progress_callback: The callback for progress updates
-            data: The progress data to send
+            status: The status of the command
+            progress: The progress percentage
+            message: The progress message
+            stdout: Optional recent standard output
+            stderr: Optional recent standard error
         """
         if not command_id or not progress_callback:
             return
         
+        data = {
+            'command_id': command_id,
+            'status': status,
+            'progress': progress,
+            'message': message,
+            'timestamp': now_iso()
+        }
+        if stdout is not None:
+            data['stdout'] = stdout
+        if stderr is not None:
+            data['stderr'] = stderr
+        
         try:
-            # Add command ID to progress data
-            data['command_id'] = command_id
-            
             # Call the progress callback
             await progress_callback(data)
         except Exception as e:
-            logger.error(f"Error sending command progress: {str(e)}") 
\ No newline at end of file
+            logger.error("Error sending command progress: %s", e)
+    
+    def _post_progress_update(self,
+                              command_id: Optional[str],
+                              progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]],
+                              status: str,
+                              progress: int,
+                              message: str) -> Optional[asyncio.Task]:
+        """Send a progress update in the background.
+        
+        Used for intermediate updates so the command does not wait for them
+        to be delivered. Pass the returned tasks to
+        ``_flush_progress_updates`` before sending a later update, so the
+        receiver still gets them in order.
+        
+        Args:
+            command_id: The ID of the command
+            progress_callback: The callback for progress updates
+            status: The status of the command
+            progress: The progress percentage
+            message: The progress message
+            
+        Returns:
+            Optional[asyncio.Task]: Task sending the update, or None if there is no callback
+        """
+        if not command_id or not progress_callback:
+            return None
+        task = asyncio.ensure_future(
+            self._send_progress_update(command_id, progress_callback, status, progress, message))
+        _background_updates.add(task)
+        task.add_done_callback(_background_updates.discard)
+        return task
+    
+    @staticmethod
+    async def _flush_progress_updates(*tasks: Optional[asyncio.Task]) -> None:
+        """Wait until progress updates sent in the background are delivered.
+        
+        Args:
+            tasks: Tasks returned by ``_post_progress_update``
+        """
+        pending = [task for task in tasks if task is not None and not task.done()]
+        if pending:
+            await asyncio.gather(*pending)
\ No newline at end of file
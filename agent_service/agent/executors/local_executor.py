@@ -3,20 +3,33 @@
 import os
 import sys
 import asyncio
-import subprocess
-import platform
+import codecs
 import logging
 from typing import Dict, Any, Optional, Callable, Awaitable
-from datetime import datetime
 
-from ..utils import UTC
 from .base_executor import CommandExecutor
+from ..utils import HOST_INFO
+from ..utils.process import spawn
 
 logger = logging.getLogger("agent.executor.local")
 
+# Output is reported at most once per interval (in seconds), or earlier when
+# this many characters are waiting to be sent
+PROGRESS_FLUSH_INTERVAL = 0.1
+PROGRESS_FLUSH_SIZE = 4096
+
+# Maximum number of bytes taken from a pipe per read
+READ_CHUNK_SIZE = 65536
+
+_utf8_decoder = codecs.getincrementaldecoder("utf-8")
+
+_HOSTNAME = HOST_INFO["hostname"]
+
 class LocalExecutor(CommandExecutor):
     """Executor for local command execution."""
     
+    __slots__ = ()
+    
     def __init__(self):
         """Initialize the local executor."""
         super().__init__()
@@ -36,12 +49,7 @@ class LocalExecutor(CommandExecutor):
         Returns:
             Dict[str, Any]: Local system information
         """
-        return {
-            "hostname": platform.node(),
-            "platform": platform.system(),
-            "version": platform.version(),
-            "python_version": platform.python_version()
-        }
+        return dict(HOST_INFO)
     
     async def execute(self, 
                      command: str, 
@@ -49,6 +57,9 @@ class LocalExecutor(CommandExecutor):
                      progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None) -> Dict[str, Any]:
         """Execute a command locally and return the result.
         
+        Commands without shell syntax are run directly from their shlex
+        tokens; everything else is run through the system shell.
+        
         Args:
             command: The command to execute
             command_id: Optional ID for the command
@@ -58,137 +69,131 @@ class LocalExecutor(CommandExecutor):
             Dict[str, Any]: Command execution result
         """
         try:
-            logger.info(f"Executing command locally: {command}")
-            
-            # Create a platform-appropriate shell command
-            if platform.system() == "Windows":
-                shell = True
-            else:
-                shell = True  # Using shell=True for Unix-like systems for simplicity
-                              # In production, you might want to use shell=False for security
+            logger.info("Executing command locally: %s", command)
             
             # Send initial progress update
-            await self._send_progress_update(command_id, progress_callback, {
-                'status': 'running',
-                'progress': 0,
-                'message': 'Command started',
-                'timestamp': datetime.now(UTC).isoformat()
-            })
+            await self._send_progress_update(command_id, progress_callback, 'running', 0, 'Command started')
             
-            # Execute the command
-            process = subprocess.Popen(
-                command,
-                shell=shell,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1  # Line buffered
-            )
+            # Execute the command with pipes the event loop reads without blocking
+            process = await spawn(command)
             
-            # Read output in real-time
-            stdout_lines = []
-            stderr_lines = []
+            # Read output in real-time into growable byte buffers
+            stdout_buffer = bytearray()
+            stderr_buffer = bytearray()
             
-            # Use asyncio to read output without blocking
-            async def read_output():
-                for i, line in enumerate(iter(process.stdout.readline, '')):
-                    if line:
-                        stdout_lines.append(line)
-                        # Send progress update every 10 lines or when buffer reaches 1KB
-                        if i % 10 == 0 or sum(len(l) for l in stdout_lines) > 1024:
-                            await self._send_progress_update(command_id, progress_callback, {
-                                'status': 'running',
-                                'progress': 50,  # Arbitrary progress value
-                                'stdout': ''.join(stdout_lines[-10:]),  # Send last 10 lines
-                                'message': 'Command running',
-                                'timestamp': datetime.now(UTC).isoformat()
-                            })
-                    await asyncio.sleep(0.01)  # Small sleep to avoid CPU hogging
-                
-                for i, line in enumerate(iter(process.stderr.readline, '')):
-                    if line:
-                        stderr_lines.append(line)
-                        # Send progress update for stderr
-                        if i % 10 == 0:
-                            await self._send_progress_update(command_id, progress_callback, {
-                                'status': 'running',
-                                'progress': 75,  # Arbitrary progress value
-                                'stderr': ''.join(stderr_lines[-10:]),  # Send last 10 lines
-                                'message': 'Command running (with stderr output)',
-                                'timestamp': datetime.now(UTC).isoformat()
-                            })
-                    await asyncio.sleep(0.01)  # Small sleep to avoid CPU hogging
+            # Output not yet reported, keyed by stream
+            pending = {'stdout': [], 'stderr': []}
+            pending_size = 0
+            flush_event = asyncio.Event()
+            report = bool(command_id and progress_callback)
             
-            # Start reading output
-            asyncio.create_task(read_output())
+            async def read_stream(stream, buffer, key):
+                """Collect output from a pipe and queue it for the next progress update."""
+                nonlocal pending_size
+                # Decode incrementally so a character split across reads stays intact
+                decoder = _utf8_decoder(errors="replace") if report else None
+                while True:
+                    chunk = await stream.read(READ_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    buffer += chunk
+                    if report:
+                        pending[key].append(decoder.decode(chunk))
+                        pending_size += len(chunk)
+                        if pending_size > PROGRESS_FLUSH_SIZE:
+                            flush_event.set()
+                if report:
+                    pending[key].append(decoder.decode(b"", final=True))
             
-            # Wait for the process to complete
-            exit_code = await asyncio.get_event_loop().run_in_executor(None, process.wait)
+            async def send_pending():
+                """Send the output collected since the last update, if any."""
+                nonlocal pending_size
+                stdout_pending = ''.join(pending['stdout']) or None
+                stderr_pending = ''.join(pending['stderr']) or None
+                if stdout_pending is None and stderr_pending is None:
+                    return
+                pending['stdout'].clear()
+                pending['stderr'].clear()
+                pending_size = 0
+                if stderr_pending is None:
+                    progress, message = 50, 'Command running'  # Arbitrary progress value
+                else:
+                    progress, message = 75, 'Command running (with stderr output)'
+                await self._send_progress_update(command_id, progress_callback, 'running', progress, message,
+                                                 stdout=stdout_pending, stderr=stderr_pending)
             
-            # Get any remaining output
-            stdout_remainder = process.stdout.read()
-            stderr_remainder = process.stderr.read()
+            async def flush_progress():
+                """Send pending output every flush interval, or sooner once enough has built up."""
+                while not finished:
+                    try:
+                        await asyncio.wait_for(flush_event.wait(), PROGRESS_FLUSH_INTERVAL)
+                    except asyncio.TimeoutError:
+                        pass
+                    flush_event.clear()
+                    await send_pending()
+                # Report output that arrived during the last send
+                await send_pending()
             
-            if stdout_remainder:
-                stdout_lines.append(stdout_remainder)
-            if stderr_remainder:
-                stderr_lines.append(stderr_remainder)
+            finished = False
+            flusher = asyncio.create_task(flush_progress()) if report else None
+            try:
+                # Drain stdout and stderr concurrently so neither pipe can fill up
+                # and block the process while the other one is being read
+                _, _, exit_code = await asyncio.gather(
+                    read_stream(process.stdout, stdout_buffer, 'stdout'),
+                    read_stream(process.stderr, stderr_buffer, 'stderr'),
+                    process.wait()
+                )
+            finally:
+                # Wake the flusher so it sends the remaining output and exits
+                finished = True
+                if flusher is not None:
+                    flush_event.set()
+                    await flusher
             
             # Combine all output
-            stdout = ''.join(stdout_lines)
-            stderr = ''.join(stderr_lines)
+            stdout = stdout_buffer.decode("utf-8", errors="replace")
+            stderr = stderr_buffer.decode("utf-8", errors="replace")
             
             # Send final progress update
-            await self._send_progress_update(command_id, progress_callback, {
-                'status': 'completed',
-                'progress': 100,
-                'message': f'Command completed with exit code {exit_code}',
-                'timestamp': datetime.now(UTC).isoformat()
-            })
+            await self._send_progress_update(command_id, progress_callback, 'completed', 100, f'Command completed with exit code {exit_code}')
             
             # Create the result
             result = self._create_base_result(
                 command=command,
+                command_id=command_id,
                 exit_code=exit_code,
                 stdout=stdout,
                 stderr=stderr,
                 execution_type="local",
-                target=platform.node()
+                target=_HOSTNAME
             )
             
-            logger.info(f"Command executed with exit code: {exit_code}")
+            logger.info("Command executed with exit code: %s", exit_code)
             return result
         
         except asyncio.TimeoutError:
-            logger.error(f"Command timed out: {command}")
-            await self._send_progress_update(command_id, progress_callback, {
-                'status': 'error',
-                'progress': 100,
-                'message': 'Command timed out',
-                'timestamp': datetime.now(UTC).isoformat()
-            })
+            logger.error("Command timed out: %s", command)
+            await self._send_progress_update(command_id, progress_callback, 'error', 100, 'Command timed out')
             return self._create_base_result(
                 command=command,
+                command_id=command_id,
                 exit_code=-1,
                 stdout="",
                 stderr="Command execution timed out",
                 execution_type="local",
-                target=platform.node()
+                target=_HOSTNAME
             )
         
         except Exception as e:
-            logger.error(f"Error executing command: {str(e)}")
-            await self._send_progress_update(command_id, progress_callback, {
-                'status': 'error',
-                'progress': 100,
-                'message': f'Error executing command: {str(e)}',
-                'timestamp': datetime.now(UTC).isoformat()
-            })
+            logger.error("Error executing command: %s", e)
+            await self._send_progress_update(command_id, progress_callback, 'error', 100, f'Error executing command: {str(e)}')
             return self._create_base_result(
                 command=command,
+                command_id=command_id,
                 exit_code=-1,
                 stdout="",
                 stderr=f"Error executing command: {str(e)}",
                 execution_type="local",
-                target=platform.node()
+                target=_HOSTNAME
             ) 
\ No newline at end of file
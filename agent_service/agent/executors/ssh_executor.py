@@ -1,19 +1,41 @@
 """SSH executor for command execution."""
 
 import os
+import asyncio
+import codecs
 import logging
-import paramiko
-from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
-from datetime import datetime
+import time
+from typing import TYPE_CHECKING, Dict, Any, Optional, Callable, Awaitable, Tuple
 
-from ..utils import UTC
 from .base_executor import CommandExecutor
 
+# paramiko (and the cryptography package behind it) is imported on first
+# use, so agents running without SSH do not pay for loading it at startup
+if TYPE_CHECKING:
+    import paramiko
+
 logger = logging.getLogger("agent.executor.ssh")
 
+# Maximum number of bytes taken from a channel per receive
+READ_CHUNK_SIZE = 65536
+
+_utf8_decoder = codecs.getincrementaldecoder("utf-8")
+
+# Appended to stdout or stderr when a command produced more than the
+# configured maximum; formatted with the limit in bytes
+OUTPUT_TRUNCATED_NOTICE = "\n[output truncated after %d bytes]\n"
+
+# Seconds to wait before reconnecting after a failed attempt; doubled after
+# each further failure, up to the configured maximum
+RECONNECT_BACKOFF_INITIAL = 1.0
+
 class SSHExecutor(CommandExecutor):
     """Executor for SSH command execution."""
     
+    __slots__ = ("host", "port", "username", "password", "key_path", "timeout", "client",
+                 "keepalive_interval", "max_output_bytes", "pool_size", "reconnect_backoff_max", "_target", "_pkey",
+                 "_reconnect_delay", "_reconnect_at", "_sessions", "_connect_lock")
+    
     def __init__(self, config: Dict[str, Any]):
         """Initialize the SSH executor.
         
@@ -28,7 +50,28 @@ class SSHExecutor(CommandExecutor):
         self.password = config.get("password", "")
         self.key_path = os.path.expanduser(config.get("key_path", "~/.ssh/id_rsa"))
         self.timeout = int(config.get("timeout", 10))
+        self.keepalive_interval = int(config.get("keepalive_interval", 30))
+        self.max_output_bytes = int(config.get("max_output_bytes", 8 * 1024 * 1024))
         self.client = None
+        # Private key, parsed on first connect and reused for reconnects
+        self._pkey: Optional["paramiko.PKey"] = None
+        
+        # Failed reconnects back off exponentially so a broken server (or one
+        # that starts dropping connections after too many attempts) is not
+        # hammered by every queued command
+        self.reconnect_backoff_max = float(config.get("reconnect_backoff_max", 60))
+        self._reconnect_delay = 0.0
+        self._reconnect_at = 0.0
+        
+        # Reported as the target of every result
+        self._target = f"{self.username}@{self.host}"
+        
+        # Commands share one authenticated connection, each on its own
+        # channel; the semaphore bounds how many channels are open at once
+        self.pool_size = max(1, int(config.get("pool_size", 4)))
+        self._sessions: Optional[asyncio.Semaphore] = None
+        # Serializes (re)connecting so concurrent commands share one handshake
+        self._connect_lock: Optional[asyncio.Lock] = None
         
         # Validate configuration
         if not self.host or not self.username:
@@ -67,25 +110,33 @@ class SSHExecutor(CommandExecutor):
             return False
         
         try:
-            logger.info(f"Connecting to SSH server {self.host}:{self.port}")
+            logger.info("Connecting to SSH server %s:%s", self.host, self.port)
+            import paramiko
             
             # Create a new SSH client
             self.client = paramiko.SSHClient()
             self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             
-            # Try to connect with key first, then password
+            # Try to connect with key first, then password. Only the given
+            # credentials are tried, skipping the agent and ~/.ssh key probes
             try:
+                pkey = self._load_key()
+                if pkey is None:
+                    raise paramiko.SSHException(f"No usable private key at {self.key_path}")
                 self.client.connect(
                     hostname=self.host,
                     port=self.port,
                     username=self.username,
-                    key_filename=self.key_path,
-                    timeout=self.timeout
+                    pkey=pkey,
+                    timeout=self.timeout,
+                    allow_agent=False,
+                    look_for_keys=False
                 )
-                logger.info(f"Connected to SSH server {self.host} using key authentication")
+                logger.info("Connected to SSH server %s using key authentication", self.host)
+                self._start_keepalive()
                 return True
             except Exception as e:
-                logger.warning(f"Failed to connect using key authentication: {str(e)}")
+                logger.warning("Failed to connect using key authentication: %s", e)
                 
                 # Try password authentication if key authentication failed
                 if self.password:
@@ -95,12 +146,15 @@ class SSHExecutor(CommandExecutor):
                             port=self.port,
                             username=self.username,
                             password=self.password,
-                            timeout=self.timeout
+                            timeout=self.timeout,
+                            allow_agent=False,
+                            look_for_keys=False
                         )
-                        logger.info(f"Connected to SSH server {self.host} using password authentication")
+                        logger.info("Connected to SSH server %s using password authentication", self.host)
+                        self._start_keepalive()
                         return True
                     except Exception as e:
-                        logger.error(f"Failed to connect using password authentication: {str(e)}")
+                        logger.error("Failed to connect using password authentication: %s", e)
                 
                 # If both authentication methods failed, close the client
                 self.client.close()
@@ -108,20 +162,103 @@ class SSHExecutor(CommandExecutor):
                 return False
         
         except Exception as e:
-            logger.error(f"Error connecting to SSH server: {str(e)}")
+            logger.error("Error connecting to SSH server: %s", e)
             if self.client:
                 self.client.close()
                 self.client = None
             return False
     
+    def _load_key(self) -> Optional["paramiko.PKey"]:
+        """Load the private key, parsing the key file only once.
+        
+        Returns:
+            Optional[paramiko.PKey]: The private key, or None if it cannot be loaded
+        """
+        if self._pkey is None:
+            import paramiko
+            try:
+                self._pkey = paramiko.PKey.from_path(self.key_path)
+            except Exception as e:
+                logger.warning("Could not load SSH key %s: %s", self.key_path, e)
+        return self._pkey
+    
+    def _start_keepalive(self) -> None:
+        """Send keepalive packets on the new connection while it is idle."""
+        if self.keepalive_interval > 0:
+            self.client.get_transport().set_keepalive(self.keepalive_interval)
+    
+    def _ensure_connected(self) -> bool:
+        """Make sure there is a live connection, replacing a stale one.
+        
+        Besides checking that the transport is still active, a cheap
+        ``SSH_MSG_IGNORE`` packet is sent so a connection whose socket has
+        already failed is noticed here rather than by the command.
+        
+        Returns:
+            bool: True if a usable connection is available, False otherwise
+        """
+        client = self.client
+        if client is not None:
+            transport = client.get_transport()
+            if transport is not None and transport.is_active():
+                try:
+                    transport.send_ignore()
+                    return True
+                except Exception as e:
+                    logger.info("SSH connection to %s failed a liveness check: %s", self.host, e)
+            logger.info("SSH connection to %s is no longer active, reconnecting", self.host)
+            self.disconnect()
+        return self._reconnect()
+    
+    def _reconnect(self) -> bool:
+        """Connect unless a recent attempt failed and its backoff has not passed.
+        
+        Returns:
+            bool: True if connected, False if the attempt failed or was skipped
+        """
+        now = time.monotonic()
+        if now < self._reconnect_at:
+            logger.debug("Skipping SSH reconnect to %s for another %.1fs", self.host, self._reconnect_at - now)
+            return False
+        if self.connect():
+            self._reconnect_delay = 0.0
+            self._reconnect_at = 0.0
+            return True
+        self._reconnect_delay = min(self._reconnect_delay * 2 or RECONNECT_BACKOFF_INITIAL,
+                                    self.reconnect_backoff_max)
+        self._reconnect_at = time.monotonic() + self._reconnect_delay
+        logger.warning("SSH reconnect to %s failed, next attempt in %.1fs", self.host, self._reconnect_delay)
+        return False
+    
+    def _open_channel(self, command: str) -> "paramiko.Channel":
+        """Start a command on a new channel of the current connection.
+        
+        Args:
+            command: The command to execute
+            
+        Returns:
+            paramiko.Channel: Channel the command is running on
+        """
+        channel = self.client.get_transport().open_session(timeout=self.timeout)
+        try:
+            channel.exec_command(command)
+        except BaseException:
+            channel.close()
+            raise
+        return channel
+    
     def disconnect(self) -> None:
         """Disconnect from the SSH server."""
         if self.client:
-            logger.info(f"Disconnecting from SSH server {self.host}")
+            logger.info("Disconnecting from SSH server %s", self.host)
             client = self.client  # Store a reference to the client
             self.client = None    # Set client to None first
             client.close()        # Then close the stored reference
     
+    def cleanup(self) -> None:
+        """Close the connection kept open between commands."""
+        self.disconnect()
+    
     def test_connection(self) -> Tuple[bool, str]:
         """Test the SSH connection.
         
@@ -131,10 +268,16 @@ class SSHExecutor(CommandExecutor):
         if not self.enabled:
             return False, "SSH execution is disabled"
         
-        # Try to connect
-        if not self.client and not self.connect():
+        # Reuse the live connection, reconnecting only if it was dropped
+        client = self.client
+        if not self._ensure_connected():
             return False, "Failed to connect to SSH server"
         
+        # Checking the existing connection already sent a packet over it,
+        # which is enough; only a new connection is tested with a command
+        if client is not None and self.client is client:
+            return True, "SSH connection test successful"
+        
         try:
             # Execute a simple command to test the connection
             stdin, stdout, stderr = self.client.exec_command("echo 'SSH connection test'")
@@ -143,11 +286,11 @@ class SSHExecutor(CommandExecutor):
             if exit_code == 0:
                 return True, "SSH connection test successful"
             else:
-                stderr_output = stderr.read().decode('utf-8').strip()
+                stderr_output = stderr.read().decode('utf-8', errors='replace').strip()
                 return False, f"SSH connection test failed with exit code {exit_code}: {stderr_output}"
         
         except Exception as e:
-            logger.error(f"Error testing SSH connection: {str(e)}")
+            logger.error("Error testing SSH connection: %s", e)
             return False, f"Error testing SSH connection: {str(e)}"
     
     async def execute(self, 
@@ -166,98 +309,233 @@ class SSHExecutor(CommandExecutor):
         """
         if not self.enabled:
             logger.warning("SSH execution is disabled")
-            await self._send_progress_update(command_id, progress_callback, {
-                'status': 'error',
-                'progress': 100,
-                'message': 'SSH execution is disabled',
-                'timestamp': datetime.now(UTC).isoformat()
-            })
+            await self._send_progress_update(command_id, progress_callback, 'error', 100, 'SSH execution is disabled')
             return self._create_base_result(
                 command=command,
+                command_id=command_id,
                 exit_code=-1,
                 stdout="",
                 stderr="SSH execution is disabled",
                 execution_type="ssh",
-                target=f"{self.username}@{self.host}"
+                target=self._target
             )
         
+        # Created on first use so they belong to the running event loop
+        if self._sessions is None:
+            self._sessions = asyncio.Semaphore(self.pool_size)
+            self._connect_lock = asyncio.Lock()
+        
+        async with self._sessions:
+            return await self._execute_on_connection(command, command_id, progress_callback)
+    
+    async def _execute_on_connection(self,
+                                     command: str,
+                                     command_id: Optional[str],
+                                     progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]]) -> Dict[str, Any]:
+        """Execute a command over the shared SSH connection.
+        
+        Args:
+            command: The command to execute
+            command_id: Optional ID for the command
+            progress_callback: Optional callback for progress updates
+            
+        Returns:
+            Dict[str, Any]: Command execution result
+        """
+        import paramiko
+        
+        # Intermediate updates are sent in the background, overlapping with
+        # connecting and starting the command
+        connecting = running = None
         try:
             # Send initial progress update
-            await self._send_progress_update(command_id, progress_callback, {
-                'status': 'connecting',
-                'progress': 10,
-                'message': f'Connecting to SSH server {self.host}',
-                'timestamp': datetime.now(UTC).isoformat()
-            })
+            connecting = self._post_progress_update(command_id, progress_callback, 'connecting', 10, f'Connecting to SSH server {self.host}')
             
-            # Connect to SSH server if not already connected
-            if not self.client and not self.connect():
-                await self._send_progress_update(command_id, progress_callback, {
-                    'status': 'error',
-                    'progress': 100,
-                    'message': 'Failed to connect to SSH server',
-                    'timestamp': datetime.now(UTC).isoformat()
-                })
+            # Reuse the live connection, reconnecting only if it was dropped.
+            # paramiko blocks on the network, so its calls run in a worker
+            # thread to keep the event loop serving other commands
+            async with self._connect_lock:
+                connected = await asyncio.to_thread(self._ensure_connected)
+            if not connected:
+                await self._flush_progress_updates(connecting)
+                await self._send_progress_update(command_id, progress_callback, 'error', 100, 'Failed to connect to SSH server')
                 return self._create_base_result(
                     command=command,
+                    command_id=command_id,
                     exit_code=-1,
                     stdout="",
                     stderr="Failed to establish SSH connection",
                     execution_type="ssh",
-                    target=f"{self.username}@{self.host}"
+                    target=self._target
                 )
             
             # Send progress update
-            await self._send_progress_update(command_id, progress_callback, {
-                'status': 'running',
-                'progress': 30,
-                'message': f'Executing command via SSH: {command}',
-                'timestamp': datetime.now(UTC).isoformat()
-            })
+            running = self._post_progress_update(command_id, progress_callback, 'running', 30, f'Executing command via SSH: {command}')
             
-            # Execute the command
-            logger.info(f"Executing command via SSH: {command}")
-            stdin, stdout, stderr = self.client.exec_command(command)
-            
-            # Read output
-            stdout_data = stdout.read().decode('utf-8')
-            stderr_data = stderr.read().decode('utf-8')
-            exit_code = stdout.channel.recv_exit_status()
+            # Execute the command on a new channel of the existing transport;
+            # only the channel is set up per command, not the connection
+            logger.info("Executing command via SSH: %s", command)
+            client = self.client
+            try:
+                channel = await asyncio.to_thread(self._open_channel, command)
+            except (EOFError, paramiko.SSHException) as e:
+                # The connection dropped after the liveness check; reconnect
+                # (unless another command already did) and try once more
+                # before reporting an error
+                logger.warning("SSH connection to %s dropped (%s), retrying on a new connection", self.host, e)
+                async with self._connect_lock:
+                    if self.client is client:
+                        self.disconnect()
+                    connected = await asyncio.to_thread(self._ensure_connected)
+                if not connected:
+                    raise
+                channel = await asyncio.to_thread(self._open_channel, command)
+            try:
+                # Output updates must follow the ones above
+                await self._flush_progress_updates(connecting, running)
+                stdout_data, stderr_data, exit_code = await self._read_channel(
+                    channel, command_id, progress_callback)
+            finally:
+                channel.close()
             
             # Send final progress update
-            await self._send_progress_update(command_id, progress_callback, {
-                'status': 'completed',
-                'progress': 100,
-                'message': f'Command completed with exit code {exit_code}',
-                'timestamp': datetime.now(UTC).isoformat()
-            })
+            await self._send_progress_update(command_id, progress_callback, 'completed', 100, f'Command completed with exit code {exit_code}')
             
             # Create the result
             result = self._create_base_result(
                 command=command,
+                command_id=command_id,
                 exit_code=exit_code,
                 stdout=stdout_data,
                 stderr=stderr_data,
                 execution_type="ssh",
-                target=f"{self.username}@{self.host}"
+                target=self._target
             )
             
-            logger.info(f"Command executed via SSH with exit code: {exit_code}")
+            logger.info("Command executed via SSH with exit code: %s", exit_code)
             return result
         
         except Exception as e:
-            logger.error(f"Error executing SSH command: {str(e)}")
-            await self._send_progress_update(command_id, progress_callback, {
-                'status': 'error',
-                'progress': 100,
-                'message': f'Error executing SSH command: {str(e)}',
-                'timestamp': datetime.now(UTC).isoformat()
-            })
+            logger.error("Error executing SSH command: %s", e)
+            await self._flush_progress_updates(connecting, running)
+            await self._send_progress_update(command_id, progress_callback, 'error', 100, f'Error executing SSH command: {str(e)}')
             return self._create_base_result(
                 command=command,
+                command_id=command_id,
                 exit_code=-1,
                 stdout="",
                 stderr=f"Error executing SSH command: {str(e)}",
                 execution_type="ssh",
-                target=f"{self.username}@{self.host}"
-            ) 
\ No newline at end of file
+                target=self._target
+            ) 
+    
+    async def _read_channel(self,
+                            channel: "paramiko.Channel",
+                            command_id: Optional[str],
+                            progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]]) -> Tuple[str, str, int]:
+        """Collect the output of a running command without blocking the event loop.
+        
+        The channel's file descriptor becomes readable whenever paramiko has
+        buffered output (or the remote side closed the stream), so the event
+        loop drains it as it arrives instead of a blocking read holding up
+        every other coroutine until the command exits. Output received
+        between wakeups is reported as one progress update.
+        
+        Each stream keeps at most ``max_output_bytes``; anything beyond that
+        is still read (so the remote command is never stalled) but dropped,
+        and a notice is appended to the decoded output.
+        
+        Args:
+            channel: Channel the command was started on
+            command_id: Optional ID for the command
+            progress_callback: Optional callback for progress updates
+            
+        Returns:
+            Tuple[str, str, int]: Stdout, stderr and exit code
+        """
+        loop = asyncio.get_running_loop()
+        limit = self.max_output_bytes
+        stdout_buffer = bytearray()
+        stderr_buffer = bytearray()
+        truncated = {'stdout': False, 'stderr': False}
+        
+        # Output not yet reported, keyed by stream
+        report = bool(command_id and progress_callback)
+        pending = {'stdout': [], 'stderr': []}
+        decoders = {'stdout': _utf8_decoder(errors="replace"), 'stderr': _utf8_decoder(errors="replace")}
+        readable = asyncio.Event()
+        finished = False
+        
+        def collect(chunk, buffer, key):
+            """Keep a received chunk, up to the output limit."""
+            room = limit - len(buffer)
+            if len(chunk) > room:
+                truncated[key] = True
+                if room <= 0:
+                    return
+                chunk = chunk[:room]
+            buffer.extend(chunk)
+            if report:
+                pending[key].append(decoders[key].decode(chunk))
+        
+        def on_readable():
+            """Move everything paramiko has buffered into the output buffers."""
+            nonlocal finished
+            # Checked first: no output can follow the end of the stream, so
+            # whatever is buffered at this point is the rest of it. A channel
+            # closed by a dropped transport never receives EOF, but its
+            # descriptor stays readable, so closing ends the stream as well
+            eof = channel.eof_received or channel.closed
+            while channel.recv_ready():
+                collect(channel.recv(READ_CHUNK_SIZE), stdout_buffer, 'stdout')
+            while channel.recv_stderr_ready():
+                collect(channel.recv_stderr(READ_CHUNK_SIZE), stderr_buffer, 'stderr')
+            # The descriptor stays readable once the stream is closed, so
+            # stop watching it as soon as all output has been taken
+            if eof:
+                finished = True
+                loop.remove_reader(fd)
+            readable.set()
+        
+        fd = channel.fileno()
+        loop.add_reader(fd, on_readable)
+        try:
+            while not finished:
+                await readable.wait()
+                readable.clear()
+                if not report:
+                    continue
+                if finished:
+                    pending['stdout'].append(decoders['stdout'].decode(b"", final=True))
+                    pending['stderr'].append(decoders['stderr'].decode(b"", final=True))
+                stdout_pending = ''.join(pending['stdout']) or None
+                stderr_pending = ''.join(pending['stderr']) or None
+                pending['stdout'].clear()
+                pending['stderr'].clear()
+                if stdout_pending is None and stderr_pending is None:
+                    continue
+                if stderr_pending is None:
+                    progress, message = 50, 'Command running'  # Arbitrary progress value
+                else:
+                    progress, message = 75, 'Command running (with stderr output)'
+                await self._send_progress_update(command_id, progress_callback, 'running', progress, message,
+                                                 stdout=stdout_pending, stderr=stderr_pending)
+        finally:
+            loop.remove_reader(fd)
+        
+        # The exit status normally arrives together with the end of the output;
+        # wait for it off the event loop in case it is still on its way
+        if channel.exit_status_ready():
+            exit_code = channel.recv_exit_status()
+        else:
+            exit_code = await loop.run_in_executor(None, channel.recv_exit_status)
+        
+        stdout = stdout_buffer.decode('utf-8', errors='replace')
+        stderr = stderr_buffer.decode('utf-8', errors='replace')
+        if truncated['stdout'] or truncated['stderr']:
+            logger.warning("SSH command output exceeded %d bytes and was truncated", limit)
+            if truncated['stdout']:
+                stdout += OUTPUT_TRUNCATED_NOTICE % limit
+            if truncated['stderr']:
+                stderr += OUTPUT_TRUNCATED_NOTICE % limit
+        return stdout, stderr, exit_code
@@ -1,7 +1,9 @@
 """Repository for command execution history."""
 
 import logging
-from typing import List, Dict, Any
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Dict, Any
 from fastapi import Depends
 
 from ..domain.models import CommandResponse
@@ -12,25 +14,16 @@ class CommandRepository:
     """Repository for command execution history.
     
     This class follows the Repository pattern to abstract the storage
-    of command execution history.
+    of command execution history. The application shares the module-level
+    ``command_repository`` instance.
     """
     
-    _instance = None
-    
-    def __new__(cls):
-        """Create a new instance if one doesn't exist."""
-        if cls._instance is None:
-            cls._instance = super(CommandRepository, cls).__new__(cls)
-            cls._instance.command_history = []
-            cls._instance.max_history_size = 100
-        return cls._instance
-    
     def __init__(self):
         """Initialize the command repository."""
-        # Initialize command_history only if it doesn't exist
-        if not hasattr(self, "command_history"):
-            self.command_history: List[CommandResponse] = []
-            self.max_history_size = 100
+        self.max_history_size = 100
+        self.command_history: Deque[CommandResponse] = deque(maxlen=self.max_history_size)
+        # Results in the history, indexed by command ID
+        self._by_id: Dict[str, CommandResponse] = {}
     
     def add(self, command_result: CommandResponse) -> None:
         """Add a command execution result to history.
@@ -38,13 +31,17 @@ class CommandRepository:
         Args:
             command_result: Command execution result
         """
-        self.command_history.append(command_result)
-        
-        # Trim history if it exceeds max size
-        if len(self.command_history) > self.max_history_size:
-            self.command_history = self.command_history[-self.max_history_size:]
+        # The deque drops the oldest entry once max_history_size is reached;
+        # unindex it unless a newer result with the same ID replaced it
+        history = self.command_history
+        if len(history) == history.maxlen:
+            evicted = history[0]
+            if self._by_id.get(evicted.command_id) is evicted:
+                del self._by_id[evicted.command_id]
+        history.append(command_result)
+        self._by_id[command_result.command_id] = command_result
         
-        logger.debug(f"Added command to history: {command_result.command_id}")
+        logger.debug("Added command to history: %s", command_result.command_id)
     
     def get_history(self, limit: int = 10) -> List[CommandResponse]:
         """Get command execution history.
@@ -55,7 +52,10 @@ class CommandRepository:
         Returns:
             List[CommandResponse]: List of command execution results
         """
-        return self.command_history[-limit:] if limit > 0 else self.command_history
+        if limit <= 0:
+            return list(self.command_history)
+        size = len(self.command_history)
+        return list(islice(self.command_history, max(0, size - limit), size))
     
     def get_by_id(self, command_id: str) -> CommandResponse:
         """Get a command execution result by ID.
@@ -69,13 +69,26 @@ class CommandRepository:
         Raises:
             KeyError: If command ID is not found
         """
-        for result in self.command_history:
-            if result.command_id == command_id:
-                return result
-        
-        raise KeyError(f"Command ID not found: {command_id}")
+        try:
+            return self._by_id[command_id]
+        except KeyError:
+            raise KeyError(f"Command ID not found: {command_id}") from None
     
     def clear(self) -> None:
         """Clear command execution history."""
-        self.command_history = []
-        logger.debug("Command history cleared") 
\ No newline at end of file
+        self.command_history.clear()
+        self._by_id.clear()
+        logger.debug("Command history cleared")
+
+
+# Create a singleton instance
+command_repository = CommandRepository()
+
+
+def get_command_repository() -> CommandRepository:
+    """Get the shared command repository.
+    
+    Returns:
+        CommandRepository: Command repository instance
+    """
+    return command_repository 
\ No newline at end of file
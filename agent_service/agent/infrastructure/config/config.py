@@ -5,6 +5,8 @@ import logging
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
+from agent.utils import HOST_INFO
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -31,19 +33,26 @@ class Config:
         self.agent_password = os.getenv("AGENT_PASSWORD", "password")
         self.reconnect_delay = int(os.getenv("RECONNECT_DELAY", "5"))
         self.max_reconnect_attempts = int(os.getenv("MAX_RECONNECT_ATTEMPTS", "10"))
+        self.reconnect_delay_max = int(os.getenv("RECONNECT_DELAY_MAX", "30"))
+        
+        # Progress batching settings
+        self.progress_flush_interval = float(os.getenv("PROGRESS_FLUSH_INTERVAL", "0.05"))
+        self.progress_max_batch = int(os.getenv("PROGRESS_MAX_BATCH", "100"))
         
         # Redis settings
         self.redis_url = os.getenv("REDIS_URL")
         self.redis_client = None
         
-        # Initialize Redis client if URL is provided
+        # Initialize Redis client if URL is provided. The asyncio client keeps
+        # a connection pool, so every publish reuses the same connections
+        # without blocking the event loop.
         if self.redis_url:
             try:
-                import redis
-                self.redis_client = redis.from_url(self.redis_url)
-                logger.info(f"Connected to Redis at {self.redis_url}")
+                from redis import asyncio as aioredis
+                self.redis_client = aioredis.from_url(self.redis_url)
+                logger.info("Connected to Redis at %s", self.redis_url)
             except Exception as e:
-                logger.error(f"Failed to connect to Redis: {str(e)}")
+                logger.error("Failed to connect to Redis: %s", e)
                 self.redis_client = None
         
         # API settings
@@ -62,13 +71,18 @@ class Config:
         self.ssh_password = os.getenv("SSH_PASSWORD", "")
         self.ssh_key_path = os.getenv("SSH_KEY_PATH", "~/.ssh/id_rsa")
         self.ssh_timeout = os.getenv("SSH_TIMEOUT", "10")
+        # Maximum number of commands sharing the SSH connection at once; keep
+        # it at or below the server's MaxSessions (10 by default)
+        self.ssh_pool_size = int(os.getenv("SSH_POOL_SIZE", "4"))
+        # Seconds between keepalive packets on an idle SSH connection, so
+        # NAT and firewall idle timeouts do not silently drop it (0 disables)
+        self.ssh_keepalive_interval = int(os.getenv("SSH_KEEPALIVE_INTERVAL", "30"))
         
         # System info
-        import platform
-        self.hostname = platform.node()
-        self.platform = platform.system()
-        self.version = platform.version()
-        self.python_version = platform.python_version()
+        self.hostname = HOST_INFO["hostname"]
+        self.platform = HOST_INFO["platform"]
+        self.version = HOST_INFO["version"]
+        self.python_version = HOST_INFO["python_version"]
     
     @property
     def ssh_config(self) -> Dict[str, Any]:
@@ -110,11 +124,11 @@ class Config:
         
         return f"Config({config_dict})"
     
-    def cleanup(self):
+    async def cleanup(self):
         """Clean up resources."""
         if self.redis_client:
             logger.info("Closing Redis connection")
-            self.redis_client.close()
+            await self.redis_client.aclose()
             self.redis_client = None
 
 
@@ -33,7 +33,7 @@ class Container:
                 self.register_executor("ssh", ssh_executor)
                 logger.info("SSH executor registered")
             except Exception as e:
-                logger.error(f"Error initializing SSH executor: {str(e)}")
+                logger.error("Error initializing SSH executor: %s", e)
                 logger.warning("SSH executor will not be available")
         
         # Register agent manager
@@ -53,7 +53,7 @@ class Container:
             self._instances["executors"] = {}
         
         self._instances["executors"][name] = executor
-        logger.info(f"Registered executor: {name}")
+        logger.info("Registered executor: %s", name)
     
     def get_executors(self) -> Dict[str, CommandExecutorInterface]:
         """Get all registered executors.
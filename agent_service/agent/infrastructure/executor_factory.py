@@ -6,9 +6,7 @@ from fastapi import Depends
 
 from ..domain.models import ExecutorInfo
 from ..executors.base_executor import CommandExecutor
-from ..executors.local_executor import LocalExecutor
-from ..executors.ssh_executor import SSHExecutor
-from ..config import config
+from ..manager import get_agent_manager
 
 logger = logging.getLogger("agent.infrastructure.executor_factory")
 
@@ -16,51 +14,23 @@ class ExecutorFactory:
     """Factory for creating command executors.
     
     This class follows the Factory pattern to create and manage command executors.
-    It also implements the Singleton pattern to ensure only one instance exists.
+    The application shares the module-level ``executor_factory`` instance.
     """
     
-    _instance = None
-    
-    def __new__(cls):
-        """Create a new instance if one doesn't exist."""
-        if cls._instance is None:
-            cls._instance = super(ExecutorFactory, cls).__new__(cls)
-            cls._instance.executors = {}
-            cls._instance._initialize_executors()
-        return cls._instance
-    
     def __init__(self):
         """Initialize the executor factory."""
-        # Initialize executors only if they don't exist
-        if not hasattr(self, "executors"):
-            self.executors: Dict[str, CommandExecutor] = {}
-            self._initialize_executors()
+        self.executors: Dict[str, CommandExecutor] = {}
+        self._initialize_executors()
     
     def _initialize_executors(self) -> None:
-        """Initialize command executors."""
-        # Initialize local executor
-        local_executor = LocalExecutor()
-        self.executors["local"] = local_executor
-        logger.info("Local executor initialized")
+        """Share the command executors registered with the agent manager.
         
-        # Initialize SSH executor if enabled
-        if config.ssh_enabled:
-            try:
-                ssh_executor = SSHExecutor(config.ssh_config)
-                if ssh_executor.enabled:
-                    self.executors["ssh"] = ssh_executor
-                    logger.info("SSH executor initialized")
-                    
-                    # Test SSH connection
-                    if ssh_executor.connect():
-                        logger.info("SSH connection successful")
-                        ssh_executor.disconnect()
-                    else:
-                        logger.warning("SSH connection failed, but executor is still available")
-                else:
-                    logger.warning("SSH executor is disabled due to invalid configuration")
-            except Exception as e:
-                logger.error(f"Failed to initialize SSH executor: {str(e)}")
+        The agent manager is the one registry of executors: the Socket.IO
+        client service runs commands through it as well, so the API uses the
+        same objects instead of constructing a second set with its own SSH
+        client and connection.
+        """
+        self.executors = get_agent_manager().executors
     
     def get_executor(self, executor_type: str = "auto") -> CommandExecutor:
         """Get a command executor by type.
@@ -109,4 +79,17 @@ class ExecutorFactory:
                     available=True,
                     target=executor.get_target_info()
                 )
-        return result 
\ No newline at end of file
+        return result
+
+
+# Create a singleton instance
+executor_factory = ExecutorFactory()
+
+
+def get_executor_factory() -> ExecutorFactory:
+    """Get the shared executor factory.
+    
+    Returns:
+        ExecutorFactory: Executor factory instance
+    """
+    return executor_factory
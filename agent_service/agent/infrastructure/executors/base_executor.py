@@ -1,17 +1,106 @@
 """Base executor for command execution."""
 
 import abc
+import asyncio
 import uuid
-from typing import Dict, Any, Optional, Callable, Awaitable
-from datetime import datetime
-import platform
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 import logging
+from types import MappingProxyType
 
 from agent.domain.interfaces.command_executor import CommandExecutorInterface
-from agent.utils import UTC
+from agent.utils import HOST_INFO, now_iso
 
 logger = logging.getLogger("agent.executor")
 
+# Default target description, shared by every executor instance
+_TARGET_INFO = MappingProxyType({
+    "hostname": HOST_INFO["hostname"],
+    "platform": HOST_INFO["platform"],
+    "version": HOST_INFO["version"]
+})
+
+# Output progress is reported at most once per interval (seconds), or sooner
+# once this many bytes of new output are waiting
+PROGRESS_FLUSH_INTERVAL = 0.1
+PROGRESS_FLUSH_BYTES = 256 * 1024
+
+
+class ProgressAggregator:
+    """Coalesce streamed output into fewer progress updates.
+    
+    Readers record new output without waiting; a background task sends
+    everything received since the last update once per interval, or sooner
+    when enough bytes are waiting. Because sending is driven by the timer,
+    output followed by a pause is still delivered within one interval.
+    """
+    
+    def __init__(self, progress_callback: Callable[[Dict[str, Any]], Awaitable[None]]):
+        """Initialize the aggregator.
+        
+        Args:
+            progress_callback: Callback receiving the coalesced progress updates
+        """
+        self.progress_callback = progress_callback
+        self.pending_payload: Dict[str, List[str]] = {"stdout": [], "stderr": []}
+        self.bytes_since_last = 0
+        self._wake = asyncio.Event()
+        self._closed = False
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start sending pending output in the background."""
+        self._task = asyncio.ensure_future(self._run())
+    
+    async def aclose(self) -> None:
+        """Send the remaining output and stop the background task."""
+        self._closed = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+        else:
+            await self.flush()
+    
+    def record(self, key: str, text: str, size: int) -> None:
+        """Record new output, waking the sender early if enough is waiting.
+        
+        Args:
+            key: Output stream name ("stdout" or "stderr")
+            text: Decoded output
+            size: Size of the raw chunk in bytes
+        """
+        self.pending_payload[key].append(text)
+        self.bytes_since_last += size
+        if self.bytes_since_last >= PROGRESS_FLUSH_BYTES:
+            self._wake.set()
+    
+    async def _run(self) -> None:
+        """Send pending output every flush interval until closed."""
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wake.wait(), PROGRESS_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+        # Report output that arrived during the last send
+        await self.flush()
+    
+    async def flush(self) -> None:
+        """Send any pending output as one progress update."""
+        if not any(self.pending_payload.values()):
+            return
+        update = {
+            "progress": 50,
+            "message": "Command in progress",
+            "timestamp": now_iso()
+        }
+        for key, parts in self.pending_payload.items():
+            if parts:
+                update[key] = "".join(parts)
+                parts.clear()
+        self.bytes_since_last = 0
+        await self.progress_callback(update)
+
 
 class BaseExecutor(CommandExecutorInterface):
     """Base class for command executors."""
@@ -20,11 +109,7 @@ class BaseExecutor(CommandExecutorInterface):
         """Initialize the command executor."""
         self.enabled = True
         self.executor_type = "base"
-        self.target_info = {
-            "hostname": platform.node(),
-            "platform": platform.system(),
-            "version": platform.version()
-        }
+        self.target_info = _TARGET_INFO
     
     async def execute(self, 
                      command: str, 
@@ -44,14 +129,15 @@ class BaseExecutor(CommandExecutorInterface):
         if command_id is None:
             command_id = str(uuid.uuid4())
         
-        # Create the result dictionary
+        # Create the result dictionary; executors stamp the precise
+        # completion time, so the cached timestamp is enough until then
         result = {
             "command": command,
             "command_id": command_id,
             "exit_code": None,
             "stdout": "",
             "stderr": "",
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": now_iso(),
             "execution_type": self.executor_type,
             "target": self.target_info.get("hostname", "unknown")
         }
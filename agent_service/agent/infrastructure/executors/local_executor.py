@@ -1,18 +1,23 @@
 """Local executor for command execution."""
 
 import asyncio
-import shlex
+import codecs
 import logging
-import platform
 import os
 from typing import Dict, Any, Optional, Callable, Awaitable, List, Tuple
 from datetime import datetime
 
-from agent.utils import UTC
-from agent.infrastructure.executors.base_executor import BaseExecutor
+from agent.utils import HOST_INFO, UTC, now_iso
+from agent.utils.process import spawn
+from agent.infrastructure.executors.base_executor import BaseExecutor, ProgressAggregator
 
 logger = logging.getLogger("agent.executor.local")
 
+# Maximum number of bytes taken from a pipe per read
+READ_CHUNK_SIZE = 65536
+
+_utf8_decoder = codecs.getincrementaldecoder("utf-8")
+
 
 class LocalExecutor(BaseExecutor):
     """Local command executor."""
@@ -21,13 +26,7 @@ class LocalExecutor(BaseExecutor):
         """Initialize the local executor."""
         super().__init__()
         self.executor_type = "local"
-        self.target_info = {
-            "hostname": platform.node(),
-            "platform": platform.system(),
-            "version": platform.version(),
-            "python_version": platform.python_version(),
-            "cwd": os.getcwd()
-        }
+        self.target_info = dict(HOST_INFO, cwd=os.getcwd())
     
     async def _execute_command(self, 
                               command: str, 
@@ -43,41 +42,26 @@ class LocalExecutor(BaseExecutor):
         Returns:
             Dict[str, Any]: Updated command execution result
         """
-        logger.info(f"Executing local command: {command}")
+        logger.info("Executing local command: %s", command)
         
         # Send initial progress update
         if progress_callback:
             await progress_callback({
                 "progress": 0,
                 "message": f"Executing command: {command}",
-                "timestamp": datetime.now(UTC).isoformat()
+                "timestamp": now_iso()
             })
         
         try:
-            # Parse the command
-            if platform.system() == "Windows":
-                # On Windows, we need to use shell=True
-                cmd = command
-                shell = True
-            else:
-                # On Unix-like systems, we can use shlex to parse the command
-                cmd = shlex.split(command)
-                shell = False
-            
             # Create subprocess
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                shell=shell
-            )
+            process = await spawn(command)
             
             # Send progress update
             if progress_callback:
                 await progress_callback({
                     "progress": 10,
                     "message": "Process started",
-                    "timestamp": datetime.now(UTC).isoformat()
+                    "timestamp": now_iso()
                 })
             
             # Read output with progress updates
@@ -97,14 +81,14 @@ class LocalExecutor(BaseExecutor):
                 await progress_callback({
                     "progress": 100,
                     "message": f"Command completed with exit code {exit_code}",
-                    "timestamp": datetime.now(UTC).isoformat(),
+                    "timestamp": result["timestamp"],
                     "result": result
                 })
             
-            logger.info(f"Command completed with exit code {exit_code}")
+            logger.info("Command completed with exit code %s", exit_code)
             
         except Exception as e:
-            logger.error(f"Error executing command: {str(e)}")
+            logger.error("Error executing command: %s", e)
             result["exit_code"] = 1
             result["stderr"] = f"Error executing command: {str(e)}"
             result["timestamp"] = datetime.now(UTC).isoformat()
@@ -114,7 +98,7 @@ class LocalExecutor(BaseExecutor):
                 await progress_callback({
                     "progress": 100,
                     "message": f"Error executing command: {str(e)}",
-                    "timestamp": datetime.now(UTC).isoformat(),
+                    "timestamp": result["timestamp"],
                     "result": result
                 })
         
@@ -132,56 +116,45 @@ class LocalExecutor(BaseExecutor):
         Returns:
             Tuple[str, str]: Stdout and stderr data
         """
-        stdout_chunks: List[str] = []
-        stderr_chunks: List[str] = []
+        stdout_buffer = bytearray()
+        stderr_buffer = bytearray()
+        aggregator = ProgressAggregator(progress_callback) if progress_callback else None
         
-        # Read stdout and stderr concurrently
-        while process.returncode is None:
-            # Check if there's data available on stdout
-            if process.stdout.at_eof():
-                stdout_chunk = b""
-            else:
-                try:
-                    stdout_chunk = await asyncio.wait_for(process.stdout.read(1024), 0.1)
-                except asyncio.TimeoutError:
-                    stdout_chunk = b""
-            
-            # Check if there's data available on stderr
-            if process.stderr.at_eof():
-                stderr_chunk = b""
-            else:
-                try:
-                    stderr_chunk = await asyncio.wait_for(process.stderr.read(1024), 0.1)
-                except asyncio.TimeoutError:
-                    stderr_chunk = b""
-            
-            # Append chunks to the output
-            if stdout_chunk:
-                stdout_chunks.append(stdout_chunk.decode("utf-8", errors="replace"))
-            if stderr_chunk:
-                stderr_chunks.append(stderr_chunk.decode("utf-8", errors="replace"))
-            
-            # Send progress update if there's new output
-            if progress_callback and (stdout_chunk or stderr_chunk):
-                await progress_callback({
-                    "progress": 50,
-                    "message": "Command in progress",
-                    "timestamp": datetime.now(UTC).isoformat(),
-                    "stdout": "".join(stdout_chunks),
-                    "stderr": "".join(stderr_chunks)
-                })
-            
-            # Check if the process has completed
-            if not stdout_chunk and not stderr_chunk:
-                await asyncio.sleep(0.1)
-                if process.returncode is not None:
+        async def drain(stream: asyncio.StreamReader, buffer: bytearray, key: str) -> None:
+            """Read a pipe until EOF, waking only when output arrives."""
+            # Decode incrementally so a character split across reads stays
+            # intact; without a callback the raw bytes are only decoded once
+            # at the end
+            decoder = _utf8_decoder(errors="replace") if aggregator else None
+            while True:
+                chunk = await stream.read(READ_CHUNK_SIZE)
+                if not chunk:
                     break
+                buffer.extend(chunk)
+                # Report only the new output, coalesced into periodic updates;
+                # the full text is decoded once at the end
+                if aggregator:
+                    aggregator.record(key, decoder.decode(chunk), len(chunk))
+            # Deliver a character left incomplete at EOF so the reported
+            # deltas always add up to the final output
+            if aggregator:
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    aggregator.record(key, tail, 0)
         
-        # Read any remaining output
-        stdout_chunk, stderr_chunk = await process.communicate()
-        if stdout_chunk:
-            stdout_chunks.append(stdout_chunk.decode("utf-8", errors="replace"))
-        if stderr_chunk:
-            stderr_chunks.append(stderr_chunk.decode("utf-8", errors="replace"))
+        if aggregator:
+            aggregator.start()
+        
+        # Drain both pipes concurrently so neither can fill up and block the
+        # process while the other one is being read
+        try:
+            await asyncio.gather(
+                drain(process.stdout, stdout_buffer, "stdout"),
+                drain(process.stderr, stderr_buffer, "stderr")
+            )
+        finally:
+            # Send the remaining output and stop the background sender
+            if aggregator:
+                await aggregator.aclose()
         
-        return "".join(stdout_chunks), "".join(stderr_chunks) 
\ No newline at end of file
+        return stdout_buffer.decode("utf-8", errors="replace"), stderr_buffer.decode("utf-8", errors="replace") 
\ No newline at end of file
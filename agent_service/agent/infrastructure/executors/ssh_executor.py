@@ -6,12 +6,18 @@ import os
 from typing import Dict, Any, Optional, Callable, Awaitable, List, Tuple
 from datetime import datetime
 
-from agent.utils import UTC
-from agent.infrastructure.executors.base_executor import BaseExecutor
+from agent.utils import UTC, now_iso
+from agent.infrastructure.executors.base_executor import BaseExecutor, ProgressAggregator
 from agent.infrastructure.config.config import config
 
 logger = logging.getLogger("agent.executor.ssh")
 
+# Maximum number of characters taken from a stream per read
+READ_CHUNK_SIZE = 65536
+
+# Unanswered keepalives after which a connection is considered dead
+KEEPALIVE_COUNT_MAX = 3
+
 try:
     import asyncssh
     SSH_AVAILABLE = True
@@ -55,9 +61,14 @@ class SSHExecutor(BaseExecutor):
         if self.key_path:
             self.key_path = os.path.expanduser(self.key_path)
         
-        # SSH connection
+        # SSH connection, opened on first use; the lock is created lazily so
+        # the executor can be built outside a running event loop
         self.connection = None
         self.connected = False
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self.pool_size = config.ssh_pool_size
+        self.keepalive_interval = config.ssh_keepalive_interval
+        self._sessions: Optional[asyncio.Semaphore] = None
         
         # Target info
         self.target_info = {
@@ -67,10 +78,6 @@ class SSHExecutor(BaseExecutor):
             "key_path": self.key_path,
             "connected": self.connected
         }
-        
-        # Connect to SSH server if enabled
-        if config.ssh_enabled and SSH_AVAILABLE:
-            asyncio.create_task(self.connect())
     
     async def connect(self) -> bool:
         """Connect to the SSH server.
@@ -91,14 +98,16 @@ class SSHExecutor(BaseExecutor):
             return False
         
         try:
-            logger.info(f"Connecting to SSH server {self.host}:{self.port}")
+            logger.info("Connecting to SSH server %s:%s", self.host, self.port)
             
             # Connection options
             options = {
                 "host": self.host,
                 "port": self.port,
                 "username": self.username,
-                "connect_timeout": self.timeout
+                "connect_timeout": self.timeout,
+                "keepalive_interval": self.keepalive_interval,
+                "keepalive_count_max": KEEPALIVE_COUNT_MAX
             }
             
             # Add password or key file
@@ -129,13 +138,13 @@ class SSHExecutor(BaseExecutor):
                 if result.exit_status == 0:
                     self.target_info["cwd"] = result.stdout.strip()
             except Exception as e:
-                logger.warning(f"Error getting target info: {str(e)}")
+                logger.warning("Error getting target info: %s", e)
             
-            logger.info(f"Connected to SSH server {self.host}:{self.port}")
+            logger.info("Connected to SSH server %s:%s", self.host, self.port)
             return True
             
         except Exception as e:
-            logger.error(f"Error connecting to SSH server: {str(e)}")
+            logger.error("Error connecting to SSH server: %s", e)
             self.connected = False
             self.target_info["connected"] = False
             self.target_info["error"] = str(e)
@@ -155,21 +164,26 @@ class SSHExecutor(BaseExecutor):
         Returns:
             Dict[str, Any]: Updated command execution result
         """
-        logger.info(f"Executing SSH command: {command}")
+        logger.info("Executing SSH command: %s", command)
         
         # Send initial progress update
         if progress_callback:
             await progress_callback({
                 "progress": 0,
                 "message": f"Executing command: {command}",
-                "timestamp": datetime.now(UTC).isoformat()
+                "timestamp": now_iso()
             })
         
-        # Check if connected
+        # Connect on first use; concurrent commands wait for the same
+        # connection attempt instead of each opening their own
         if not self.connected:
-            logger.warning("Not connected to SSH server, attempting to connect")
-            connected = await self.connect()
-            if not connected:
+            if self._connect_lock is None:
+                self._connect_lock = asyncio.Lock()
+            async with self._connect_lock:
+                if not self.connected:
+                    logger.info("Not connected to SSH server, connecting")
+                    await self.connect()
+            if not self.connected:
                 logger.error("Failed to connect to SSH server")
                 result["exit_code"] = 1
                 result["stderr"] = "Failed to connect to SSH server"
@@ -180,7 +194,7 @@ class SSHExecutor(BaseExecutor):
                     await progress_callback({
                         "progress": 100,
                         "message": "Failed to connect to SSH server",
-                        "timestamp": datetime.now(UTC).isoformat(),
+                        "timestamp": result["timestamp"],
                         "result": result
                     })
                 
@@ -192,25 +206,29 @@ class SSHExecutor(BaseExecutor):
                 await progress_callback({
                     "progress": 10,
                     "message": "Connected to SSH server",
-                    "timestamp": datetime.now(UTC).isoformat()
+                    "timestamp": now_iso()
                 })
             
-            # Execute the command
-            process = await self.connection.create_process(command)
-            
-            # Send progress update
-            if progress_callback:
-                await progress_callback({
-                    "progress": 20,
-                    "message": "Process started",
-                    "timestamp": datetime.now(UTC).isoformat()
-                })
-            
-            # Read output with progress updates
-            stdout_data, stderr_data = await self._read_output_with_progress(process, progress_callback)
-            
-            # Wait for the process to complete
-            exit_code = await process.wait()
+            # Commands share the one connection as separate channels; bound
+            # how many are open at once so the server's session limit holds
+            if self._sessions is None:
+                self._sessions = asyncio.Semaphore(self.pool_size)
+            async with self._sessions:
+                process = await self.connection.create_process(command)
+                
+                # Send progress update
+                if progress_callback:
+                    await progress_callback({
+                        "progress": 20,
+                        "message": "Process started",
+                        "timestamp": now_iso()
+                    })
+                
+                # Read output with progress updates
+                stdout_data, stderr_data = await self._read_output_with_progress(process, progress_callback)
+                
+                # Wait for the process to complete
+                exit_code = await process.wait()
             
             # Update the result
             result["exit_code"] = exit_code
@@ -223,14 +241,14 @@ class SSHExecutor(BaseExecutor):
                 await progress_callback({
                     "progress": 100,
                     "message": f"Command completed with exit code {exit_code}",
-                    "timestamp": datetime.now(UTC).isoformat(),
+                    "timestamp": result["timestamp"],
                     "result": result
                 })
             
-            logger.info(f"Command completed with exit code {exit_code}")
+            logger.info("Command completed with exit code %s", exit_code)
             
         except Exception as e:
-            logger.error(f"Error executing command: {str(e)}")
+            logger.error("Error executing command: %s", e)
             result["exit_code"] = 1
             result["stderr"] = f"Error executing command: {str(e)}"
             result["timestamp"] = datetime.now(UTC).isoformat()
@@ -240,7 +258,7 @@ class SSHExecutor(BaseExecutor):
                 await progress_callback({
                     "progress": 100,
                     "message": f"Error executing command: {str(e)}",
-                    "timestamp": datetime.now(UTC).isoformat(),
+                    "timestamp": result["timestamp"],
                     "result": result
                 })
         
@@ -260,53 +278,48 @@ class SSHExecutor(BaseExecutor):
         """
         stdout_chunks: List[str] = []
         stderr_chunks: List[str] = []
+        aggregator = ProgressAggregator(progress_callback) if progress_callback else None
         
-        # Read stdout and stderr
-        while not process.stdout.at_eof() or not process.stderr.at_eof():
-            # Read from stdout
-            if not process.stdout.at_eof():
-                try:
-                    stdout_chunk = await asyncio.wait_for(process.stdout.read(1024), 0.1)
-                    if stdout_chunk:
-                        stdout_chunks.append(stdout_chunk)
-                except asyncio.TimeoutError:
-                    pass
-            
-            # Read from stderr
-            if not process.stderr.at_eof():
-                try:
-                    stderr_chunk = await asyncio.wait_for(process.stderr.read(1024), 0.1)
-                    if stderr_chunk:
-                        stderr_chunks.append(stderr_chunk)
-                except asyncio.TimeoutError:
-                    pass
-            
-            # Send progress update if there's new output
-            if progress_callback and (stdout_chunks or stderr_chunks):
-                await progress_callback({
-                    "progress": 50,
-                    "message": "Command in progress",
-                    "timestamp": datetime.now(UTC).isoformat(),
-                    "stdout": "".join(stdout_chunks),
-                    "stderr": "".join(stderr_chunks)
-                })
-            
-            # Check if the process has completed
-            if process.exit_status is not None and process.stdout.at_eof() and process.stderr.at_eof():
-                break
-            
-            # Sleep to avoid busy waiting
-            await asyncio.sleep(0.1)
+        async def drain(stream: 'asyncssh.SSHReader', chunks: List[str], key: str) -> None:
+            """Read a stream until EOF, waking only when output arrives."""
+            while True:
+                chunk = await stream.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                # Report only the new output, coalesced into periodic updates;
+                # the full text is joined once at the end
+                if aggregator:
+                    aggregator.record(key, chunk, len(chunk))
+        
+        if aggregator:
+            aggregator.start()
+        
+        # Drain both streams concurrently so neither can fill its window and
+        # stall the remote process while the other one is being read
+        try:
+            await asyncio.gather(
+                drain(process.stdout, stdout_chunks, "stdout"),
+                drain(process.stderr, stderr_chunks, "stderr")
+            )
+        finally:
+            # Send the remaining output and stop the background sender
+            if aggregator:
+                await aggregator.aclose()
         
         return "".join(stdout_chunks), "".join(stderr_chunks)
     
     def is_available(self) -> bool:
         """Check if the SSH executor is available.
         
+        The connection is opened by the first command, so a configured
+        executor counts as available before it has connected; otherwise
+        "auto" resolution would never pick it.
+        
         Returns:
             bool: True if the executor is available, False otherwise
         """
-        return self.enabled and SSH_AVAILABLE and self.connected
+        return self.enabled and SSH_AVAILABLE and bool(self.host)
     
     def cleanup(self) -> None:
         """Clean up resources used by the executor."""
@@ -3,28 +3,46 @@
 import logging
 import uuid
 import asyncio
-from typing import Dict, Any, Optional, Callable, Awaitable, List
+from collections import deque
+from itertools import islice
+from typing import Dict, Any, Optional, Callable, Awaitable, List, Deque
 from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
 
 from .executors import CommandExecutor, LocalExecutor, SSHExecutor
 from .config import config
+from .utils import HOST_INFO
 
 logger = logging.getLogger("agent.manager")
 
 # Use timezone.utc instead of UTC for Python 3.9 compatibility
 UTC = timezone.utc
 
+# Fields shared by every error result
+_ERROR_RESULT_TEMPLATE = MappingProxyType({
+    "exit_code": -1,
+    "stdout": "",
+    "target": "unknown",
+    "status": "error"
+})
+
 class AgentManager:
     """Manager for handling command execution and managing executors."""
     
+    __slots__ = ("executors", "command_history", "agent_info_payload")
+    
     def __init__(self):
         """Initialize the agent manager."""
         self.executors: Dict[str, CommandExecutor] = {}
         self._initialize_executors()
         
         # Command history
-        self.command_history: List[Dict[str, Any]] = []
-        self.max_history_size = 100
+        self.command_history: Deque[Dict[str, Any]] = deque(maxlen=100)
+        
+        # Agent information sent to the Controller Service; it does not change
+        # for the lifetime of the process, so it is built once
+        self.agent_info_payload: Dict[str, Any] = self._build_agent_info()
     
     def _initialize_executors(self) -> None:
         """Initialize command executors."""
@@ -39,18 +57,47 @@ class AgentManager:
                 ssh_executor = SSHExecutor(config.ssh_config)
                 if ssh_executor.enabled:
                     self.executors["ssh"] = ssh_executor
+                    # The connection is opened by the client's startup
+                    # connection test, not on import, and then kept open
+                    # until cleanup()
                     logger.info("SSH executor initialized")
-                    
-                    # Test SSH connection
-                    if ssh_executor.connect():
-                        logger.info("SSH connection successful")
-                        ssh_executor.disconnect()
-                    else:
-                        logger.warning("SSH connection failed, but executor is still available")
                 else:
                     logger.warning("SSH executor is disabled due to invalid configuration")
             except Exception as e:
-                logger.error(f"Failed to initialize SSH executor: {str(e)}")
+                logger.error("Failed to initialize SSH executor: %s", e)
+    
+    def _build_agent_info(self) -> Dict[str, Any]:
+        """Build the agent information from the registered executors.
+        
+        Returns:
+            Dict[str, Any]: Agent information
+        """
+        local_executor = self.executors.get("local")
+        local_info = local_executor.get_target_info() if local_executor else {}
+        ssh_executor = self.executors.get("ssh")
+        ssh_info = ssh_executor.get_target_info() if ssh_executor else {}
+        return {
+            "hostname": local_info.get("hostname", HOST_INFO["hostname"]),
+            "platform": local_info.get("platform", HOST_INFO["platform"]),
+            "version": local_info.get("version", HOST_INFO["version"]),
+            "python_version": local_info.get("python_version", HOST_INFO["python_version"]),
+            "ssh_enabled": ssh_executor is not None and ssh_executor.enabled,
+            "ssh_target": f"{ssh_info.get('username', '')}@{ssh_info.get('hostname', '')}" if ssh_executor else None
+        }
+    
+    @property
+    def max_history_size(self) -> int:
+        """Maximum number of results kept in the command history."""
+        return self.command_history.maxlen
+    
+    @max_history_size.setter
+    def max_history_size(self, size: int) -> None:
+        """Resize the command history, keeping the most recent results.
+        
+        Args:
+            size: New maximum number of history items
+        """
+        self.command_history = deque(self.command_history, maxlen=size)
     
     def get_available_executors(self) -> Dict[str, Dict[str, Any]]:
         """Get information about available executors.
@@ -77,7 +124,10 @@ class AgentManager:
         Returns:
             List[Dict[str, Any]]: List of command execution results
         """
-        return self.command_history[-limit:] if limit > 0 else self.command_history
+        if limit <= 0:
+            return list(self.command_history)
+        size = len(self.command_history)
+        return list(islice(self.command_history, max(0, size - limit), size))
     
     def _add_to_history(self, result: Dict[str, Any]) -> None:
         """Add a command execution result to history.
@@ -85,11 +135,8 @@ class AgentManager:
         Args:
             result: Command execution result
         """
+        # The deque drops the oldest entry once max_history_size is reached
         self.command_history.append(result)
-        
-        # Trim history if it exceeds max size
-        if len(self.command_history) > self.max_history_size:
-            self.command_history = self.command_history[-self.max_history_size:]
     
     async def execute_command(self, 
                              command: str, 
@@ -109,7 +156,7 @@ class AgentManager:
         """
         # Generate a command ID
         if not command_id:
-            command_id = str(uuid.uuid4())
+            command_id = uuid.uuid4().hex
         
         # Determine executor type if auto
         if executor_type == "auto":
@@ -123,40 +170,24 @@ class AgentManager:
         executor = self.executors.get(executor_type)
         
         if not executor:
-            logger.error(f"Executor type '{executor_type}' not found")
-            result = {
-                "command": command,
-                "command_id": command_id,
-                "exit_code": -1,
-                "stdout": "",
-                "stderr": f"Executor type '{executor_type}' not found",
-                "timestamp": datetime.now(UTC).isoformat(),
-                "execution_type": executor_type,
-                "target": "unknown",
-                "status": "error"
-            }
+            logger.error("Executor type '%s' not found", executor_type)
+            result = self._make_error_result(
+                command, command_id, executor_type, f"Executor type '{executor_type}' not found"
+            )
             self._add_to_history(result)
             return result
         
         if not executor.is_available():
-            logger.error(f"Executor '{executor_type}' is not available")
-            result = {
-                "command": command,
-                "command_id": command_id,
-                "exit_code": -1,
-                "stdout": "",
-                "stderr": f"Executor '{executor_type}' is not available",
-                "timestamp": datetime.now(UTC).isoformat(),
-                "execution_type": executor_type,
-                "target": "unknown",
-                "status": "error"
-            }
+            logger.error("Executor '%s' is not available", executor_type)
+            result = self._make_error_result(
+                command, command_id, executor_type, f"Executor '{executor_type}' is not available"
+            )
             self._add_to_history(result)
             return result
         
         try:
             # Execute the command
-            logger.info(f"Executing command with {executor_type} executor: {command}")
+            logger.info("Executing command with %s executor: %s", executor_type, command)
             result = await executor.execute(command, command_id, progress_callback)
             
             # Add status based on exit code
@@ -168,21 +199,34 @@ class AgentManager:
             return result
         
         except Exception as e:
-            logger.error(f"Error executing command: {str(e)}")
-            result = {
-                "command": command,
-                "command_id": command_id,
-                "exit_code": -1,
-                "stdout": "",
-                "stderr": f"Error executing command: {str(e)}",
-                "timestamp": datetime.now(UTC).isoformat(),
-                "execution_type": executor_type,
-                "target": "unknown",
-                "status": "error"
-            }
+            logger.error("Error executing command: %s", e)
+            result = self._make_error_result(
+                command, command_id, executor_type, f"Error executing command: {str(e)}"
+            )
             self._add_to_history(result)
             return result
     
+    def _make_error_result(self, command: str, command_id: str, executor_type: str, stderr: str) -> Dict[str, Any]:
+        """Create the result for a command that could not be executed.
+        
+        Args:
+            command: The command that was requested
+            command_id: ID of the command
+            executor_type: Type of executor that was requested
+            stderr: Error message
+            
+        Returns:
+            Dict[str, Any]: Command execution result
+        """
+        return {
+            **_ERROR_RESULT_TEMPLATE,
+            "command": command,
+            "command_id": command_id,
+            "stderr": stderr,
+            "timestamp": datetime.now(UTC).isoformat(),
+            "execution_type": executor_type
+        }
+    
     def cleanup(self) -> None:
         """Clean up resources used by executors."""
         for name, executor in self.executors.items():
@@ -192,5 +236,15 @@ class AgentManager:
                 ssh_executor.disconnect()
                 logger.info("SSH executor disconnected")
 
-# Create a singleton instance
-agent_manager = AgentManager() 
\ No newline at end of file
+
+@lru_cache(maxsize=1)
+def get_agent_manager() -> AgentManager:
+    """Get the shared agent manager, created on first use.
+    
+    Creating the manager builds the executors, so it is deferred until
+    something actually runs commands rather than happening on import.
+    
+    Returns:
+        AgentManager: Agent manager instance
+    """
+    return AgentManager() 
\ No newline at end of file
@@ -1,8 +1,9 @@
-"""API module for the agent service."""
+"""API module for the agent service.
+
+The HTTP routes live in :mod:`agent.api`; this package only provides the
+API authentication helper and request/response models.
+"""
 
-from agent.presentation.api.routes import router
-from agent.presentation.api.info_routes import router as info_router
-from agent.presentation.api.command_routes import router as command_router
 from agent.presentation.api.auth import authenticate
 from agent.presentation.api.model import (
     CommandRequest,
@@ -15,9 +16,6 @@ from agent.presentation.api.model import (
 )
 
 __all__ = [
-    "router", 
-    "info_router", 
-    "command_router", 
     "authenticate",
     "CommandRequest",
     "CommandResponse",
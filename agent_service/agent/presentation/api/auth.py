@@ -1,5 +1,6 @@
 """Authentication utilities for the API."""
 
+import hmac
 import logging
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
@@ -24,7 +25,7 @@ async def authenticate(token: str = Depends(oauth2_scheme)) -> bool:
     Raises:
         HTTPException: If authentication fails
     """
-    if token != config.api_token:
+    if not hmac.compare_digest(token.encode("utf-8"), config.api_token.encode("utf-8")):
         logger.warning("Authentication failed with invalid token")
         raise HTTPException(
             status_code=401,
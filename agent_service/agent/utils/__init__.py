@@ -1,6 +1,87 @@
 """Utility functions for the agent service."""
 
-from datetime import timezone
+import platform
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Tuple
 
 # Use timezone.utc instead of UTC for Python 3.9 compatibility
-UTC = timezone.utc 
\ No newline at end of file
+UTC = timezone.utc
+
+# dataclass(slots=True) needs Python 3.10+; fall back to regular dataclasses on 3.9
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Host details do not change while the agent runs, so look them up once and
+# share them; platform.version() in particular may spawn a subprocess
+HOST_INFO = MappingProxyType({
+    "hostname": platform.node(),
+    "platform": platform.system(),
+    "version": platform.version(),
+    "python_version": platform.python_version()
+})
+
+# Last formatted timestamp and the second it was formatted for
+_timestamp_cache = (-1, "")
+
+
+def now_iso() -> str:
+    """Get the current UTC time as an ISO 8601 string with one-second resolution.
+    
+    The formatted string is cached and only rebuilt when the second changes,
+    so frequent callers such as progress events share one string.
+    
+    Returns:
+        str: Current UTC time in ISO 8601 format
+    """
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, formatted = _timestamp_cache
+    if cached_second != second:
+        formatted = datetime.fromtimestamp(second, UTC).isoformat()
+        _timestamp_cache = (second, formatted)
+    return formatted
+
+
+@lru_cache(maxsize=4096)
+def parse_iso(timestamp: str) -> datetime:
+    """Parse an ISO 8601 timestamp, reusing results for repeated strings.
+    
+    The same command timestamp is parsed again for every progress event,
+    result and history entry that carries it. datetime objects are
+    immutable, so cached instances are safe to share.
+    
+    Args:
+        timestamp: ISO 8601 formatted timestamp
+        
+    Returns:
+        datetime: Parsed timestamp
+    """
+    return datetime.fromisoformat(timestamp)
+
+
+@dataclass(**DATACLASS_SLOTS)
+class IsoTimestampMixin:
+    """Cache the ISO 8601 form of a model's ``timestamp`` between serializations.
+    
+    Models carrying a ``timestamp`` datetime inherit this so repeated
+    ``to_dict`` calls skip ``isoformat()`` until the timestamp changes.
+    """
+    
+    # Cached (timestamp, ISO string) pair; not part of __init__, repr or equality
+    _iso_ts: Optional[Tuple[datetime, str]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def _timestamp_iso(self) -> str:
+        """Get the timestamp as an ISO 8601 string, reusing the cached value.
+        
+        Returns:
+            str: ISO formatted timestamp
+        """
+        timestamp = self.timestamp
+        cached = self._iso_ts
+        if cached is None or cached[0] is not timestamp:
+            cached = self._iso_ts = (timestamp, timestamp.isoformat())
+        return cached[1]
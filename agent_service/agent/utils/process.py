@@ -0,0 +1,61 @@
+"""Helpers for starting local commands."""
+
+import asyncio
+import re
+import shlex
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from . import HOST_INFO
+
+# Commands on Windows always go through cmd.exe, which parses differently
+IS_WINDOWS = HOST_INFO["platform"] == "Windows"
+
+# Characters that need a shell to interpret (pipes, redirection, expansion,
+# command lists); commands without them are run without starting a shell
+SHELL_SYNTAX = re.compile(r"[|&;<>()$`\\*?\[\]#~\n]")
+
+
+@lru_cache(maxsize=256)
+def split_command(command: str) -> Optional[Tuple[str, ...]]:
+    """Tokenize a command with shlex, reusing results for repeated commands.
+    
+    Agents often run the same commands again (health checks, status
+    probes), so the pure-Python tokenizer only runs once per distinct
+    command string.
+    
+    Args:
+        command: The command to tokenize
+        
+    Returns:
+        Optional[Tuple[str, ...]]: The tokens, or None if the command cannot be tokenized
+    """
+    try:
+        return tuple(shlex.split(command))
+    except ValueError:
+        return None
+
+
+async def spawn(command: str) -> asyncio.subprocess.Process:
+    """Start a command with its output piped back to the event loop.
+    
+    Plain commands on POSIX systems are tokenized with shlex and executed
+    directly, which saves starting /bin/sh. Anything using shell syntax, a
+    program that cannot be found (so the shell reports it as usual) and
+    every command on Windows still go through the shell.
+    
+    Args:
+        command: The command to execute
+        
+    Returns:
+        asyncio.subprocess.Process: The started process
+    """
+    pipe = asyncio.subprocess.PIPE
+    if not IS_WINDOWS and not SHELL_SYNTAX.search(command):
+        argv = split_command(command)
+        if argv:
+            try:
+                return await asyncio.create_subprocess_exec(*argv, stdout=pipe, stderr=pipe)
+            except OSError:
+                pass
+    return await asyncio.create_subprocess_shell(command, stdout=pipe, stderr=pipe)
@@ -5,9 +5,14 @@ import asyncio
 import logging
 import requests
 import time
-from agent import agent_manager
+from agent.manager import get_agent_manager
 from agent.client import start_agent_client
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,7 +38,7 @@ async def wait_for_controller():
             pass
         
         retries += 1
-        logger.info(f"Waiting for controller service (attempt {retries}/{max_retries})")
+        logger.info("Waiting for controller service (attempt %s/%s)", retries, max_retries)
         await asyncio.sleep(retry_delay)
     
     logger.error("Controller service not available after maximum retries")
@@ -51,16 +56,23 @@ async def main():
         
         # Start agent client
         logger.info("Starting agent client")
-        await start_agent_client()
-        
-        return 0
+        return await start_agent_client()
     except KeyboardInterrupt:
         logger.info("Agent service stopped by user")
         return 0
     except Exception as e:
-        logger.error(f"Unhandled exception: {str(e)}")
+        logger.error("Unhandled exception: %s", e)
         return 1
+    finally:
+        # Close connections the executors kept open while the agent ran;
+        # this is the manager the client service runs commands through, and
+        # there is nothing to close if it was never created
+        if get_agent_manager.cache_info().currsize:
+            get_agent_manager().cleanup()
 
 if __name__ == "__main__":
+    # Prefer uvloop's faster event loop when it is installed (not available on Windows)
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     exit_code = asyncio.run(main())
     exit(exit_code) 
\ No newline at end of file
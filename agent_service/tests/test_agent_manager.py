@@ -64,7 +64,7 @@ class TestAgentManager:
         
         assert "local" in manager.executors
         assert len(manager.executors) == 1
-        assert manager.command_history == []
+        assert list(manager.command_history) == []
         assert manager.max_history_size == 100
     
     @patch('agent.manager.LocalExecutor')
@@ -87,28 +87,8 @@ class TestAgentManager:
         assert "local" in manager.executors
         assert "ssh" in manager.executors
         assert len(manager.executors) == 2
-    
-    @patch('agent.manager.LocalExecutor')
-    @patch('agent.manager.SSHExecutor')
-    @patch('agent.manager.config')
-    def test_init_with_ssh_connection_failure(self, mock_config, mock_ssh_executor, mock_local_executor):
-        """Test initialization with SSH connection failure."""
-        # Setup mocks
-        mock_config.ssh_enabled = True
-        mock_config.ssh_config = {"enabled": True}
-        
-        mock_local_executor.return_value = MockExecutor()
-        
-        ssh_executor = MockExecutor()
-        ssh_executor.connect = MagicMock(return_value=False)
-        mock_ssh_executor.return_value = ssh_executor
-        
-        manager = AgentManager()
-        
-        assert "local" in manager.executors
-        assert "ssh" in manager.executors  # SSH executor is still added even if connection fails
-        assert len(manager.executors) == 2
-        assert ssh_executor.connect.called  # Verify that connect was called
+        # Creating the manager (on import) must not open an SSH connection
+        ssh_executor.connect.assert_not_called()
     
     def test_get_available_executors(self):
         """Test getting available executors."""
@@ -250,4 +230,21 @@ class TestAgentManager:
         manager.cleanup()
         
         # Verify SSH executor was disconnected
-        ssh_executor.disconnect.assert_called_once() 
\ No newline at end of file
+        ssh_executor.disconnect.assert_called_once() 
+    
+    def test_import_does_not_create_agent_manager(self):
+        """Test that importing the domain models builds no manager or client."""
+        import subprocess
+        import sys
+        
+        code = ("import sys, agent.domain.models; "
+                "print(any(m in sys.modules for m in ('agent.manager', 'socketio')))")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == "False"
+    
+    def test_get_agent_manager_is_shared(self):
+        """Test that the agent manager is created once and then reused."""
+        from agent.manager import get_agent_manager
+        
+        assert get_agent_manager() is get_agent_manager()
+
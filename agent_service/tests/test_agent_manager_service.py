@@ -0,0 +1,72 @@
+"""Unit tests for the application agent manager service."""
+
+from unittest.mock import MagicMock, patch
+
+from agent.application.services.agent_manager import AgentManager
+
+
+def make_executor(available=True):
+    """Create a mock executor."""
+    executor = MagicMock()
+    executor.is_available.return_value = available
+    return executor
+
+
+def test_auto_executor_is_cached():
+    """Test that the "auto" resolution is reused until invalidated."""
+    ssh_executor = make_executor()
+    local_executor = make_executor()
+    manager = AgentManager({"ssh": ssh_executor, "local": local_executor})
+
+    assert manager._get_executor("auto") is ssh_executor
+    ssh_executor.is_available.return_value = False
+    assert manager._get_executor("auto") is ssh_executor
+    assert ssh_executor.is_available.call_count == 1
+
+    manager.invalidate_auto_cache()
+    assert manager._get_executor("auto") is local_executor
+
+
+def test_agent_info_payload_is_built_once():
+    """Test that the agent info is built from the executors at construction."""
+    local_executor = make_executor()
+    local_executor.target_info = {"hostname": "test-host", "platform": "Linux", "version": "1"}
+    ssh_executor = make_executor()
+    ssh_executor.enabled = True
+    ssh_executor.target_info = {"host": "target", "username": "user"}
+    manager = AgentManager({"local": local_executor, "ssh": ssh_executor})
+
+    payload = manager.agent_info_payload
+    assert payload["hostname"] == "test-host"
+    assert payload["ssh_enabled"] is True
+    assert payload["ssh_target"] == "user@target"
+    assert manager.agent_info_payload is payload
+
+
+def test_available_executors_are_cached():
+    """Test that executor info is collected at registration, not per call."""
+    local_executor = make_executor()
+    local_executor.get_info.return_value = {"type": "local", "available": True}
+    manager = AgentManager({"local": local_executor})
+
+    assert manager.get_available_executors() == {"local": {"type": "local", "available": True}}
+    manager.get_available_executors()
+    assert local_executor.get_info.call_count == 1
+
+    ssh_executor = make_executor()
+    ssh_executor.get_info.return_value = {"type": "ssh", "available": True}
+    manager.register_executor("ssh", ssh_executor)
+    assert set(manager.get_available_executors()) == {"local", "ssh"}
+
+
+def test_auto_executor_picks_unconnected_ssh():
+    """Test that "auto" picks a configured SSH executor before it has connected."""
+    from agent.infrastructure.executors.ssh_executor import SSHExecutor
+    
+    with patch("agent.infrastructure.executors.ssh_executor.SSH_AVAILABLE", True):
+        ssh_executor = SSHExecutor(host="target", username="user")
+        manager = AgentManager({"ssh": ssh_executor, "local": make_executor()})
+        
+        assert ssh_executor.connected is False
+        assert manager._get_executor("auto") is ssh_executor
+
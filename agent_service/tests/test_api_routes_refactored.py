@@ -11,6 +11,8 @@ from agent.api.routes import router
 from agent.domain.models import CommandResponse, ExecutorInfo
 from agent.application.command_service import CommandService
 from agent.application.agent_service import AgentService
+from agent.api.auth import authenticate
+from agent.api.dependencies import get_agent_service, get_command_service
 
 # Create test app
 app = FastAPI()
@@ -98,7 +100,8 @@ def test_get_info(mock_auth, mock_agent_service):
     """Test get_info endpoint."""
     # Override dependency
     app.dependency_overrides = {
-        AgentService: lambda: mock_agent_service
+        get_agent_service: lambda: mock_agent_service,
+        authenticate: lambda: True
     }
     
     # Make request
@@ -119,7 +122,8 @@ def test_get_executors(mock_auth, mock_agent_service):
     """Test get_executors endpoint."""
     # Override dependency
     app.dependency_overrides = {
-        AgentService: lambda: mock_agent_service
+        get_agent_service: lambda: mock_agent_service,
+        authenticate: lambda: True
     }
     
     # Make request
@@ -139,7 +143,8 @@ def test_get_history(mock_auth, mock_command_service):
     """Test get_history endpoint."""
     # Override dependency
     app.dependency_overrides = {
-        CommandService: lambda: mock_command_service
+        get_command_service: lambda: mock_command_service,
+        authenticate: lambda: True
     }
     
     # Make request
@@ -159,7 +164,8 @@ def test_execute_command(mock_auth, mock_command_service):
     """Test execute_command endpoint."""
     # Override dependency
     app.dependency_overrides = {
-        CommandService: lambda: mock_command_service
+        get_command_service: lambda: mock_command_service,
+        authenticate: lambda: True
     }
     
     # Make request
@@ -180,4 +186,68 @@ def test_execute_command(mock_auth, mock_command_service):
     mock_command_service.execute_command.assert_called_once_with(
         command="test command",
         executor_type="local"
-    ) 
\ No newline at end of file
+    ) 
+
+@pytest.mark.asyncio
+async def test_authenticate_valid_token():
+    """Test that a matching token is accepted."""
+    from agent.api.auth import authenticate
+    
+    with patch("agent.api.auth.config") as mock_config:
+        mock_config.api_token = "valid-token"
+        assert await authenticate("valid-token") is True
+
+@pytest.mark.asyncio
+async def test_authenticate_invalid_token():
+    """Test that a mismatched token is rejected with 401."""
+    from fastapi import HTTPException
+    from agent.api.auth import authenticate
+    
+    with patch("agent.api.auth.config") as mock_config:
+        mock_config.api_token = "valid-token"
+        with pytest.raises(HTTPException) as excinfo:
+            await authenticate("invalid-token")
+    
+    assert excinfo.value.status_code == 401
+
+def test_dependency_introspection_is_cached():
+    """Test that FastAPI's dependency checks are memoized per callable."""
+    from fastapi.dependencies import utils as dependency_utils
+    
+    assert hasattr(dependency_utils.is_coroutine_callable, "__wrapped__")
+    assert dependency_utils.is_coroutine_callable(authenticate) is True
+    assert dependency_utils.is_coroutine_callable(get_agent_service) is False
+    assert dependency_utils.is_gen_callable(get_agent_service) is False
+
+def test_json_body_cache_reuses_body_until_expiry():
+    """Test that the encoded body is rebuilt only after the TTL or a source change."""
+    from agent.api.responses import JSONBodyCache
+    
+    source = object()
+    build = MagicMock(return_value={"version": "1.0.0"})
+    cache = JSONBodyCache(ttl=60)
+    
+    assert cache.get(source, build) == b'{"version":"1.0.0"}'
+    cache.get(source, build)
+    assert build.call_count == 1
+    
+    cache.get(object(), build)
+    assert build.call_count == 2
+    
+    cache.ttl = 0
+    cache.get(source, build)
+    cache.get(source, build)
+    assert build.call_count == 4
+
+def test_agent_json_response_encodes_models_directly():
+    """Test that dataclass models are encoded natively, without to_dict."""
+    from agent.api.responses import AgentJSONResponse
+    from agent.domain.models import Command
+
+    command = Command("ls", "test-id", "local", datetime(2023, 1, 1), exit_code=0)
+    command.to_dict()
+
+    data = json.loads(AgentJSONResponse([command]).body)
+    assert data[0]["command_id"] == "test-id"
+    assert data[0]["timestamp"] == "2023-01-01T00:00:00Z"
+    assert "_iso_ts" not in data[0]
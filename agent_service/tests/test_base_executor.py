@@ -67,6 +67,20 @@ class TestBaseExecutor:
         assert "timestamp" in result
         assert "command_id" in result
     
+    def test_create_base_result_keeps_command_id(self, test_executor):
+        """Test that a supplied command ID is used instead of a generated one."""
+        result = test_executor._create_base_result(
+            command="test command",
+            exit_code=0,
+            stdout="",
+            stderr="",
+            execution_type="test",
+            target="test target",
+            command_id="test-id"
+        )
+        
+        assert result["command_id"] == "test-id"
+    
     @pytest.mark.asyncio
     async def test_send_progress_update_with_callback(self, test_executor):
         """Test sending progress updates with a callback."""
@@ -76,7 +90,9 @@ class TestBaseExecutor:
         await test_executor._send_progress_update(
             command_id=command_id,
             progress_callback=mock_callback,
-            data={"status": "running", "progress": 50}
+            status="running",
+            progress=50,
+            message="Command running"
         )
         
         # Check that the callback was called with the correct data
@@ -85,6 +101,40 @@ class TestBaseExecutor:
         assert call_args["command_id"] == command_id
         assert call_args["status"] == "running"
         assert call_args["progress"] == 50
+        assert call_args["message"] == "Command running"
+        assert "timestamp" in call_args
+        assert "stdout" not in call_args
+    
+    @pytest.mark.asyncio
+    async def test_send_progress_update_with_output(self, test_executor):
+        """Test that recent output is included only when provided."""
+        mock_callback = AsyncMock()
+        
+        await test_executor._send_progress_update(
+            "test-id",
+            mock_callback,
+            "running",
+            50,
+            "Command running",
+            stderr="warning\n"
+        )
+        
+        call_args = mock_callback.call_args[0][0]
+        assert call_args["stderr"] == "warning\n"
+        assert "stdout" not in call_args
+    
+    @pytest.mark.asyncio
+    async def test_send_progress_update_reuses_timestamp(self, test_executor):
+        """Test that updates sent within the same second share a timestamp."""
+        mock_callback = AsyncMock()
+        
+        with patch("agent.utils.time.time", return_value=1672531200.5):
+            await test_executor._send_progress_update("test-id", mock_callback, "running", 10, "First")
+            await test_executor._send_progress_update("test-id", mock_callback, "running", 20, "Second")
+        
+        first, second = (call.args[0]["timestamp"] for call in mock_callback.call_args_list)
+        assert first is second
+        assert first == "2023-01-01T00:00:00+00:00"
     
     @pytest.mark.asyncio
     async def test_send_progress_update_without_callback(self, test_executor):
@@ -93,7 +143,9 @@ class TestBaseExecutor:
         await test_executor._send_progress_update(
             command_id="test-id",
             progress_callback=None,
-            data={"status": "running", "progress": 50}
+            status="running",
+            progress=50,
+            message="Command running"
         )
     
     @pytest.mark.asyncio
@@ -105,7 +157,9 @@ class TestBaseExecutor:
         await test_executor._send_progress_update(
             command_id="test-id",
             progress_callback=mock_callback,
-            data={"status": "running", "progress": 50}
+            status="running",
+            progress=50,
+            message="Command running"
         )
     
     @pytest.mark.asyncio
@@ -118,4 +172,56 @@ class TestBaseExecutor:
         assert result["stdout"] == "test output"
         assert result["stderr"] == ""
         assert result["execution_type"] == "test"
-        assert result["target"] == "test" 
\ No newline at end of file
+        assert result["target"] == "test" 
+
+@pytest.mark.asyncio
+async def test_progress_aggregator_coalesces_output():
+    """Test that small chunks are sent together in one update."""
+    from agent.infrastructure.executors.base_executor import ProgressAggregator
+    
+    mock_callback = AsyncMock()
+    aggregator = ProgressAggregator(mock_callback)
+    for _ in range(100):
+        aggregator.record("stdout", "a", 1)
+    aggregator.record("stderr", "b", 1)
+    mock_callback.assert_not_called()
+    
+    await aggregator.flush()
+    await aggregator.flush()
+    
+    mock_callback.assert_awaited_once()
+    update = mock_callback.call_args.args[0]
+    assert update["stdout"] == "a" * 100
+    assert update["stderr"] == "b"
+
+
+@pytest.mark.asyncio
+async def test_progress_aggregator_sends_on_timer_and_size():
+    """Test that output is sent after a pause and early once enough is waiting."""
+    from agent.infrastructure.executors.base_executor import (
+        PROGRESS_FLUSH_BYTES, PROGRESS_FLUSH_INTERVAL, ProgressAggregator
+    )
+    
+    mock_callback = AsyncMock()
+    aggregator = ProgressAggregator(mock_callback)
+    aggregator.start()
+    
+    # Output followed by silence is still delivered
+    aggregator.record("stdout", "x", 1)
+    await asyncio.sleep(PROGRESS_FLUSH_INTERVAL * 2)
+    assert mock_callback.await_count == 1
+    
+    # A large chunk wakes the sender without waiting for the interval
+    aggregator.record("stdout", "y", PROGRESS_FLUSH_BYTES)
+    await asyncio.sleep(0.01)
+    assert mock_callback.await_count == 2
+    
+    aggregator.record("stderr", "z", 1)
+    await aggregator.aclose()
+    assert mock_callback.await_count == 3
+    assert mock_callback.call_args.args[0] == {
+        "progress": 50,
+        "message": "Command in progress",
+        "timestamp": mock_callback.call_args.args[0]["timestamp"],
+        "stderr": "z"
+    }
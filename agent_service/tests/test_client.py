@@ -1,53 +1,72 @@
-"""Unit tests for the client module."""
+"""Unit tests for the client service."""
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 import json
 from datetime import datetime, UTC
 
-from agent.client import start_agent_client, connect, disconnect, execute_command_event, send_command_progress, get_auth_token, connection_response, command_response
+from agent.client import start_agent_client
+from agent.application.services.client_service import ClientService
+
+def make_http_session(response):
+    """Create a mock HTTP session whose post returns the given response."""
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=False)
+    session = MagicMock()
+    session.closed = False
+    session.post.return_value = context
+    return session
+
+def make_client_service(agent_manager=None):
+    """Create a client service with a mocked Socket.IO client."""
+    service = ClientService(agent_manager=agent_manager or MagicMock())
+    service.sio = MagicMock()
+    service.sio.emit = AsyncMock()
+    return service
 
 class TestClient:
-    """Test cases for the client module."""
-    
+    """Test cases for the client service."""
+
     @pytest.mark.asyncio
     async def test_connect(self):
-        """Test the connect function."""
-        # Mock the socket.io client
-        mock_sio = MagicMock()
-        
-        # Call the connect function
-        with patch('agent.client.sio', mock_sio), \
-             patch('agent.client.connected', False), \
-             patch('agent.client.reconnect_attempts', 5), \
-             patch('agent.client.logger') as mock_logger:
-            await connect()
-        
-        # Assert that the logger.info method was called
+        """Test the connect handler."""
+        service = make_client_service()
+        service.agent_manager.agent_info_payload = {'hostname': 'test-host'}
+
+        with patch('agent.application.services.client_service.logger') as mock_logger:
+            await service.handle_connect()
+
+        # Assert that the agent registered with the controller
+        assert service.connected is True
         mock_logger.info.assert_called_once_with("Connected to Controller Service")
-    
+        service.sio.emit.assert_called_once_with('register_agent', {'agent_info': {'hostname': 'test-host'}})
+
     @pytest.mark.asyncio
     async def test_disconnect(self):
-        """Test the disconnect function."""
-        # Mock the socket.io client
-        mock_sio = MagicMock()
-        
-        # Call the disconnect function
-        with patch('agent.client.sio', mock_sio), \
-             patch('agent.client.connected', True), \
-             patch('agent.client.logger') as mock_logger:
-            await disconnect()
-        
+        """Test the disconnect handler."""
+        service = make_client_service()
+        service.connected = True
+
+        with patch('agent.application.services.client_service.logger') as mock_logger:
+            await service.handle_disconnect()
+
         # Assert that the logger.info method was called
+        assert service.connected is False
         mock_logger.info.assert_called_once_with("Disconnected from Controller Service")
-    
+
+    @pytest.mark.asyncio
+    async def test_registration_response(self):
+        """Test that the agent ID assigned by the controller is stored."""
+        service = make_client_service()
+
+        await service.handle_registration_response({'status': 'success', 'agent_id': 'agent-abc'})
+
+        assert service.agent_id == 'agent-abc'
+
     @pytest.mark.asyncio
     async def test_execute_command_event(self):
-        """Test the execute_command_event function."""
-        # Mock the socket.io client
-        mock_sio = MagicMock()
-        mock_sio.emit = AsyncMock()
-        
+        """Test the execute command handler."""
         # Mock the agent_manager
         mock_agent_manager = MagicMock()
         mock_agent_manager.execute_command = AsyncMock(return_value={
@@ -59,7 +78,8 @@ class TestClient:
             'execution_type': 'test',
             'target': 'test'
         })
-        
+        service = make_client_service(mock_agent_manager)
+
         # Create a test command request
         command_request = {
             'command_id': 'test-id',
@@ -67,13 +87,12 @@ class TestClient:
             'execution_target': 'local',
             'requester_sid': 'test-sid'
         }
-        
-        # Call the execute_command_event function
-        with patch('agent.client.sio', mock_sio), \
-             patch('agent.client.agent_manager', mock_agent_manager), \
-             patch('agent.client.send_command_progress', AsyncMock()):
-            await execute_command_event(command_request)
-        
+
+        # Call the execute command handler
+        with patch('agent.application.services.client_service.config') as mock_config:
+            mock_config.redis_client = None
+            await service.handle_execute_command(command_request)
+
         # Assert that the execute_command method was called with the correct arguments
         mock_agent_manager.execute_command.assert_called_once()
         call_args = mock_agent_manager.execute_command.call_args[1]
@@ -81,221 +100,335 @@ class TestClient:
         assert call_args['executor_type'] == 'local'
         assert call_args['command_id'] == 'test-id'
         assert callable(call_args['progress_callback'])
-        
+
         # Assert that the emit method was called with the correct arguments
-        mock_sio.emit.assert_called_once()
-        assert mock_sio.emit.call_args[0][0] == 'command_result'
-        assert 'status' in mock_sio.emit.call_args[0][1]
-        assert mock_sio.emit.call_args[0][1]['status'] == 'success'
-    
+        service.sio.emit.assert_called_once()
+        assert service.sio.emit.call_args[0][0] == 'command_result'
+        assert 'status' in service.sio.emit.call_args[0][1]
+        assert service.sio.emit.call_args[0][1]['status'] == 'success'
+
     @pytest.mark.asyncio
     async def test_execute_command_event_with_invalid_data(self):
-        """Test the execute_command_event function with invalid data."""
-        # Mock the socket.io client
-        mock_sio = MagicMock()
-        mock_sio.emit = AsyncMock()
-        
-        # Call the execute_command_event function with invalid data
-        with patch('agent.client.sio', mock_sio), \
-             patch('agent.client.logger') as mock_logger:
-            await execute_command_event({})  # Empty dict without 'command' key
-        
+        """Test the execute command handler with invalid data."""
+        service = make_client_service()
+
+        # Call the handler with invalid data
+        with patch('agent.application.services.client_service.logger') as mock_logger:
+            await service.handle_execute_command({})  # Empty dict without 'command' key
+
         # Assert that the logger.error method was called
         mock_logger.error.assert_called_once_with("Invalid command format received")
-        
+
         # Assert that the emit method was called with an error message
-        mock_sio.emit.assert_called_once()
-        assert mock_sio.emit.call_args[0][0] == 'command_result'
-        assert 'status' in mock_sio.emit.call_args[0][1]
-        assert mock_sio.emit.call_args[0][1]['status'] == 'error'
-    
+        service.sio.emit.assert_called_once()
+        assert service.sio.emit.call_args[0][0] == 'command_result'
+        assert 'status' in service.sio.emit.call_args[0][1]
+        assert service.sio.emit.call_args[0][1]['status'] == 'error'
+
     @pytest.mark.asyncio
-    async def test_send_command_progress(self):
-        """Test the send_command_progress function."""
-        # Mock the socket.io client
-        mock_sio = MagicMock()
-        mock_sio.emit = AsyncMock()
-        
-        # Create test progress data
-        progress_data = {
-            'progress': 50,
-            'message': 'Test progress'
+    async def test_execute_command_batches_progress(self):
+        """Test that progress updates are sent in one frame before the result."""
+        async def execute_command(command, executor_type, command_id, progress_callback):
+            for i in range(3):
+                await progress_callback({'progress': i})
+            return {'command': command, 'exit_code': 0}
+
+        mock_agent_manager = MagicMock()
+        mock_agent_manager.execute_command = execute_command
+        service = make_client_service(mock_agent_manager)
+        service.connected = True
+
+        with patch('agent.application.services.client_service.config') as mock_config:
+            mock_config.redis_client = None
+            mock_config.progress_flush_interval = 0.01
+            mock_config.progress_max_batch = 100
+            await service.handle_execute_command({
+                'command': 'ls',
+                'command_id': 'test-id',
+                'requester_sid': 'test-sid'
+            })
+
+        events = [call.args[0] for call in service.sio.emit.call_args_list]
+        assert events == ['command_progress', 'command_result']
+        assert service.sio.emit.call_args_list[0].args[1] == {
+            'command_id': 'test-id',
+            'requester_sid': 'test-sid',
+            'chunks': [{'progress': 0}, {'progress': 1}, {'progress': 2}]
         }
-        
-        # Call the send_command_progress function
-        with patch('agent.client.sio', mock_sio), \
-             patch('agent.client.connected', True), \
-             patch('agent.client.config') as mock_config:
+
+    @pytest.mark.asyncio
+    async def test_execute_command_limits_batch_size(self):
+        """Test that a batch never holds more than progress_max_batch updates."""
+        async def execute_command(command, executor_type, command_id, progress_callback):
+            for i in range(5):
+                await progress_callback({'progress': i})
+            return {'command': command, 'exit_code': 0}
+
+        mock_agent_manager = MagicMock()
+        mock_agent_manager.execute_command = execute_command
+        service = make_client_service(mock_agent_manager)
+        service.connected = True
+
+        with patch('agent.application.services.client_service.config') as mock_config:
             mock_config.redis_client = None
-            await send_command_progress('test-id', 'test-sid', progress_data)
-        
+            mock_config.progress_flush_interval = 0.01
+            mock_config.progress_max_batch = 2
+            await service.handle_execute_command({'command': 'ls', 'command_id': 'test-id'})
+
+        batches = [
+            call.args[1]['chunks'] for call in service.sio.emit.call_args_list
+            if call.args[0] == 'command_progress'
+        ]
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_send_command_progress(self):
+        """Test sending a batch of progress updates."""
+        service = make_client_service()
+        service.connected = True
+
+        # Call the send_command_progress method
+        with patch('agent.application.services.client_service.config') as mock_config:
+            mock_config.redis_client = None
+            await service.send_command_progress('test-id', 'test-sid', [{'progress': 50}])
+
         # Assert that the emit method was called with the correct arguments
-        mock_sio.emit.assert_called_once_with('command_progress', {
-            'progress': 50,
-            'message': 'Test progress',
+        service.sio.emit.assert_called_once_with('command_progress', {
             'command_id': 'test-id',
-            'requester_sid': 'test-sid'
+            'requester_sid': 'test-sid',
+            'chunks': [{'progress': 50}]
         })
-    
+
     @pytest.mark.asyncio
     async def test_send_command_progress_with_redis(self):
-        """Test the send_command_progress function with Redis."""
-        # Mock the socket.io client
-        mock_sio = MagicMock()
-        mock_sio.emit = AsyncMock()
-        
+        """Test sending progress updates with Redis."""
+        service = make_client_service()
+        service.connected = True
+
         # Mock the Redis client
         mock_redis = MagicMock()
-        
-        # Create test progress data
-        progress_data = {
-            'progress': 50,
-            'message': 'Test progress'
-        }
-        
-        # Call the send_command_progress function
-        with patch('agent.client.sio', mock_sio), \
-             patch('agent.client.connected', True), \
-             patch('agent.client.config') as mock_config:
+        mock_redis.publish = AsyncMock()
+
+        # Call the send_command_progress method
+        with patch('agent.application.services.client_service.config') as mock_config:
             mock_config.redis_client = mock_redis
-            await send_command_progress('test-id', 'test-sid', progress_data)
-        
-        # Assert that the emit method was called with the correct arguments
-        mock_sio.emit.assert_called_once_with('command_progress', {
-            'progress': 50,
-            'message': 'Test progress',
-            'command_id': 'test-id',
-            'requester_sid': 'test-sid'
-        })
-        
+            await service.send_command_progress('test-id', 'test-sid', [{'progress': 50}])
+
         # Assert that the Redis publish method was called with the correct arguments
-        mock_redis.publish.assert_called_once()
+        mock_redis.publish.assert_awaited_once()
         assert mock_redis.publish.call_args[0][0] == 'command_progress'
         published_data = json.loads(mock_redis.publish.call_args[0][1])
         assert published_data['type'] == 'command_progress'
-        assert published_data['data']['progress'] == 50
-    
+        assert published_data['data']['chunks'][0]['progress'] == 50
+
     @pytest.mark.asyncio
     async def test_send_command_progress_with_exception(self):
-        """Test the send_command_progress function with an exception."""
-        # Mock the socket.io client
-        mock_sio = MagicMock()
-        mock_sio.emit = AsyncMock(side_effect=Exception("Test exception"))
-        
-        # Create test progress data
-        progress_data = {
-            'progress': 50,
-            'message': 'Test progress'
-        }
-        
-        # Call the send_command_progress function
-        with patch('agent.client.sio', mock_sio), \
-             patch('agent.client.connected', True), \
-             patch('agent.client.config') as mock_config, \
-             patch('agent.client.logger') as mock_logger:
+        """Test sending progress updates when the emit fails."""
+        service = make_client_service()
+        service.connected = True
+        service.sio.emit = AsyncMock(side_effect=Exception("Test exception"))
+
+        # Call the send_command_progress method
+        with patch('agent.application.services.client_service.config') as mock_config, \
+             patch('agent.application.services.client_service.logger') as mock_logger:
             mock_config.redis_client = None
-            await send_command_progress('test-id', 'test-sid', progress_data)
-        
+            await service.send_command_progress('test-id', 'test-sid', [{'progress': 50}])
+
         # Assert that the logger.error method was called
         mock_logger.error.assert_called_once()
-    
+
     @pytest.mark.asyncio
     async def test_get_auth_token_success(self):
-        """Test the get_auth_token function with a successful response."""
-        # Mock the requests module
+        """Test getting a token with a successful response."""
+        service = make_client_service()
+
+        # Mock the HTTP session
         mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'access_token': 'test-token'}
-        
-        mock_requests = MagicMock()
-        mock_requests.post.return_value = mock_response
-        
-        # Call the get_auth_token function
-        with patch.dict('sys.modules', {'requests': mock_requests}), \
-             patch('agent.client.config') as mock_config, \
-             patch('agent.client.logger') as mock_logger:
+        mock_response.status = 200
+        mock_response.json = AsyncMock(return_value={'access_token': 'test-token'})
+        service._http = make_http_session(mock_response)
+
+        # Call the get_auth_token method
+        with patch('agent.application.services.client_service.config') as mock_config, \
+             patch('agent.application.services.client_service.logger') as mock_logger:
             mock_config.controller_url = 'http://test-controller'
             mock_config.agent_username = 'test-user'
             mock_config.agent_password = 'test-password'
-            
-            token = await get_auth_token()
-        
-        # Assert that the requests.post method was called with the correct arguments
-        mock_requests.post.assert_called_once_with(
+
+            token = await service.get_auth_token()
+
+        # Assert that the post method was called with the correct arguments
+        service._http.post.assert_called_once_with(
             'http://test-controller/token',
             data={'username': 'test-user', 'password': 'test-password'}
         )
-        
+
         # Assert that the token was returned
         assert token == 'test-token'
-        
+
         # Assert that the logger.info method was called
         mock_logger.info.assert_called_with("Authentication successful")
-    
+
     @pytest.mark.asyncio
     async def test_get_auth_token_failure(self):
-        """Test the get_auth_token function with a failed response."""
-        # Mock the requests module
+        """Test getting a token with a failed response."""
+        service = make_client_service()
+
+        # Mock the HTTP session
         mock_response = MagicMock()
-        mock_response.status_code = 401
-        mock_response.text = 'Unauthorized'
-        
-        mock_requests = MagicMock()
-        mock_requests.post.return_value = mock_response
-        
-        # Call the get_auth_token function
-        with patch.dict('sys.modules', {'requests': mock_requests}), \
-             patch('agent.client.config') as mock_config, \
-             patch('agent.client.logger') as mock_logger:
+        mock_response.status = 401
+        mock_response.text = AsyncMock(return_value='Unauthorized')
+        service._http = make_http_session(mock_response)
+
+        # Call the get_auth_token method
+        with patch('agent.application.services.client_service.config') as mock_config, \
+             patch('agent.application.services.client_service.logger') as mock_logger:
             mock_config.controller_url = 'http://test-controller'
             mock_config.agent_username = 'test-user'
             mock_config.agent_password = 'test-password'
-            
-            token = await get_auth_token()
-        
-        # Assert that the requests.post method was called with the correct arguments
-        mock_requests.post.assert_called_once_with(
-            'http://test-controller/token',
-            data={'username': 'test-user', 'password': 'test-password'}
-        )
-        
+
+            token = await service.get_auth_token()
+
         # Assert that the token is None
         assert token is None
-        
+
         # Assert that the logger.error method was called
         mock_logger.error.assert_called_once()
-    
+
     @pytest.mark.asyncio
     async def test_connection_response(self):
-        """Test the connection_response function."""
-        # Mock the socket.io client
-        mock_sio = MagicMock()
-        
-        # Call the connection_response function
-        with patch('agent.client.sio', mock_sio), \
-             patch('agent.client.logger') as mock_logger:
-            await connection_response({'status': 'success'})
-        
+        """Test the connection response handler."""
+        service = make_client_service()
+
+        with patch('agent.application.services.client_service.logger') as mock_logger:
+            await service.handle_connection_response({'status': 'success'})
+
         # Assert that the logger.info method was called
-        mock_logger.info.assert_called_once_with("Connection response: {'status': 'success'}")
-    
+        mock_logger.info.assert_called_once_with("Connection response: %s", {'status': 'success'})
+
     @pytest.mark.asyncio
     async def test_command_response(self):
-        """Test the command_response function."""
-        # Mock the socket.io client
-        mock_sio = MagicMock()
-        
-        # Call the command_response function
-        with patch('agent.client.sio', mock_sio), \
-             patch('agent.client.logger') as mock_logger:
-            await command_response({'status': 'success'})
-        
-        # Assert that the logger.info method was called
-        mock_logger.info.assert_called_once_with("Command response received: {'status': 'success'}")
-    
+        """Test the command response handler."""
+        service = make_client_service()
+
+        with patch('agent.application.services.client_service.logger') as mock_logger:
+            await service.handle_command_response({'status': 'success'})
+
+        # Assert that the payload is only logged at debug level
+        mock_logger.info.assert_not_called()
+        mock_logger.debug.assert_called_once_with("Command response received: %s", {'status': 'success'})
+
     @pytest.mark.asyncio
     async def test_start_agent_client(self):
-        """Test the start_agent_client function."""
-        # This is a more complex test that would require mocking multiple components
-        # For simplicity, we'll just test that the function exists
-        assert callable(start_agent_client) 
\ No newline at end of file
+        """Test that start_agent_client tests SSH and starts the shared client service."""
+        ssh_executor = MagicMock()
+        ssh_executor.enabled = True
+        ssh_executor.test_connection.return_value = (True, "SSH connection test successful")
+        mock_service = MagicMock()
+        mock_service.get_agent_manager.return_value.executors = {"ssh": ssh_executor}
+        mock_service.start = AsyncMock(return_value=True)
+        with patch('agent.client.get_client_service', return_value=mock_service):
+            assert await start_agent_client() == 0
+
+        ssh_executor.test_connection.assert_called_once()
+        mock_service.start.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_start_agent_client_reports_failure(self):
+        """Test that start_agent_client returns 1 if the controller is unreachable."""
+        mock_service = MagicMock()
+        mock_service.get_agent_manager.return_value.executors = {}
+        mock_service.start = AsyncMock(return_value=False)
+        with patch('agent.client.get_client_service', return_value=mock_service):
+            assert await start_agent_client() == 1
+
+    def test_client_service_uses_shared_agent_manager(self):
+        """Test that the client runs commands on the legacy agent manager."""
+        from agent.manager import get_agent_manager
+        from agent.application.services.client_service import get_client_service
+
+        assert get_client_service().get_agent_manager() is get_agent_manager()
+
+def test_orjson_codec_matches_socketio_encoding():
+    """Test that Socket.IO packets encoded with orjson round-trip."""
+    from socketio import packet
+    from agent.application.services.client_service import OrjsonCodec
+
+    data = ['command_progress', {'command_id': 'test-id', 'chunks': [{'progress': 1}], 2: 'x'}]
+    assert json.loads(OrjsonCodec.dumps(data, separators=(',', ':'))) == json.loads(json.dumps(data))
+    assert packet.Packet.json is OrjsonCodec
+    assert OrjsonCodec.loads(OrjsonCodec.dumps(data)) == json.loads(json.dumps(data))
+
+@pytest.mark.asyncio
+async def test_aclose_awaits_disconnect():
+    """Test that closing the client waits for the Socket.IO disconnect."""
+    service = make_client_service()
+    service.connected = True
+    service.sio.disconnect = AsyncMock()
+    service._http = MagicMock(closed=False, close=AsyncMock())
+    http_session = service._http
+
+    await service.aclose()
+
+    service.sio.disconnect.assert_awaited_once()
+    http_session.close.assert_awaited_once()
+    assert service._http is None
+
+@pytest.mark.asyncio
+async def test_send_command_progress_skips_redis_without_subscribers():
+    """Test that progress is not published to channels nobody listens to."""
+    service = make_client_service()
+    mock_redis = MagicMock()
+    mock_redis.publish = AsyncMock()
+    mock_redis.pubsub_numsub = AsyncMock(return_value=[(b'command_progress', 0), (b'command_results', 2)])
+
+    with patch('agent.application.services.client_service.config') as mock_config, \
+         patch('agent.application.services.client_service.asyncio.sleep', AsyncMock(side_effect=StopAsyncIteration)):
+        mock_config.redis_client = mock_redis
+        with pytest.raises(StopAsyncIteration):
+            await service._refresh_subscriber_counts()
+        await service.send_command_progress('test-id', 'test-sid', [{'progress': 50}])
+
+    assert service._sub_counts == {'command_progress': 0, 'command_results': 2}
+    mock_redis.publish.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_connect_auth_reuses_token_until_rejected():
+    """Test that reconnects reuse the token until a connection error occurs."""
+    service = make_client_service()
+    service.agent_manager.agent_info_payload = {'hostname': 'test-host'}
+    get_auth_token = AsyncMock(side_effect=['first-token', 'second-token'])
+
+    with patch.object(ClientService, 'get_auth_token', get_auth_token):
+        assert (await service._get_connect_auth())['token'] == 'first-token'
+        assert (await service._get_connect_auth())['token'] == 'first-token'
+
+        await service.handle_connect_error({'message': 'Unauthorized'})
+        auth = await service._get_connect_auth()
+
+    assert auth['token'] == 'second-token'
+    assert auth['agent_info'] == {'hostname': 'test-host'}
+    assert get_auth_token.await_count == 2
+
+@pytest.mark.asyncio
+async def test_large_result_is_encoded_off_the_loop():
+    """Test that large command results are encoded in a worker thread."""
+    from agent.application.services.client_service import LARGE_PAYLOAD_THRESHOLD
+
+    mock_agent_manager = MagicMock()
+    mock_agent_manager.execute_command = AsyncMock(return_value={
+        'command': 'cat big', 'exit_code': 0, 'stdout': 'x' * (LARGE_PAYLOAD_THRESHOLD + 1), 'stderr': ''
+    })
+    service = make_client_service(mock_agent_manager)
+    mock_redis = MagicMock()
+    mock_redis.publish = AsyncMock()
+
+    with patch('agent.application.services.client_service.config') as mock_config, \
+         patch('agent.application.services.client_service.asyncio.to_thread', AsyncMock(return_value=b'{}')) as mock_to_thread:
+        mock_config.redis_client = mock_redis
+        await service.handle_execute_command({'command': 'cat big'})
+
+    mock_to_thread.assert_awaited_once()
+    envelope = service.sio.emit.call_args[0][1]
+    assert mock_to_thread.call_args[0][1] == {'type': 'command_result', 'data': envelope}
+    mock_redis.publish.assert_awaited_once_with('command_results', b'{}')
@@ -1,7 +1,7 @@
 """Unit tests for the config module."""
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import os
 
 from agent.config import Config, config
@@ -76,6 +76,22 @@ class TestConfig:
         assert ssh_config['key_path'] == '/path/to/key'
         assert ssh_config['timeout'] == '30'
     
+    def test_ssh_config_is_cached(self):
+        """Test that ssh_config is built once and rebuilt after SSH settings change."""
+        test_config = Config()
+        ssh_config = test_config.ssh_config
+        
+        assert test_config.ssh_config is ssh_config
+        with pytest.raises(TypeError):
+            ssh_config['host'] = 'other-host'
+        
+        test_config.api_port = 9000
+        assert test_config.ssh_config is ssh_config
+        
+        test_config.ssh_host = 'other-host'
+        assert test_config.ssh_config is not ssh_config
+        assert test_config.ssh_config['host'] == 'other-host'
+    
     def test_str_representation(self):
         """Test the string representation of the config."""
         # Create a config instance with sensitive information
@@ -100,7 +116,7 @@ class TestConfig:
         # Mock the redis module
         mock_redis = MagicMock()
         mock_redis_client = MagicMock()
-        mock_redis.from_url.return_value = mock_redis_client
+        mock_redis.asyncio.from_url.return_value = mock_redis_client
         
         # Patch the redis module and os.getenv
         with patch.dict('sys.modules', {'redis': mock_redis}), \
@@ -110,13 +126,13 @@ class TestConfig:
             
             # Assert that the Redis client was created
             assert test_config.redis_client is not None
-            mock_redis.from_url.assert_called_once_with('redis://localhost:6379/0')
+            mock_redis.asyncio.from_url.assert_called_once_with('redis://localhost:6379/0')
     
     def test_redis_connection_failure(self):
         """Test Redis connection failure handling."""
         # Mock the redis module to raise an exception
         mock_redis = MagicMock()
-        mock_redis.from_url.side_effect = Exception("Connection failed")
+        mock_redis.asyncio.from_url.side_effect = Exception("Connection failed")
         
         # Patch the redis module, os.getenv, and logger
         with patch.dict('sys.modules', {'redis': mock_redis}), \
@@ -129,18 +145,20 @@ class TestConfig:
             assert test_config.redis_client is None
             mock_logger.error.assert_called_once()
     
-    def test_cleanup(self):
+    @pytest.mark.asyncio
+    async def test_cleanup(self):
         """Test the cleanup method."""
         # Create a config instance with a mock Redis client
         test_config = Config()
         mock_redis_client = MagicMock()
+        mock_redis_client.aclose = AsyncMock()
         test_config.redis_client = mock_redis_client
         
         # Call the cleanup method
         with patch('agent.config.logger') as mock_logger:
-            test_config.cleanup()
+            await test_config.cleanup()
             
             # Assert that the Redis client was closed and set to None
-            mock_redis_client.close.assert_called_once()
+            mock_redis_client.aclose.assert_awaited_once()
             assert test_config.redis_client is None
             mock_logger.info.assert_called_once_with("Closing Redis connection") 
\ No newline at end of file
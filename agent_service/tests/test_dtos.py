@@ -0,0 +1,54 @@
+"""Unit tests for the application data transfer objects."""
+
+import dataclasses
+import pytest
+from datetime import datetime, timezone
+
+from agent.application.dtos import CommandRequestDTO, CommandResponseDTO
+
+
+def make_response(**overrides):
+    """Create a command response DTO with default values."""
+    data = {
+        "command": "ls",
+        "command_id": "test-id",
+        "executor_type": "local",
+        "exit_code": 0,
+        "stdout": "file1\nfile2",
+        "stderr": "",
+        "timestamp": datetime(2023, 1, 1, tzinfo=timezone.utc),
+        "execution_type": "local",
+        "target": "localhost",
+        "status": "success"
+    }
+    data.update(overrides)
+    return CommandResponseDTO(**data)
+
+
+def test_request_round_trip():
+    """Test converting a command request to and from a dictionary."""
+    request = CommandRequestDTO(command="ls", executor_type="ssh", command_id="abc")
+    assert CommandRequestDTO.from_dict(request.to_dict()) == request
+
+
+def test_response_round_trip():
+    """Test converting a command response to and from a dictionary."""
+    response = make_response()
+    data = response.to_dict()
+
+    assert data["timestamp"] == "2023-01-01T00:00:00+00:00"
+    assert CommandResponseDTO.from_dict(data) == response
+
+
+def test_dtos_are_immutable():
+    """Test that DTO fields cannot be reassigned."""
+    response = make_response()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        response.exit_code = 1
+
+
+def test_response_timestamp_is_formatted_once():
+    """Test that the ISO timestamp is cached at construction."""
+    response = make_response()
+    assert response.to_dict()["timestamp"] is response.to_dict()["timestamp"]
+    assert make_response(timestamp="2023-01-01T00:00:00Z").to_dict()["timestamp"] == "2023-01-01T00:00:00Z"
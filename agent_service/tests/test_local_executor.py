@@ -3,6 +3,7 @@
 import pytest
 import asyncio
 import platform
+import shlex
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from agent.executors.local_executor import LocalExecutor
@@ -80,6 +81,8 @@ class TestLocalExecutor:
         
         result = await executor.execute(command, "test-id", mock_callback)
         
+        assert result["command_id"] == "test-id"
+        
         # Check that the callback was called at least twice (start and end)
         assert mock_callback.call_count >= 2
         
@@ -99,8 +102,9 @@ class TestLocalExecutor:
         """Test command execution with timeout."""
         executor = LocalExecutor()
         
-        # Mock the subprocess.Popen to simulate a timeout
-        with patch('subprocess.Popen', side_effect=asyncio.TimeoutError):
+        # Mock the subprocess creation to simulate a timeout
+        with patch('asyncio.create_subprocess_exec', side_effect=asyncio.TimeoutError), \
+             patch('asyncio.create_subprocess_shell', side_effect=asyncio.TimeoutError):
             result = await executor.execute("sleep 10")
             
             assert result["command"] == "sleep 10"
@@ -113,11 +117,153 @@ class TestLocalExecutor:
         """Test command execution with an exception."""
         executor = LocalExecutor()
         
-        # Mock the subprocess.Popen to simulate an exception
-        with patch('subprocess.Popen', side_effect=Exception("Test exception")):
+        # Mock the subprocess creation to simulate an exception
+        with patch('asyncio.create_subprocess_exec', side_effect=Exception("Test exception")), \
+             patch('asyncio.create_subprocess_shell', side_effect=Exception("Test exception")):
             result = await executor.execute("test command")
             
             assert result["command"] == "test command"
             assert result["exit_code"] == -1
             assert "Error executing command" in result["stderr"]
-            assert result["execution_type"] == "local" 
\ No newline at end of file
+            assert result["execution_type"] == "local" 
+    
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(platform.system() == "Windows", reason="Uses POSIX shell redirection")
+    async def test_execute_reads_stdout_and_stderr_concurrently(self):
+        """Test that a large stderr stream does not block stdout reading."""
+        executor = LocalExecutor()
+        
+        # Write more than a pipe buffer to stderr before producing stdout
+        command = 'awk \'BEGIN { for (i = 0; i < 1000; i++) printf "%0100d\\n", 0 }\' >&2; echo done'
+        result = await asyncio.wait_for(executor.execute(command), timeout=10)
+        
+        assert result["exit_code"] == 0
+        assert result["stdout"] == "done\n"
+        assert len(result["stderr"]) == 101000
+    
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(platform.system() == "Windows", reason="Uses POSIX seq")
+    async def test_execute_progress_coalesces_output(self):
+        """Test that output lines are batched into few running updates."""
+        executor = LocalExecutor()
+        mock_callback = AsyncMock()
+        
+        result = await executor.execute("seq 1 500", "test-id", mock_callback)
+        
+        running = [c.args[0] for c in mock_callback.call_args_list if "stdout" in c.args[0]]
+        assert 1 <= len(running) < 10
+        assert "".join(update["stdout"] for update in running) == result["stdout"]
+        assert mock_callback.call_args_list[-1].args[0]["status"] == "completed"
+    
+    def test_get_target_info_is_computed_once(self):
+        """Test that target info does not query the platform per call."""
+        executor = LocalExecutor()
+        
+        hostname = platform.node()
+        with patch("platform.node") as mock_node, patch("platform.version") as mock_version:
+            info = executor.get_target_info()
+            info["hostname"] = "changed"
+            
+            assert executor.get_target_info()["hostname"] == hostname
+            mock_node.assert_not_called()
+            mock_version.assert_not_called()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(platform.system() == "Windows", reason="Windows always uses the shell")
+    async def test_execute_runs_plain_commands_without_shell(self):
+        """Test that only commands using shell syntax start a shell."""
+        executor = LocalExecutor()
+        
+        with patch('asyncio.create_subprocess_shell', wraps=asyncio.create_subprocess_shell) as mock_shell:
+            result = await executor.execute("echo 'a  b'")
+            assert result["stdout"] == "a  b\n"
+            mock_shell.assert_not_called()
+            
+            result = await executor.execute("echo a | tr a b")
+            assert result["stdout"] == "b\n"
+            mock_shell.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_execute_missing_program_reports_shell_error(self):
+        """Test that a missing program still fails like it does in the shell."""
+        executor = LocalExecutor()
+        
+        result = await executor.execute("command_that_does_not_exist --flag")
+        
+        assert result["exit_code"] not in (0, -1)
+        assert result["stderr"]
+    
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(platform.system() == "Windows", reason="Uses POSIX head and tr")
+    async def test_execute_reads_output_without_newlines(self):
+        """Test that output longer than a read chunk needs no line breaks."""
+        executor = LocalExecutor()
+        mock_callback = AsyncMock()
+        
+        command = "head -c 100000 /dev/zero | tr '\\0' x"
+        result = await executor.execute(command, "test-id", mock_callback)
+        
+        assert result["exit_code"] == 0
+        assert result["stdout"] == "x" * 100000
+        running = [c.args[0] for c in mock_callback.call_args_list if "stdout" in c.args[0]]
+        assert "".join(update["stdout"] for update in running) == result["stdout"]
+    
+    def test_executor_has_no_instance_dict(self):
+        """Test that executors store their state in slots."""
+        executor = LocalExecutor()
+        
+        assert not hasattr(executor, "__dict__")
+        with pytest.raises(AttributeError):
+            executor.unknown = True
+    
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(platform.system() == "Windows", reason="Windows always uses the shell")
+    async def test_execute_tokenizes_repeated_commands_once(self):
+        """Test that repeated commands reuse their shlex tokens."""
+        from agent.utils.process import split_command
+        
+        executor = LocalExecutor()
+        split_command.cache_clear()
+        
+        with patch('shlex.split', wraps=shlex.split) as mock_split:
+            for _ in range(3):
+                result = await executor.execute("echo repeated")
+                assert result["stdout"] == "repeated\n"
+            mock_split.assert_called_once_with("echo repeated")
+    
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(platform.system() == "Windows", reason="Windows always uses the shell")
+    async def test_executors_share_tokenized_commands(self):
+        """Test that both local executors reuse one tokenizer cache."""
+        from agent.infrastructure.executors.local_executor import LocalExecutor as InfraLocalExecutor
+        from agent.utils.process import split_command
+        
+        split_command.cache_clear()
+        
+        with patch('shlex.split', wraps=shlex.split) as mock_split:
+            await LocalExecutor().execute("echo shared")
+            result = await InfraLocalExecutor().execute("echo shared")
+            assert result["stdout"] == "shared\n"
+            mock_split.assert_called_once_with("echo shared")
+    
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(platform.system() == "Windows", reason="Uses POSIX sh and sleep")
+    async def test_infrastructure_executor_reports_output_before_pause_ends(self):
+        """Test that output followed by a pause is reported before the command exits."""
+        from agent.infrastructure.executors.local_executor import LocalExecutor as InfraLocalExecutor
+        
+        loop = asyncio.get_running_loop()
+        received = []
+        
+        async def callback(data):
+            if "stdout" in data:
+                received.append((loop.time(), data["stdout"]))
+        
+        started = loop.time()
+        result = await InfraLocalExecutor().execute("echo start; sleep 0.5; echo done", "test-id", callback)
+        finished = loop.time()
+        
+        assert result["stdout"] == "start\ndone\n"
+        assert received[0][1] == "start\n"
+        assert received[0][0] - started < 0.4
+        assert finished - received[0][0] > 0.2
@@ -1,5 +1,7 @@
 """Simple tests for the refactored code."""
 
+import sys
+
 import pytest
 from unittest.mock import MagicMock
 from agent.domain.models import CommandRequest, CommandResponse, ExecutorInfo
@@ -80,4 +82,157 @@ def test_command_service():
     command_repository.get_history.return_value = []
     history = service.get_command_history()
     assert isinstance(history, list)
-    command_repository.get_history.assert_called_once_with(10) 
\ No newline at end of file
+    command_repository.get_history.assert_called_once_with(10)
+
+def test_command_repository_history_is_bounded():
+    """Test that the repository keeps only the most recent results."""
+    repository = CommandRepository()
+    repository.clear()
+    try:
+        for i in range(repository.max_history_size + 5):
+            repository.add(MagicMock(command_id=str(i)))
+        
+        assert len(repository.command_history) == repository.max_history_size
+        assert [r.command_id for r in repository.get_history(2)] == [
+            str(repository.max_history_size + 3),
+            str(repository.max_history_size + 4)
+        ]
+        assert len(repository.get_history(0)) == repository.max_history_size
+    finally:
+        repository.clear()
+
+def test_now_iso_is_cached_per_second():
+    """Test that the ISO timestamp is reused within the same second."""
+    from unittest.mock import patch
+    from agent.utils import now_iso
+
+    with patch("agent.utils.time.time", return_value=1672531200.25):
+        first = now_iso()
+    with patch("agent.utils.time.time", return_value=1672531200.75):
+        assert now_iso() is first
+    with patch("agent.utils.time.time", return_value=1672531201.0):
+        assert now_iso() == "2023-01-01T00:00:01+00:00"
+
+    assert first == "2023-01-01T00:00:00+00:00"
+
+def test_agent_info_is_immutable():
+    """Test that agent info fields cannot be reassigned."""
+    import dataclasses
+    from agent.domain.models import AgentInfo
+
+    info = AgentInfo.from_dict({"version": "1.0.0", "hostname": "host", "executors": {}})
+    assert info.to_dict() == {"version": "1.0.0", "hostname": "host", "executors": {}}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        info.hostname = "other"
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+def test_models_use_slots():
+    """Test that domain models do not allocate a per-instance __dict__."""
+    from agent.domain.models import Command, CommandProgress, Executor
+
+    for model in (Command, CommandProgress, CommandRequest, CommandResponse, Executor, ExecutorInfo):
+        assert "__slots__" in vars(model)
+    request = CommandRequest(command="ls")
+    assert not hasattr(request, "__dict__")
+    assert request.to_dict() == {"command": "ls", "executor_type": "local"}
+
+def test_model_from_dict_round_trip():
+    """Test that models rebuilt by from_dict match their source."""
+    from datetime import datetime
+    from agent.domain.models import Command, CommandProgress, Executor
+
+    timestamp = datetime(2023, 1, 1, 12, 0, 0)
+    models = [
+        Command("ls", "cmd-1", "local", timestamp, exit_code=0, stdout="out", status="success"),
+        CommandProgress("cmd-1", "running", 50, "Halfway", timestamp),
+        CommandRequest(command="ls", executor_type="ssh"),
+        CommandResponse("ls", "cmd-1", 0, "out", "", timestamp, "local", "host", "success"),
+        Executor(type="local", available=True, target={"hostname": "host"}, description="Local"),
+        ExecutorInfo(type="local", available=True, target={"hostname": "host"}),
+    ]
+    for model in models:
+        assert type(model).from_dict(model.to_dict()) == model
+
+    assert Command.from_dict({"command": "ls"}).executor_type == "local"
+
+def test_model_timestamp_iso_is_cached():
+    """Test that the ISO timestamp is formatted once and refreshed on change."""
+    from datetime import datetime
+    from agent.domain.models import CommandProgress
+
+    progress = CommandProgress("cmd-1", "running", 10, "Started", datetime(2023, 1, 1))
+    first = progress.to_dict()["timestamp"]
+    assert progress.to_dict()["timestamp"] is first
+
+    progress.timestamp = datetime(2023, 1, 2)
+    assert progress.to_dict()["timestamp"] == "2023-01-02T00:00:00"
+    assert CommandProgress.from_dict(progress.to_dict()) == progress
+
+def test_executor_target_is_shared_and_read_only():
+    """Test that equal executor targets share one read-only mapping."""
+    from agent.domain.models import Executor
+
+    first = ExecutorInfo(type="local", available=True, target={"hostname": "host"})
+    second = Executor.from_dict({"type": "local", "available": True, "target": {"hostname": "host"}})
+
+    assert first.target is second.target
+    with pytest.raises(TypeError):
+        first.target["hostname"] = "other"
+    assert first.to_dict()["target"] == {"hostname": "host"}
+    assert type(first.to_dict()["target"]) is dict
+
+def test_command_to_dict_skips_unset_fields():
+    """Test that optional command fields are only serialized when set."""
+    from datetime import datetime
+    from agent.domain.models import Command
+
+    command = Command("ls", "cmd-1", "local", datetime(2023, 1, 1), exit_code=0)
+
+    assert command.to_dict() == {
+        "command": "ls",
+        "command_id": "cmd-1",
+        "executor_type": "local",
+        "timestamp": "2023-01-01T00:00:00",
+        "exit_code": 0
+    }
+    assert Command.from_dict(command.to_dict()) == command
+
+def test_parse_iso_reuses_parsed_timestamps():
+    """Test that repeated timestamp strings are parsed once."""
+    from datetime import datetime
+    from agent.domain.models import CommandProgress
+    from agent.utils import parse_iso
+
+    first = CommandProgress.from_dict({"timestamp": "2023-01-01T12:00:00"})
+    second = CommandProgress.from_dict({"timestamp": "2023-01-01T12:00:00"})
+
+    assert first.timestamp == datetime(2023, 1, 1, 12, 0, 0)
+    assert first.timestamp is second.timestamp
+    assert parse_iso("2023-01-01T12:00:00") is first.timestamp
+
+def test_executor_factory_shares_agent_manager_executors():
+    """Test that the API, the agent manager and the client use the same executors."""
+    from agent.manager import get_agent_manager
+    from agent.infrastructure.executor_factory import executor_factory
+    from agent.application.services.client_service import get_client_service
+
+    assert ExecutorFactory().executors is get_agent_manager().executors
+    assert executor_factory.executors is get_client_service().get_agent_manager().executors
+
+def test_command_repository_get_by_id_follows_history():
+    """Test that lookups by ID only find results still in the history."""
+    repository = CommandRepository()
+    repository.clear()
+    try:
+        for i in range(repository.max_history_size + 1):
+            repository.add(MagicMock(command_id=str(i)))
+        
+        assert repository.get_by_id("1").command_id == "1"
+        with pytest.raises(KeyError):
+            repository.get_by_id("0")
+        
+        repository.clear()
+        with pytest.raises(KeyError):
+            repository.get_by_id("1")
+    finally:
+        repository.clear()
@@ -1,11 +1,35 @@
 """Unit tests for the SSH executor class."""
 
+import os
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
 
 from agent.executors.ssh_executor import SSHExecutor
 
+def make_channel(stdout=(), stderr=(), exit_code=0):
+    """Create a mock channel whose output is already buffered.
+    
+    The channel's fileno is a real pipe with data waiting, so the event
+    loop sees it as readable just like a paramiko channel with output.
+    """
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"x")
+    stdout_chunks = list(stdout)
+    stderr_chunks = list(stderr)
+    
+    channel = MagicMock()
+    channel.fileno.return_value = read_fd
+    channel.recv_ready.side_effect = lambda: bool(stdout_chunks)
+    channel.recv.side_effect = lambda size: stdout_chunks.pop(0)
+    channel.recv_stderr_ready.side_effect = lambda: bool(stderr_chunks)
+    channel.recv_stderr.side_effect = lambda size: stderr_chunks.pop(0)
+    channel.eof_received = True
+    channel.exit_status_ready.return_value = True
+    channel.recv_exit_status.return_value = exit_code
+    channel.close.side_effect = lambda: (os.close(read_fd), os.close(write_fd))
+    return channel
+
 class TestSSHExecutor:
     """Test cases for the SSH executor class."""
     
@@ -31,6 +55,15 @@ class TestSSHExecutor:
         assert executor.password == "test-password"
         assert executor.client is None
     
+    def test_import_does_not_load_paramiko(self):
+        """Test that paramiko is only imported once SSH is used."""
+        import subprocess
+        import sys
+        
+        code = "import sys, agent.executors; print('paramiko' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == "False"
+    
     def test_init_with_missing_host(self):
         """Test initialization with missing host."""
         config = self.config.copy()
@@ -69,8 +102,9 @@ class TestSSHExecutor:
         info = executor.get_target_info()
         assert info["connected"] is True
     
+    @patch('paramiko.PKey.from_path')
     @patch('paramiko.SSHClient')
-    def test_connect_success_with_key(self, mock_ssh_client):
+    def test_connect_success_with_key(self, mock_ssh_client, mock_from_path):
         """Test successful connection with key authentication."""
         # Setup mock
         mock_client = MagicMock()
@@ -82,16 +116,46 @@ class TestSSHExecutor:
         assert result is True
         assert executor.client is not None
         mock_client.set_missing_host_key_policy.assert_called_once()
+        mock_from_path.assert_called_once_with(executor.key_path)
         mock_client.connect.assert_called_once_with(
             hostname="test-host",
             port=22,
             username="test-user",
-            key_filename=executor.key_path,
-            timeout=10
+            pkey=mock_from_path.return_value,
+            timeout=10,
+            allow_agent=False,
+            look_for_keys=False
         )
+        mock_client.get_transport.return_value.set_keepalive.assert_called_once_with(30)
+    
+    @patch('paramiko.PKey.from_path')
+    @patch('paramiko.SSHClient')
+    def test_connect_loads_key_once(self, mock_ssh_client, mock_from_path):
+        """Test that the key file is parsed once and reused for reconnects."""
+        executor = SSHExecutor(self.config)
+        
+        assert executor.connect() is True
+        executor.disconnect()
+        assert executor.connect() is True
+        
+        mock_from_path.assert_called_once_with(executor.key_path)
     
+    @patch('paramiko.PKey.from_path', side_effect=FileNotFoundError("missing"))
     @patch('paramiko.SSHClient')
-    def test_connect_success_with_password(self, mock_ssh_client):
+    def test_connect_without_key_uses_password(self, mock_ssh_client, mock_from_path):
+        """Test that a missing key file falls back to password authentication."""
+        mock_client = MagicMock()
+        mock_ssh_client.return_value = mock_client
+        
+        executor = SSHExecutor(self.config)
+        
+        assert executor.connect() is True
+        mock_client.connect.assert_called_once()
+        assert mock_client.connect.call_args[1]["password"] == "test-password"
+    
+    @patch('paramiko.PKey.from_path')
+    @patch('paramiko.SSHClient')
+    def test_connect_success_with_password(self, mock_ssh_client, mock_from_path):
         """Test successful connection with password authentication after key fails."""
         # Setup mock
         mock_client = MagicMock()
@@ -131,6 +195,17 @@ class TestSSHExecutor:
         assert executor.client is None
         mock_client.close.assert_called_once()
     
+    def test_cleanup_disconnects(self):
+        """Test that cleanup closes the connection kept open between commands."""
+        executor = SSHExecutor(self.config)
+        mock_client = MagicMock()
+        executor.client = mock_client
+        
+        executor.cleanup()
+        
+        assert executor.client is None
+        mock_client.close.assert_called_once()
+    
     def test_disconnect(self):
         """Test disconnection."""
         executor = SSHExecutor(self.config)
@@ -142,46 +217,60 @@ class TestSSHExecutor:
         assert executor.client is None
         mock_client.close.assert_called_once()
     
-    @patch('paramiko.SSHClient')
-    def test_test_connection_success(self, mock_ssh_client):
-        """Test successful connection test."""
-        # Setup mocks
+    def test_test_connection_success(self):
+        """Test that a live connection is checked without running a command."""
         mock_client = MagicMock()
-        mock_ssh_client.return_value = mock_client
+        mock_client.get_transport.return_value.is_active.return_value = True
+        
+        executor = SSHExecutor(self.config)
+        executor.client = mock_client
         
+        success, message = executor.test_connection()
+        
+        assert success is True
+        assert "successful" in message
+        mock_client.get_transport.return_value.send_ignore.assert_called_once()
+        mock_client.exec_command.assert_not_called()
+    
+    def test_test_connection_success_after_connect(self):
+        """Test that a new connection is checked by running a command."""
+        mock_client = MagicMock()
         mock_stdout = MagicMock()
         mock_stdout.channel.recv_exit_status.return_value = 0
-        
         mock_client.exec_command.return_value = (None, mock_stdout, None)
         
-        executor = SSHExecutor(self.config)
-        executor.client = mock_client
+        def connect(self):
+            self.client = mock_client
+            return True
         
-        success, message = executor.test_connection()
+        executor = SSHExecutor(self.config)
+        with patch.object(SSHExecutor, "connect", connect):
+            success, message = executor.test_connection()
         
         assert success is True
         assert "successful" in message
         mock_client.exec_command.assert_called_once_with("echo 'SSH connection test'")
     
-    @patch('paramiko.SSHClient')
-    def test_test_connection_failure(self, mock_ssh_client):
+    def test_test_connection_failure(self):
         """Test failed connection test."""
         # Setup mocks
         mock_client = MagicMock()
-        mock_ssh_client.return_value = mock_client
         
         mock_stdout = MagicMock()
         mock_stdout.channel.recv_exit_status.return_value = 1
         
         mock_stderr = MagicMock()
-        mock_stderr.read.return_value = b"Error message"
+        mock_stderr.read.return_value = b"Error message \xff"
         
         mock_client.exec_command.return_value = (None, mock_stdout, mock_stderr)
         
-        executor = SSHExecutor(self.config)
-        executor.client = mock_client
+        def connect(self):
+            self.client = mock_client
+            return True
         
-        success, message = executor.test_connection()
+        executor = SSHExecutor(self.config)
+        with patch.object(SSHExecutor, "connect", connect):
+            success, message = executor.test_connection()
         
         assert success is False
         assert "failed" in message
@@ -195,14 +284,8 @@ class TestSSHExecutor:
         mock_client = MagicMock()
         mock_ssh_client.return_value = mock_client
         
-        mock_stdout = MagicMock()
-        mock_stdout.read.return_value = b"test output"
-        mock_stdout.channel.recv_exit_status.return_value = 0
-        
-        mock_stderr = MagicMock()
-        mock_stderr.read.return_value = b""
-        
-        mock_client.exec_command.return_value = (None, mock_stdout, mock_stderr)
+        mock_channel = make_channel(stdout=[b"test ", b"output"])
+        mock_client.get_transport.return_value.open_session.return_value = mock_channel
         
         executor = SSHExecutor(self.config)
         executor.client = mock_client
@@ -215,7 +298,32 @@ class TestSSHExecutor:
         assert result["stderr"] == ""
         assert result["execution_type"] == "ssh"
         assert result["target"] == "test-user@test-host"
-        mock_client.exec_command.assert_called_once_with("test command")
+        mock_channel.exec_command.assert_called_once_with("test command")
+        mock_channel.close.assert_called_once()
+        mock_client.exec_command.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_execute_streams_output_progress(self):
+        """Test that output is reported as it is received from the channel."""
+        mock_client = MagicMock()
+        # "é" split across two receives must still decode as one character
+        mock_channel = make_channel(stdout=[b"caf\xc3", b"\xa9\n"], stderr=[b"warning\n"], exit_code=3)
+        mock_client.get_transport.return_value.open_session.return_value = mock_channel
+        
+        executor = SSHExecutor(self.config)
+        executor.client = mock_client
+        
+        mock_callback = AsyncMock()
+        result = await executor.execute("test command", "test-id", mock_callback)
+        
+        assert result["exit_code"] == 3
+        assert result["stdout"] == "caf\u00e9\n"
+        assert result["stderr"] == "warning\n"
+        running = [call.args[0] for call in mock_callback.call_args_list
+                   if call.args[0]["status"] == "running" and "stdout" in call.args[0]]
+        assert len(running) == 1
+        assert running[0]["stdout"] == "caf\u00e9\n"
+        assert running[0]["stderr"] == "warning\n"
     
     @pytest.mark.asyncio
     async def test_execute_disabled(self):
@@ -235,12 +343,11 @@ class TestSSHExecutor:
     async def test_execute_not_connected(self):
         """Test command execution when not connected."""
         executor = SSHExecutor(self.config)
+        mock_callback = AsyncMock()
         
         # Mock connect to fail
-        executor.connect = MagicMock(return_value=False)
-        
-        mock_callback = AsyncMock()
-        result = await executor.execute("test command", "test-id", mock_callback)
+        with patch.object(SSHExecutor, "connect", return_value=False):
+            result = await executor.execute("test command", "test-id", mock_callback)
         
         assert result["exit_code"] == -1
         assert "Failed to establish SSH connection" in result["stderr"]
@@ -255,7 +362,9 @@ class TestSSHExecutor:
         mock_ssh_client.return_value = mock_client
         
         # Make exec_command raise an exception
-        mock_client.exec_command.side_effect = Exception("Test exception")
+        mock_channel = MagicMock()
+        mock_channel.exec_command.side_effect = Exception("Test exception")
+        mock_client.get_transport.return_value.open_session.return_value = mock_channel
         
         executor = SSHExecutor(self.config)
         executor.client = mock_client
@@ -266,4 +375,195 @@ class TestSSHExecutor:
         assert result["exit_code"] == -1
         assert "Error executing SSH command" in result["stderr"]
         assert "Test exception" in result["stderr"]
-        assert mock_callback.call_count >= 2 
\ No newline at end of file
+        assert mock_callback.call_count >= 2
+    
+    def test_ensure_connected_reuses_active_connection(self):
+        """Test that a live connection is reused without reconnecting."""
+        executor = SSHExecutor(self.config)
+        mock_client = MagicMock()
+        mock_client.get_transport.return_value.is_active.return_value = True
+        executor.client = mock_client
+        
+        with patch.object(SSHExecutor, "connect") as mock_connect:
+            assert executor._ensure_connected() is True
+            mock_connect.assert_not_called()
+    
+    def test_ensure_connected_replaces_stale_connection(self):
+        """Test that a dropped connection is closed and replaced."""
+        executor = SSHExecutor(self.config)
+        stale_client = MagicMock()
+        stale_client.get_transport.return_value.is_active.return_value = False
+        executor.client = stale_client
+        
+        with patch.object(SSHExecutor, "connect", return_value=True) as mock_connect:
+            assert executor._ensure_connected() is True
+            mock_connect.assert_called_once()
+        stale_client.close.assert_called_once()
+    
+    def test_reconnect_backs_off_after_failures(self):
+        """Test that failed reconnects are not retried until the backoff passes."""
+        executor = SSHExecutor(self.config)
+        
+        with patch.object(SSHExecutor, "connect", return_value=False) as mock_connect:
+            assert executor._ensure_connected() is False
+            assert executor._ensure_connected() is False
+            assert mock_connect.call_count == 1
+            
+            # Let the backoff pass; the next failure doubles it
+            executor._reconnect_at = 0.0
+            assert executor._ensure_connected() is False
+            assert mock_connect.call_count == 2
+            assert executor._reconnect_delay == 2.0
+        
+        executor._reconnect_at = 0.0
+        with patch.object(SSHExecutor, "connect", return_value=True):
+            assert executor._ensure_connected() is True
+        assert executor._reconnect_delay == 0.0
+    
+    def test_ensure_connected_replaces_connection_failing_probe(self):
+        """Test that a connection whose liveness probe fails is replaced."""
+        executor = SSHExecutor(self.config)
+        stale_client = MagicMock()
+        transport = stale_client.get_transport.return_value
+        transport.is_active.return_value = True
+        transport.send_ignore.side_effect = EOFError()
+        executor.client = stale_client
+        
+        with patch.object(SSHExecutor, "connect", return_value=True) as mock_connect:
+            assert executor._ensure_connected() is True
+            mock_connect.assert_called_once()
+        stale_client.close.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_execute_retries_once_on_dropped_connection(self):
+        """Test that a command is retried on a new connection after a drop."""
+        import paramiko
+        
+        executor = SSHExecutor(self.config)
+        dropped_client = MagicMock()
+        dropped_client.get_transport.return_value.open_session.side_effect = paramiko.SSHException("dropped")
+        executor.client = dropped_client
+        
+        new_client = MagicMock()
+        new_client.get_transport.return_value.open_session.return_value = make_channel(stdout=[b"ok"])
+        
+        def reconnect(self):
+            self.client = new_client
+            return True
+        
+        with patch.object(SSHExecutor, "connect", reconnect):
+            result = await executor.execute("test command")
+        
+        assert result["exit_code"] == 0
+        assert result["stdout"] == "ok"
+        dropped_client.close.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_execute_limits_concurrent_sessions(self):
+        """Test that no more than pool_size commands run at once."""
+        config = dict(self.config, pool_size=2)
+        executor = SSHExecutor(config)
+        running = 0
+        peak = 0
+        
+        async def fake_execute(self, command, command_id, progress_callback):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"command": command}
+        
+        with patch.object(SSHExecutor, "_execute_on_connection", fake_execute):
+            await asyncio.gather(*(executor.execute(f"cmd {i}") for i in range(5)))
+        
+        assert peak == 2
+    
+    @pytest.mark.asyncio
+    async def test_execute_connects_once_for_concurrent_commands(self):
+        """Test that concurrent commands share one connection handshake."""
+        import time
+        
+        executor = SSHExecutor(self.config)
+        new_client = MagicMock()
+        new_client.get_transport.return_value.open_session.side_effect = (
+            lambda timeout: make_channel(stdout=[b"ok"]))
+        connects = []
+        
+        def slow_connect(self):
+            # Runs in a worker thread; the event loop keeps going meanwhile
+            time.sleep(0.05)
+            connects.append(1)
+            self.client = new_client
+            return True
+        
+        with patch.object(SSHExecutor, "connect", slow_connect):
+            results = await asyncio.gather(*(executor.execute(f"cmd {i}") for i in range(3)))
+        
+        assert [r["stdout"] for r in results] == ["ok"] * 3
+        assert len(connects) == 1
+    
+    @pytest.mark.asyncio
+    async def test_execute_truncates_output_over_limit(self):
+        """Test that output beyond max_output_bytes is dropped with a notice."""
+        config = dict(self.config, max_output_bytes=8)
+        executor = SSHExecutor(config)
+        mock_client = MagicMock()
+        mock_channel = make_channel(stdout=[b"12345", b"67890", b"abc"], stderr=[b"err"])
+        mock_client.get_transport.return_value.open_session.return_value = mock_channel
+        executor.client = mock_client
+        
+        result = await executor.execute("test command")
+        
+        assert result["stdout"] == "12345678\n[output truncated after 8 bytes]\n"
+        assert result["stderr"] == "err"
+        assert not mock_channel.recv_ready()  # Everything was still read from the channel
+    
+    @pytest.mark.asyncio
+    async def test_read_channel_ends_when_channel_closes_without_eof(self):
+        """Test that a channel closed by a dropped connection ends the command."""
+        import paramiko
+        
+        channel = paramiko.Channel(0)
+        executor = SSHExecutor(self.config)
+        
+        def drop_connection():
+            # What the transport does to its channels when the connection fails
+            with channel.lock:
+                channel._set_closed()
+        
+        asyncio.get_running_loop().call_later(0.05, drop_connection)
+        try:
+            stdout, stderr, exit_code = await asyncio.wait_for(
+                executor._read_channel(channel, "test-id", AsyncMock()), timeout=2
+            )
+        finally:
+            channel._pipe.close()
+        
+        assert not channel.eof_received
+        assert (stdout, stderr, exit_code) == ("", "", -1)
+    
+    @pytest.mark.asyncio
+    async def test_intermediate_progress_does_not_delay_command(self):
+        """Test that the command starts without waiting for intermediate updates."""
+        events = []
+        
+        async def slow_callback(data):
+            await asyncio.sleep(0.02)
+            events.append(data["status"])
+        
+        def open_session(timeout):
+            events.append("open")
+            return make_channel(stdout=[b"ok"])
+        
+        mock_client = MagicMock()
+        mock_client.get_transport.return_value.open_session.side_effect = open_session
+        executor = SSHExecutor(self.config)
+        executor.client = mock_client
+        
+        result = await executor.execute("test command", "test-id", slow_callback)
+        
+        assert result["stdout"] == "ok"
+        assert events[0] == "open"
+        assert events[1:] == ["connecting", "running", "running", "completed"]
+
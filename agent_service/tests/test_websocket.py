@@ -0,0 +1,93 @@
+"""Unit tests for the WebSocket connection manager."""
+
+import asyncio
+import pytest
+import orjson
+from unittest.mock import AsyncMock, MagicMock
+
+from agent.api.websocket import ConnectionManager
+
+
+@pytest.fixture
+async def manager():
+    """Provide a connection manager with no active connections."""
+    manager = ConnectionManager()
+    yield manager
+    for connection in list(manager.active_connections):
+        manager.disconnect(connection)
+
+
+def make_websocket(fail: bool = False):
+    """Create a mock WebSocket connection."""
+    websocket = MagicMock()
+    websocket.accept = AsyncMock()
+    websocket.send_bytes = AsyncMock(side_effect=Exception("closed") if fail else None)
+    return websocket
+
+
+@pytest.mark.asyncio
+async def test_queue_progress_sends_same_payload(manager):
+    """Test that every client receives the same serialized batch."""
+    first, second = make_websocket(), make_websocket()
+    await manager.connect(first)
+    await manager.connect(second)
+
+    manager.queue_progress({"command_id": "abc", "progress": 50})
+    await asyncio.sleep(0.1)
+
+    expected = orjson.dumps([{"command_id": "abc", "progress": 50}])
+    first.send_bytes.assert_awaited_once_with(expected)
+    second.send_bytes.assert_awaited_once_with(expected)
+
+
+@pytest.mark.asyncio
+async def test_queue_progress_drops_failed_clients(manager):
+    """Test that clients whose send fails are disconnected."""
+    healthy, broken = make_websocket(), make_websocket(fail=True)
+    await manager.connect(healthy)
+    await manager.connect(broken)
+
+    manager.queue_progress({"progress": 100})
+    await asyncio.sleep(0.1)
+
+    assert healthy in manager.active_connections
+    assert broken not in manager.active_connections
+    assert broken not in manager.queues
+
+
+@pytest.mark.asyncio
+async def test_queue_progress_coalesces_updates(manager):
+    """Test that queued updates are flushed together in one frame."""
+    websocket = make_websocket()
+    await manager.connect(websocket)
+
+    manager.queue_progress({"progress": 10})
+    manager.queue_progress({"progress": 20})
+    await asyncio.sleep(0.1)
+
+    websocket.send_bytes.assert_awaited_once_with(
+        orjson.dumps([{"progress": 10}, {"progress": 20}])
+    )
+
+
+@pytest.mark.asyncio
+async def test_queue_progress_drops_oldest_when_full(manager):
+    """Test that a full queue keeps only the most recent updates."""
+    from agent.api.websocket import PROGRESS_QUEUE_SIZE
+
+    websocket = make_websocket()
+    await manager.connect(websocket)
+
+    for i in range(PROGRESS_QUEUE_SIZE + 3):
+        manager.queue_progress({"progress": i})
+    await asyncio.sleep(0.1)
+
+    # A pause (for example garbage collection) can split the flush window,
+    # so check every update that was sent rather than a single frame
+    sent = [
+        update
+        for call in websocket.send_bytes.await_args_list
+        for update in orjson.loads(call.args[0])
+    ]
+    assert len(sent) == PROGRESS_QUEUE_SIZE
+    assert sent[0] == {"progress": 3}